@@ -0,0 +1,321 @@
+"""
+Benchmarks for the calculator's hot paths, with baseline regression checks.
+
+Usage:
+    python benchmarks.py                                  # run and print timings
+    python benchmarks.py --output results.json            # also save them as JSON
+    python benchmarks.py --baseline results.json          # fail if >20% slower than baseline
+    python benchmarks.py --baseline results.json --max-regression 0.5 --filter ttk
+    python benchmarks.py --filter import --import-budget-ms 10
+
+Timings are the median and minimum seconds per call over several repeats.
+Exit status is 1 when any benchmark regresses past --max-regression, when the
+closed-form solver is slower than the per-bullet loop over the whole catalog, or
+when `import ttk_calculator` goes over the import-time budget or starts loading
+the data tables or NumPy eagerly.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+import ttk_calculator
+
+PROTOTYPE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cold-start budget for `import ttk_calculator` alone (data loads on first use)
+IMPORT_BUDGET_MS = 15.0
+
+# Benchmark label over which calculate_ttk_closed_form must be at least as fast as calculate_ttk
+# (single few-bullet fights can favor the loop's handful of iterations)
+CLOSED_FORM_LABEL = 'catalog'
+
+
+def find_worst_cases():
+    """
+    Find the configurations with the most bullets to kill and the most reloads.
+
+    Returns:
+        dict: {'most_bullets': (gun, shield, level, ratio), 'most_reloads': (...)}
+    """
+    most_bullets = most_reloads = None
+    for gun_name in ttk_calculator.GUNS:
+        for shield_type in ttk_calculator.SHIELDS:
+            for level in [1, 2, 3, 4]:
+                config = (gun_name, shield_type, level, 0.0)
+                _, bullets_fired, reloads = ttk_calculator.solve_ttk_for_gun(*config)
+                if most_bullets is None or bullets_fired > most_bullets[0]:
+                    most_bullets = (bullets_fired, config)
+                if most_reloads is None or reloads > most_reloads[0]:
+                    most_reloads = (reloads, config)
+    return {
+        'most_bullets': most_bullets[1],
+        'most_reloads': most_reloads[1]
+    }
+
+
+def _run_fresh(code):
+    """Run code in a fresh interpreter that may write bytecode caches, returning its last output line."""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    output = subprocess.run([sys.executable, '-c', code], cwd=PROTOTYPE_DIR, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return output.strip().splitlines()[-1]
+
+
+def time_import(repeat):
+    """
+    Time `import ttk_calculator` in fresh interpreters, after one warm-up run that fills bytecode caches.
+
+    Returns:
+        list: Seconds per import, one per repeat
+    """
+    code = (
+        "import time; start = time.perf_counter(); import ttk_calculator; "
+        "print(time.perf_counter() - start)"
+    )
+    _run_fresh(code)
+    return [float(_run_fresh(code)) for _ in range(repeat)]
+
+
+def time_first_call(repeat):
+    """
+    Time importing ttk_calculator plus its first calculate_ttk call (which loads the data) in fresh interpreters.
+
+    Returns:
+        list: Seconds per import and first call, one per repeat
+    """
+    code = (
+        "import time; start = time.perf_counter(); import ttk_calculator; "
+        "ttk_calculator.calculate_ttk('kettle', 'medium', 4, 0.3); print(time.perf_counter() - start)"
+    )
+    _run_fresh(code)
+    return [float(_run_fresh(code)) for _ in range(repeat)]
+
+
+def check_import(budget_s):
+    """
+    Check that importing ttk_calculator stays lazy and within budget.
+
+    Returns:
+        list: Problem descriptions, empty if the import is fine
+    """
+    code = (
+        "import sys, time; start = time.perf_counter(); import ttk_calculator; "
+        "elapsed = time.perf_counter() - start; "
+        "print(elapsed, ttk_calculator._LOADED, 'numpy' in sys.modules)"
+    )
+    _run_fresh(code)
+    samples = [_run_fresh(code).split() for _ in range(5)]
+    problems = []
+    elapsed = statistics.median(float(sample[0]) for sample in samples)
+    if elapsed > budget_s:
+        problems.append(f"import ttk_calculator took {elapsed * 1e3:.2f}ms (budget {budget_s * 1e3:.2f}ms)")
+    if samples[0][1] == 'True':
+        problems.append("import ttk_calculator loaded the data tables eagerly")
+    if samples[0][2] == 'True':
+        problems.append("import ttk_calculator imported numpy")
+    return problems
+
+
+def time_callable(function, repeat):
+    """
+    Time a zero-argument callable with timeit, auto-scaling the number of calls per repeat.
+
+    Returns:
+        list: Seconds per call, one per repeat
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return [total / number for total in timer.repeat(repeat=repeat, number=number)]
+
+
+def _catalog_configs():
+    """Every gun, shield type and level at a typical headshot ratio."""
+    return [
+        (gun_name, shield_type, level, 0.3)
+        for gun_name in ttk_calculator.GUNS
+        for shield_type in ttk_calculator.SHIELDS
+        for level in [1, 2, 3, 4]
+    ]
+
+
+def _quietly(function):
+    """Wrap a printing function so its output is discarded while timing."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+    return run
+
+
+def build_benchmarks():
+    """
+    Returns:
+        dict: {benchmark name: zero-argument callable}
+    """
+    worst = find_worst_cases()
+    benchmarks = {
+        'calculate_gun_stats_by_level': ttk_calculator.calculate_gun_stats_by_level,
+        'print_all_guns_ranked': _quietly(lambda: ttk_calculator.print_all_guns_ranked('medium')),
+        'rank_guns': lambda: ttk_calculator.rank_guns(
+            [(level, ratio, 'medium') for level in [1, 4] for ratio in [0.0, 1.0]]),
+    }
+    for label, config in [('most_bullets', worst['most_bullets']),
+                          ('most_reloads', worst['most_reloads']),
+                          ('typical', ('kettle', 'medium', 4, 0.3))]:
+        benchmarks[f'calculate_ttk[{label}]'] = lambda config=config: ttk_calculator.calculate_ttk(*config)
+        benchmarks[f'calculate_ttk_detailed[{label}]'] = \
+            lambda config=config: ttk_calculator.calculate_ttk_detailed(*config)
+        benchmarks[f'calculate_ttk_closed_form[{label}]'] = \
+            lambda config=config: ttk_calculator.calculate_ttk_closed_form(*config)
+    configs = _catalog_configs()
+    benchmarks[f'calculate_ttk[{CLOSED_FORM_LABEL}]'] = \
+        lambda: [ttk_calculator.calculate_ttk(*config) for config in configs]
+    benchmarks[f'calculate_ttk_closed_form[{CLOSED_FORM_LABEL}]'] = \
+        lambda: [ttk_calculator.calculate_ttk_closed_form(*config) for config in configs]
+    return benchmarks
+
+
+def _selected(name, name_filter):
+    """True if a benchmark name is picked by --filter (every benchmark when there is no filter)."""
+    return not name_filter or name_filter in name
+
+
+def run_benchmarks(repeat=5, name_filter=None):
+    """
+    Run every benchmark whose name contains name_filter.
+
+    Returns:
+        dict: JSON-serializable report with environment info and per-benchmark timings
+    """
+    results = {}
+    for name, timer in [('import_ttk_calculator', time_import),
+                        ('import_and_first_calculate_ttk', time_first_call)]:
+        if _selected(name, name_filter):
+            results[name] = timer(repeat)
+
+    for name, function in build_benchmarks().items():
+        if _selected(name, name_filter):
+            results[name] = time_callable(function, repeat)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': repeat,
+        'results': {
+            name: {
+                'median_s': statistics.median(samples),
+                'min_s': min(samples)
+            }
+            for name, samples in results.items()
+        }
+    }
+
+
+def compare_to_baseline(report, baseline, max_regression):
+    """
+    Compare median timings against a baseline report.
+
+    Returns:
+        list: (name, baseline median, current median, ratio) for every regression
+              larger than max_regression (0.2 = 20% slower)
+    """
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        ratio = current['median_s'] / previous['median_s']
+        if ratio > 1 + max_regression:
+            regressions.append((name, previous['median_s'], current['median_s'], ratio))
+    return regressions
+
+
+def compare_closed_form(report):
+    """
+    Check that the closed-form solver is no slower than the loop it replaces.
+
+    Returns:
+        tuple: (loop median, closed-form median) if the closed form is slower, else None
+    """
+    results = report['results']
+    loop = results.get(f'calculate_ttk[{CLOSED_FORM_LABEL}]')
+    closed_form = results.get(f'calculate_ttk_closed_form[{CLOSED_FORM_LABEL}]')
+    if loop is None or closed_form is None or closed_form['median_s'] <= loop['median_s']:
+        return None
+    return loop['median_s'], closed_form['median_s']
+
+
+def print_report(report, baseline=None):
+    """Print timings as a table, with the change against the baseline if given."""
+    print(f"{'Benchmark':<48} {'Median (us)':>14} {'Min (us)':>12} {'vs baseline':>12}")
+    print("-" * 90)
+    for name, timing in report['results'].items():
+        change = ''
+        if baseline and name in baseline['results']:
+            ratio = timing['median_s'] / baseline['results'][name]['median_s']
+            change = f"{(ratio - 1) * 100:+.1f}%"
+        print(f"{name:<48} {timing['median_s'] * 1e6:>14.2f} {timing['min_s'] * 1e6:>12.2f} {change:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the TTK calculator's hot paths")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against a JSON file written by --output")
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help="Allowed slowdown vs baseline as a fraction (default: 0.2 = 20%%)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing repeats per benchmark (default: 5)")
+    parser.add_argument('--filter', help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_BUDGET_MS,
+                        help=f"Fail if importing ttk_calculator takes longer (default: {IMPORT_BUDGET_MS:g})")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    report = run_benchmarks(args.repeat, args.filter)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    if baseline:
+        regressions = compare_to_baseline(report, baseline, args.max_regression)
+        if regressions:
+            print(f"\nRegressions over {args.max_regression * 100:.0f}%:")
+            for name, previous, current, ratio in regressions:
+                print(f"  {name}: {previous * 1e6:.2f}us -> {current * 1e6:.2f}us ({(ratio - 1) * 100:+.1f}%)")
+            status = 1
+
+    slower = compare_closed_form(report)
+    if slower:
+        loop, closed_form = slower
+        print(f"\ncalculate_ttk_closed_form[{CLOSED_FORM_LABEL}] is slower than calculate_ttk: "
+              f"{closed_form * 1e6:.2f}us vs {loop * 1e6:.2f}us")
+        status = 1
+
+    if _selected('import_ttk_calculator', args.filter):
+        problems = check_import(args.import_budget_ms / 1000)
+        if problems:
+            print("\nImport check failed:")
+            for problem in problems:
+                print(f"  {problem}")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
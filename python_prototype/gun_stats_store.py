@@ -0,0 +1,162 @@
+"""
+Compact, array-backed store of per-level gun stats and shield configs.
+
+GUN_STATS_BY_LEVEL keeps a dict per gun per level. This store keeps the same
+numbers as a struct of typed arrays indexed by integer ids, which is smaller
+and makes each TTK lookup a couple of array reads instead of nested
+string-keyed dict lookups.
+"""
+
+from array import array
+
+LEVELS = (1, 2, 3, 4)
+
+
+class GunStatsStore:
+    """
+    Struct-of-arrays view of gun stats by level plus shield configs.
+
+    Gun rows are laid out gun-major: the stats of gun id g at level L live at
+    index g * 4 + (L - 1) of each per-level array.
+
+    Attributes:
+        gun_names (list): Gun name for each gun id
+        shield_names (list): Shield type for each shield id
+        damage, fire_rate, reload_time, durability (array('d')): Per-level stats
+        mag_size (array('q')): Per-level magazine size
+        headshot_multiplier (array('d')): Per-gun headshot multiplier
+        shield_health, shield_damage_reduction (array('d')): Per-shield config
+    """
+
+    __slots__ = (
+        'gun_names', 'shield_names', '_gun_ids', '_shield_ids',
+        'damage', 'fire_rate', 'mag_size', 'reload_time', 'durability',
+        'headshot_multiplier', 'shield_health', 'shield_damage_reduction'
+    )
+
+    def __init__(self, stats_by_level, headshot_multipliers, shields):
+        """
+        Args:
+            stats_by_level (dict): {gun_name: {level: stats dict}}, as in GUN_STATS_BY_LEVEL
+            headshot_multipliers (dict): {gun_name: multiplier}; missing guns default to 1.0
+            shields (dict): {shield_type: {'shield_health', 'shield_damage_reduction'}}
+        """
+        self.gun_names = list(stats_by_level.keys())
+        self.shield_names = list(shields.keys())
+        self._gun_ids = {name: gun_id for gun_id, name in enumerate(self.gun_names)}
+        self._shield_ids = {name: shield_id for shield_id, name in enumerate(self.shield_names)}
+
+        self.damage = array('d')
+        self.fire_rate = array('d')
+        self.mag_size = array('q')
+        self.reload_time = array('d')
+        self.durability = array('d')
+        self.headshot_multiplier = array('d')
+        for gun_name in self.gun_names:
+            for level in LEVELS:
+                stats = stats_by_level[gun_name][level]
+                self.damage.append(stats['damage'])
+                self.fire_rate.append(stats['fire_rate'])
+                self.mag_size.append(stats['mag_size'])
+                self.reload_time.append(stats['reload_time'])
+                self.durability.append(stats['durability'])
+            self.headshot_multiplier.append(headshot_multipliers.get(gun_name, 1.0))
+
+        self.shield_health = array('d', (shields[name]['shield_health'] for name in self.shield_names))
+        self.shield_damage_reduction = array(
+            'd', (shields[name]['shield_damage_reduction'] for name in self.shield_names)
+        )
+
+    def set_gun(self, gun_name, stats_by_level, headshot_multiplier):
+        """
+        Overwrite one gun's rows in place, appending a new gun id if the gun is new.
+
+        Args:
+            gun_name (str): Name of the gun
+            stats_by_level (dict): {level: stats dict} for levels 1-4
+            headshot_multiplier (float): The gun's headshot multiplier
+        """
+        gun_id = self._gun_ids.get(gun_name)
+        if gun_id is None:
+            gun_id = len(self.gun_names)
+            self.gun_names.append(gun_name)
+            self._gun_ids[gun_name] = gun_id
+            for values in (self.damage, self.fire_rate, self.mag_size, self.reload_time, self.durability):
+                values.extend([0] * len(LEVELS))
+            self.headshot_multiplier.append(1.0)
+
+        for level in LEVELS:
+            stats = stats_by_level[level]
+            row = self.row(gun_id, level)
+            self.damage[row] = stats['damage']
+            self.fire_rate[row] = stats['fire_rate']
+            self.mag_size[row] = stats['mag_size']
+            self.reload_time[row] = stats['reload_time']
+            self.durability[row] = stats['durability']
+        self.headshot_multiplier[gun_id] = headshot_multiplier
+
+    def set_shield(self, shield_type, config):
+        """
+        Overwrite one shield's config in place, appending a new shield id if it is new.
+
+        Args:
+            shield_type (str): Shield type
+            config (dict): {'shield_health', 'shield_damage_reduction'}
+        """
+        shield_id = self._shield_ids.get(shield_type)
+        if shield_id is None:
+            shield_id = len(self.shield_names)
+            self.shield_names.append(shield_type)
+            self._shield_ids[shield_type] = shield_id
+            self.shield_health.append(0.0)
+            self.shield_damage_reduction.append(0.0)
+        self.shield_health[shield_id] = config['shield_health']
+        self.shield_damage_reduction[shield_id] = config['shield_damage_reduction']
+
+    def gun_id(self, gun_name):
+        """Integer id of a gun, or None if unknown."""
+        return self._gun_ids.get(gun_name)
+
+    def shield_id(self, shield_type):
+        """Integer id of a shield type, or None if unknown."""
+        return self._shield_ids.get(shield_type)
+
+    def row(self, gun_id, level):
+        """Index into the per-level arrays for a gun id and level (1-4)."""
+        return gun_id * len(LEVELS) + level - 1
+
+    def level_stats(self, gun_id, level):
+        """
+        Fast accessor for the numbers the TTK engines need.
+
+        Returns:
+            tuple: (damage, fire_rate, mag_size, reload_time)
+        """
+        row = gun_id * len(LEVELS) + level - 1
+        return self.damage[row], self.fire_rate[row], self.mag_size[row], self.reload_time[row]
+
+    def shield_stats(self, shield_id):
+        """
+        Returns:
+            tuple: (shield_health, shield_damage_reduction)
+        """
+        return self.shield_health[shield_id], self.shield_damage_reduction[shield_id]
+
+    def as_dict(self, gun_name, level):
+        """
+        Stats for one gun and level in the GUN_STATS_BY_LEVEL dict format.
+
+        Returns:
+            dict: damage, fire_rate, mag_size, reload_time, durability, or None if unknown
+        """
+        gun_id = self._gun_ids.get(gun_name)
+        if gun_id is None or level not in LEVELS:
+            return None
+        row = self.row(gun_id, level)
+        return {
+            'damage': self.damage[row],
+            'fire_rate': self.fire_rate[row],
+            'mag_size': self.mag_size[row],
+            'reload_time': self.reload_time[row],
+            'durability': self.durability[row]
+        }
@@ -0,0 +1,25 @@
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import ttk_calculator
+from ttk_batch import calculate_ttk_batch, resolve_batch_inputs
+
+
+@pytest.mark.parametrize('headshot_ratio', [math.nan, math.inf, -math.inf, -0.1, 1.1])
+def test_batch_rejects_invalid_headshot_ratio(headshot_ratio):
+    with pytest.raises(ValueError, match='headshot_ratio'):
+        resolve_batch_inputs('kettle', 'light', 1, [0.0, headshot_ratio])
+    with pytest.raises(ValueError, match='headshot_ratio'):
+        calculate_ttk_batch('kettle', 'light', 1, headshot_ratio)
+
+
+def test_batch_matches_calculate_ttk_at_ratio_bounds():
+    result = calculate_ttk_batch(['kettle', 'ferro'], 'medium', [1, 4], [0.0, 1.0], grid=True)
+    for i, gun_name in enumerate(['kettle', 'ferro']):
+        for j, level in enumerate([1, 4]):
+            for k, headshot_ratio in enumerate([0.0, 1.0]):
+                expected = ttk_calculator.calculate_ttk(gun_name, 'medium', level, headshot_ratio)
+                assert result['ttk'][i, 0, j, k] == pytest.approx(expected)
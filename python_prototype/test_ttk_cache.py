@@ -0,0 +1,20 @@
+import pytest
+
+import ttk_calculator
+from ttk_cache import TTKCache
+
+
+@pytest.mark.parametrize('headshot_ratio', [1.3, -0.2, 1.004, -0.004])
+def test_quantized_cache_rejects_out_of_range_ratio(headshot_ratio):
+    cache = TTKCache(headshot_quantum=0.01)
+    assert ttk_calculator.calculate_ttk('kettle', 'light', 1, headshot_ratio) is None
+    assert cache.calculate_ttk('kettle', 'light', 1, headshot_ratio) is None
+    assert cache.calculate_ttk_detailed('kettle', 'light', 1, headshot_ratio) is None
+    assert cache.stats()['size'] == 0
+
+
+def test_quantized_cache_rounds_valid_ratio():
+    cache = TTKCache(headshot_quantum=0.01)
+    assert cache.calculate_ttk('kettle', 'light', 1, 0.996) == ttk_calculator.calculate_ttk('kettle', 'light', 1, 1.0)
+    assert cache.calculate_ttk('kettle', 'light', 1, 1.0) == ttk_calculator.calculate_ttk('kettle', 'light', 1, 1.0)
+    assert cache.stats()['hits'] == 1
@@ -0,0 +1,36 @@
+import io
+import json
+
+from ttk_cli import process_chunk, run
+
+
+def test_non_finite_level_becomes_error_record():
+    lines = ['{"gun": "kettle"}\n', '{"gun": "kettle", "level": NaN}\n', '{"gun": "kettle", "level": Infinity}\n',
+             '{"gun": "kettle", "level": 2}\n']
+    records, errors = process_chunk(lines, 1)
+    assert errors == 2
+    assert [record['line'] for record in records] == [1, 2, 3, 4]
+    assert records[1]['error'].startswith("Invalid level")
+    assert records[3]['level'] == 2
+
+
+def test_run_continues_past_non_finite_level():
+    input_file = io.StringIO('{"gun": "kettle", "level": NaN}\n' + '{"gun": "kettle"}\n' * 3)
+    output_file = io.StringIO()
+    rows, errors = run(input_file, output_file, chunk_size=2)
+    records = [json.loads(line) for line in output_file.getvalue().splitlines()]
+    assert (rows, errors) == (4, 1)
+    assert [record['line'] for record in records] == [1, 2, 3, 4]
+    assert all(record['gun'] == 'kettle' for record in records[1:])
+
+
+def test_blank_lines_keep_line_numbers():
+    input_file = io.StringIO('{"gun": "kettle"}\n\n   \n{"gun": "ferro", "detail": true}\n{"gun": "x"}\n\n'
+                             '{"gun": "bobcat"}\n')
+    output_file = io.StringIO()
+    rows, errors = run(input_file, output_file, chunk_size=3)
+    records = [json.loads(line) for line in output_file.getvalue().splitlines()]
+    assert (rows, errors) == (4, 1)
+    assert [(record['line'], record.get('gun')) for record in records] == [
+        (1, 'kettle'), (4, 'ferro'), (5, None), (7, 'bobcat')]
+    assert 'damage_log' in records[1]
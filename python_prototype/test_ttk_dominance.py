@@ -0,0 +1,68 @@
+import pytest
+
+from ttk_breakpoints import get_breakpoint_index
+from ttk_dominance import _winner, compare_guns
+
+RATIOS = [step / 1000 for step in range(1001)]
+
+
+def _interval_at(result, ratio):
+    return next(interval for interval in reversed(result['intervals']) if interval['start'] <= ratio)
+
+
+@pytest.mark.parametrize('gun_a, gun_b, shield_type, level', [
+    ('kettle', 'bobcat', 'light', 1),
+    ('stitcher', 'tempest', 'medium', 3),
+    ('renegade', 'ferro', 'heavy', 4),
+    ('hairpin', 'jupiter', 'light', 1),
+    ('hairpin', 'kettle', 'light', 4),
+    ('hairpin', 'jupiter', 'heavy', 2),
+])
+def test_compare_guns_matches_lookup(gun_a, gun_b, shield_type, level):
+    result = compare_guns(gun_a, gun_b, shield_type, level)
+    index_a = get_breakpoint_index(gun_a, shield_type, level)
+    index_b = get_breakpoint_index(gun_b, shield_type, level)
+    for ratio in RATIOS:
+        winner = _winner(gun_a, index_a.lookup(ratio)['ttk'], gun_b, index_b.lookup(ratio)['ttk'])
+        interval = _interval_at(result, ratio)
+        if 'winners' in interval:
+            assert winner in interval['winners']
+        else:
+            assert interval['winner'] == winner, ratio
+
+
+def test_crossovers_join_intervals_with_different_winners():
+    result = compare_guns('kettle', 'bobcat', 'light', 1)
+    intervals = result['intervals']
+    assert intervals[0]['start'] == 0.0 and intervals[-1]['end'] == 1.0
+    for previous, current in zip(intervals, intervals[1:]):
+        assert previous['end'] == current['start']
+        assert previous['winner'] != current['winner']
+    assert [crossover['ratio'] for crossover in result['crossovers']] == [interval['start']
+                                                                          for interval in intervals[1:]]
+
+
+def test_compare_guns_of_invalid_config_returns_none():
+    assert compare_guns('kettle', 'nope') is None
+    assert compare_guns('kettle', 'bobcat', level=7) is None
+
+
+def test_compare_guns_reports_rounding_dependent_winner():
+    # hairpin's blended damage rounds just below 20 at some ratios, needing a 7th bullet
+    hairpin = get_breakpoint_index('hairpin', 'light', 1)
+    jupiter = get_breakpoint_index('jupiter', 'light', 1)
+    assert hairpin.lookup(0.012)['ttk'] > jupiter.lookup(0.012)['ttk'] > hairpin.lookup(0.0)['ttk']
+
+    interval = _interval_at(compare_guns('hairpin', 'jupiter', 'light', 1), 0.012)
+    assert interval['winner'] is None
+    assert set(interval['winners']) == {'hairpin', 'jupiter'}
+
+
+def test_next_bullet_saved_for_multiplier_one_gun():
+    index = get_breakpoint_index('hairpin', 'light', 1)
+    assert index.lookup(0.012)['bullets_fired'] == 7
+    step = index.next_bullet_saved(0.012)
+    assert 0.012 < step['ratio'] < 0.0121
+    assert step == index.lookup(step['ratio'])
+    assert step['bullets_fired'] == 6
+    assert index.next_bullet_saved(0.0) is None
@@ -0,0 +1,67 @@
+import pytest
+
+import ttk_calculator
+from ttk_engagement import simulate_engagement, squad_wipe_orders
+
+
+@pytest.mark.parametrize('shield_type', ['light', 'medium', 'heavy'])
+@pytest.mark.parametrize('level, headshot_ratio', [(1, 0.0), (4, 0.3), (2, 1.0)])
+def test_one_target_matches_calculate_ttk(shield_type, level, headshot_ratio):
+    for gun_name in ttk_calculator.GUNS:
+        result = simulate_engagement(gun_name, [shield_type], level, headshot_ratio, switch_delay=2.0)
+        _, bullets_fired, reloads = ttk_calculator.solve_ttk_for_gun(gun_name, shield_type, level, headshot_ratio)
+        assert result['total_time'] == pytest.approx(
+            ttk_calculator.calculate_ttk(gun_name, shield_type, level, headshot_ratio)), gun_name
+        assert (result['bullets_fired'], result['reloads']) == (bullets_fired, reloads), gun_name
+        assert result['kills'][0]['start_time'] == 0.0
+
+
+def test_magazine_carries_over_to_next_target():
+    # kettle L1: 20-round magazine, 3s reload, 12 bullets per light target.
+    # The second target starts with 8 bullets left, so it reloads after its 8th.
+    time_per_bullet = 1 / 7.415
+    result = simulate_engagement('kettle', ['light', 'light'], switch_delay=0.0)
+    first, second = result['kills']
+    assert (first['bullets_fired'], first['reloads']) == (12, 0)
+    assert (second['bullets_fired'], second['reloads']) == (12, 1)
+    assert second['start_time'] == pytest.approx(12 * time_per_bullet)
+    # One continuous stream: 24 bullets, 22 intervals and one reload
+    assert result['total_time'] == pytest.approx(22 * time_per_bullet + 3)
+    assert result['bullets_left_in_mag'] == 16
+
+
+def test_reload_at_switch_when_magazine_ran_dry():
+    # ferro L1: one-round magazine, 1.73s reload, 3 bullets per light target.
+    result = simulate_engagement('ferro', ['light', 'light'], switch_delay=0.5)
+    first, second = result['kills']
+    assert (first['kill_time'], first['reloads']) == (pytest.approx(3.46), 2)
+    # The switch overlaps the reload, which counts towards the second target
+    assert second['start_time'] == pytest.approx(3.46 + 1.73)
+    assert (second['kill_time'], second['reloads']) == (pytest.approx(3.46 + 1.73 + 3.46), 3)
+    assert result['reloads'] == 5
+
+
+@pytest.mark.parametrize('gun_name, switch_delay, expected_gap', [
+    ('ferro', 0.5, 1.73),        # empty magazine: reload is longer than the switch
+    ('ferro', 2.0, 2.0),         # empty magazine: switch is longer than the reload
+    ('kettle', 0.0, 1 / 7.415),  # rounds left: bullet interval is longer than the switch
+    ('kettle', 1.0, 1.0),        # rounds left: switch is longer than the bullet interval
+])
+def test_switch_delay_is_max_of_switch_and_reload_or_interval(gun_name, switch_delay, expected_gap):
+    first, second = simulate_engagement(gun_name, ['light', 'light'], switch_delay=switch_delay)['kills']
+    assert second['start_time'] - first['kill_time'] == pytest.approx(expected_gap)
+
+
+def test_squad_wipe_orders_match_engagement():
+    shield_types = ['light', 'heavy', 'medium']
+    orders = squad_wipe_orders('kettle', shield_types, level=2, switch_delay=0.4)
+    assert len(orders) == 6
+    for order in orders:
+        assert order['total_time'] == simulate_engagement('kettle', order['order'], 2, 0.0, 0.4)['total_time']
+    assert [order['total_time'] for order in orders] == sorted(order['total_time'] for order in orders)
+
+
+def test_invalid_engagement_rejected():
+    assert simulate_engagement('kettle', []) is None
+    assert simulate_engagement('kettle', ['light'], switch_delay=-1.0) is None
+    assert simulate_engagement('kettle', ['light', 'nope']) is None
@@ -0,0 +1,40 @@
+import pytest
+
+import ttk_calculator
+from ttk_focus_fire import simulate_focus_fire
+
+
+@pytest.mark.parametrize('shield_type', ['light', 'medium', 'heavy'])
+@pytest.mark.parametrize('level, headshot_ratio', [(1, 0.0), (4, 0.3), (2, 1.0)])
+def test_one_shooter_matches_calculate_ttk(shield_type, level, headshot_ratio):
+    for gun_name in ttk_calculator.GUNS:
+        result = simulate_focus_fire([(gun_name, level, headshot_ratio)], shield_type)
+        detailed = ttk_calculator.calculate_ttk_detailed(gun_name, shield_type, level, headshot_ratio,
+                                                         include_log=False)
+        assert result['ttk'] == pytest.approx(ttk_calculator.calculate_ttk(gun_name, shield_type, level,
+                                                                           headshot_ratio)), gun_name
+        assert result['bullets_fired'] == [detailed['bullets_fired']], gun_name
+        assert result['reloads'] == [detailed['reloads']], gun_name
+        assert result['killer'] == 0
+
+
+def test_two_ferros_timeline():
+    # ferro L1: 40 damage, one-round magazine, 1.73s reload; light shield 40 at 40% reduction, 100 health.
+    # t=0: #0 breaks the shield (health 100 -> 76), #1 hits health (76 -> 36); both start reloading.
+    # t=1.73: #0's reload and its instant shot sort before #1's reload, and that shot kills (36 -> -4).
+    result = simulate_focus_fire([('ferro', 1, 0.0), ('ferro', 1, 0.0)], 'light', include_log=True)
+    assert result['ttk'] == 1.73
+    assert result['bullets_fired'] == [2, 1]
+    assert result['reloads'] == [1, 0]
+    assert result['total_bullets'] == 3
+    assert result['killer'] == 0
+    assert [(entry['type'], entry['time'], entry['shooter']) for entry in result['damage_log']] == [
+        ('shot', 0.0, 0), ('shot', 0.0, 1), ('reload', 1.73, 0), ('shot', 1.73, 0)]
+    assert [entry.get('health_after') for entry in result['damage_log']] == [76.0, 36.0, None, -4.0]
+    assert ttk_calculator.calculate_ttk('ferro', 'light', 1, 0.0) == pytest.approx(3.46)
+
+
+def test_invalid_shooter_rejected():
+    assert simulate_focus_fire([], 'light') is None
+    assert simulate_focus_fire([('ferro', 5, 0.0)], 'light') is None
+    assert simulate_focus_fire([('ferro', 1, 0.0, -1.0)], 'light') is None
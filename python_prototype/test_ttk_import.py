@@ -0,0 +1,19 @@
+import subprocess
+import sys
+
+import benchmarks
+
+
+def test_import_stays_within_budget():
+    assert benchmarks.check_import(benchmarks.IMPORT_BUDGET_MS / 1000) == []
+
+
+def test_bare_import_loads_no_tables():
+    code = (
+        "import sys, ttk_calculator; "
+        "print(ttk_calculator._LOADED, sorted(ttk_calculator._LAZY_TABLES & set(vars(ttk_calculator))), "
+        "'numpy' in sys.modules)"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=benchmarks.PROTOTYPE_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    assert output.split() == ['False', '[]', 'False']
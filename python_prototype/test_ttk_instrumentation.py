@@ -0,0 +1,73 @@
+import pstats
+
+import pytest
+
+import ttk_calculator
+import ttk_instrumentation
+from ttk_instrumentation import Instrumentation, MemorySink
+
+CONFIGS = [('kettle', 'light', 1, 0.0), ('ferro', 'medium', 4, 0.3), ('bobcat', 'heavy', 2, 1.0)]
+
+
+@pytest.fixture(autouse=True)
+def restore_instrumentation():
+    previous = ttk_instrumentation.get_instrumentation()
+    yield
+    ttk_calculator._INSTRUMENTATION = previous
+
+
+def _run_engines():
+    for config in CONFIGS:
+        ttk_calculator.calculate_ttk(*config)
+        ttk_calculator.calculate_ttk_closed_form(*config)
+        ttk_calculator.calculate_ttk_detailed(*config)
+    ttk_calculator.get_validation_error('nope', 'light', 1, 0.0)
+
+
+def test_disabled_instrumentation_records_nothing():
+    instrumentation = ttk_instrumentation.enable()
+    ttk_instrumentation.disable()
+    assert ttk_instrumentation.get_instrumentation() is None
+    _run_engines()
+    assert not instrumentation.counters
+    assert not instrumentation.timings
+    assert instrumentation.snapshot()['slowest'] == {}
+
+
+def test_enable_counts_reference_and_closed_form_calls():
+    instrumentation = ttk_instrumentation.enable(Instrumentation(slowest=2))
+    _run_engines()
+    ttk_instrumentation.disable()
+
+    counters = instrumentation.counters
+    bullets = sum(ttk_calculator.solve_ttk_for_gun(*config)[1] for config in CONFIGS)
+    assert counters['calculate_ttk.calls'] == len(CONFIGS)
+    assert counters['calculate_ttk.iterations'] == counters['calculate_ttk.bullets'] == bullets
+    assert counters['calculate_ttk_closed_form.calls'] == len(CONFIGS)
+    assert counters['calculate_ttk_closed_form.bullets'] == bullets
+    assert counters['calculate_ttk_detailed.calls'] == len(CONFIGS)
+    assert counters['validation.rejected'] == counters['validation.rejected.gun_name'] == 1
+    assert instrumentation.timings['calculate_ttk'].count == len(CONFIGS)
+    assert len(instrumentation.snapshot()['slowest']['calculate_ttk']) == 2
+
+
+def test_instrumented_block_counts_recounts_and_flushes():
+    sink = MemorySink()
+    with ttk_instrumentation.instrumented(sinks=[sink]) as instrumentation:
+        # hairpin's blended damage lands on an exact kill boundary here
+        ttk_calculator.solve_ttk_for_gun('hairpin', 'light', 1, 0.045)
+        ttk_calculator.calculate_ttk_closed_form('kettle', 'light', 1, 0.0)
+    assert ttk_instrumentation.get_instrumentation() is None
+    assert instrumentation.counters['solve_ttk.exact_recounts'] == 1
+    assert instrumentation.counters['calculate_ttk_closed_form.calls'] == 1
+    assert len(sink.snapshots) == 1
+    assert sink.snapshots[0]['counters'] == dict(instrumentation.counters)
+
+
+def test_profile_returns_stats(tmp_path):
+    path = tmp_path / 'ttk.prof'
+    with ttk_instrumentation.profile(str(path), limit=10) as report:
+        _run_engines()
+    assert isinstance(report['stats'], pstats.Stats)
+    assert 'calculate_ttk' in report['text']
+    assert path.stat().st_size > 0
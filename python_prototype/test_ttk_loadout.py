@@ -0,0 +1,28 @@
+import itertools
+
+import pytest
+
+import ttk_calculator
+from ttk_loadout import optimize_loadout, rank_loadout_pairs
+
+
+@pytest.mark.parametrize('swap_time', [0.0, 0.5, 1.5, 3.0])
+@pytest.mark.parametrize('shield_type, level', [('light', 1), ('heavy', 1), ('medium', 4)])
+def test_loadout_never_slower_than_either_gun(swap_time, shield_type, level):
+    guns = list(ttk_calculator.GUNS)
+    single = {gun_name: ttk_calculator.calculate_ttk(gun_name, shield_type, level) for gun_name in guns}
+    for primary, secondary in itertools.combinations_with_replacement(guns, 2):
+        result = optimize_loadout(primary, secondary, shield_type, level, swap_time=swap_time)
+        assert result['ttk'] <= min(single[primary], single[secondary]) + 1e-9, (primary, secondary)
+
+
+def test_one_round_magazine_with_short_reload():
+    # ferro reloads (1.73s) faster than its bullet interval, so the search bound must allow for it
+    result = optimize_loadout('ferro', 'jupiter', 'heavy', 1, swap_time=3.0)
+    assert result['ttk'] == pytest.approx(ttk_calculator.calculate_ttk('ferro', 'heavy', 1))
+
+
+def test_rank_loadout_pairs_matches_optimize_loadout():
+    guns = ['ferro', 'jupiter', 'kettle']
+    for primary, secondary, ttk in rank_loadout_pairs(guns, 'heavy', 1, swap_time=0.5):
+        assert ttk == optimize_loadout(primary, secondary, 'heavy', 1, swap_time=0.5)['ttk']
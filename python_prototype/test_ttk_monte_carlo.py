@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import ttk_calculator
+from ttk_monte_carlo import simulate_ttk_distribution
+
+
+def _simulate(seed, **options):
+    return simulate_ttk_distribution('kettle', 'medium', 2, 0.4, hit_ratio=0.8, trials=3000, seed=seed,
+                                     chunk_size=1000, **options)
+
+
+def _assert_same(first, second):
+    for key in first:
+        if key == 'histogram':
+            np.testing.assert_array_equal(first[key]['counts'], second[key]['counts'])
+            np.testing.assert_array_equal(first[key]['bin_edges'], second[key]['bin_edges'])
+        else:
+            assert first[key] == second[key], key
+
+
+def test_seed_reproduces_distribution():
+    _assert_same(_simulate(5), _simulate(5))
+    _assert_same(_simulate(np.random.SeedSequence(5, spawn_key=(3,))),
+                 _simulate(np.random.SeedSequence(5, spawn_key=(3,))))
+    assert _simulate(5)['mean_ttk'] != _simulate(6)['mean_ttk']
+
+
+@pytest.mark.parametrize('shield_type', ['light', 'medium', 'heavy'])
+@pytest.mark.parametrize('level', [1, 4])
+@pytest.mark.parametrize('headshot_ratio', [0.0, 1.0])
+def test_certain_outcomes_match_calculate_ttk(shield_type, level, headshot_ratio):
+    for gun_name in ttk_calculator.GUNS:
+        expected = ttk_calculator.calculate_ttk(gun_name, shield_type, level, headshot_ratio)
+        result = simulate_ttk_distribution(gun_name, shield_type, level, headshot_ratio, hit_ratio=1.0,
+                                           trials=50, seed=0)
+        # Every trial fires the same bullets; std only carries the mean's rounding
+        assert result['min_ttk'] == result['max_ttk'], gun_name
+        assert result['std_ttk'] == pytest.approx(0.0, abs=1e-12), gun_name
+        assert result['min_ttk'] == pytest.approx(expected), gun_name
+
+
+@pytest.mark.parametrize('headshot_ratio, hit_ratio', [
+    (-0.1, 1.0), (1.1, 1.0), (math.nan, 1.0),
+    (0.5, 0.0), (0.5, -0.2), (0.5, 1.2), (0.5, math.nan),
+])
+def test_invalid_probabilities_rejected(headshot_ratio, hit_ratio):
+    with pytest.raises(ValueError, match='ratio'):
+        simulate_ttk_distribution('kettle', 'light', 1, headshot_ratio, hit_ratio=hit_ratio, trials=10)
@@ -0,0 +1,42 @@
+import asyncio
+import math
+from http import HTTPStatus
+
+import pytest
+
+from ttk_queries import parse_query
+from ttk_server import TTKServer
+
+
+def test_parse_query_accepts_whole_float_level():
+    query, error = parse_query({'gun': 'kettle', 'level': 2.0})
+    assert error is None
+    assert query == ('kettle', 'light', 2, 0.0)
+
+
+@pytest.mark.parametrize('level', [math.nan, math.inf, -math.inf])
+def test_parse_query_rejects_non_finite_level(level):
+    query, error = parse_query({'gun': 'kettle', 'level': level})
+    assert query is None
+    assert error.startswith("Invalid level")
+
+
+@pytest.mark.parametrize('body', [b'{"gun": "kettle", "level": NaN}', b'{"gun": "kettle", "level": Infinity}'])
+def test_ttk_rejects_non_finite_level(body):
+    status, payload = asyncio.run(TTKServer().dispatch('POST', '/ttk', body))
+    assert status == HTTPStatus.BAD_REQUEST
+    assert payload['error'].startswith("Invalid level")
+
+
+def test_ttk_batch_reports_non_finite_level_per_query():
+    body = b'{"queries": [{"gun": "kettle", "level": -Infinity}, {"gun": "kettle"}]}'
+    status, payload = asyncio.run(TTKServer().dispatch('POST', '/ttk', body))
+    assert status == HTTPStatus.OK
+    assert payload['results'][0]['error'].startswith("Invalid level")
+    assert payload['results'][1]['bullets_fired'] > 0
+
+
+def test_rank_rejects_non_finite_level():
+    status, payload = asyncio.run(TTKServer().dispatch('POST', '/rank', b'{"level": NaN}'))
+    assert status == HTTPStatus.OK
+    assert payload['rankings'][0]['error'].startswith("Invalid level")
@@ -0,0 +1,86 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import ttk_calculator
+from ttk_series import DEATH, RELOAD_END, RELOAD_START, SHIELD_BREAK, START, damage_series
+
+LEVELS = [1, 4]
+RATIOS = [0.0, 0.3, 1.0]
+KEY_EVENTS = START | SHIELD_BREAK | RELOAD_START | RELOAD_END | DEATH
+
+
+@pytest.fixture(scope='module')
+def guns():
+    return sorted(ttk_calculator.GUNS)
+
+
+@pytest.fixture(scope='module')
+def full(guns):
+    return damage_series(guns, list(ttk_calculator.SHIELDS), LEVELS, RATIOS, grid=True)
+
+
+def _configs(guns):
+    for i, gun_name in enumerate(guns):
+        for j, shield_type in enumerate(ttk_calculator.SHIELDS):
+            for k, level in enumerate(LEVELS):
+                for m, headshot_ratio in enumerate(RATIOS):
+                    yield (i, j, k, m), (gun_name, shield_type, level, headshot_ratio)
+
+
+def test_full_series_matches_damage_events(guns, full):
+    for index, config in _configs(guns):
+        shots = [event for event in ttk_calculator.iter_damage_events(*config) if event.type == 'shot']
+        length = full['length'][index]
+        assert length == len(shots) + 1 == full['bullets_fired'][index] + 1, config
+        assert full['time'][index][0] == 0.0
+        assert full['shield_health'][index][0] == ttk_calculator.SHIELDS[config[1]]['shield_health']
+        assert full['health'][index][0] == ttk_calculator.BASE_HEALTH
+        np.testing.assert_allclose(full['time'][index][1:length], [shot.time for shot in shots], rtol=1e-12)
+        np.testing.assert_array_equal(full['shield_health'][index][1:length],
+                                      [shot.shield_health_after for shot in shots])
+        np.testing.assert_array_equal(full['health'][index][1:length],
+                                      [max(shot.health_after, 0.0) for shot in shots])
+        assert np.isnan(full['time'][index][length:]).all()
+        assert not full['events'][index][length:].any()
+
+
+def test_decimation_keeps_every_flagged_point(guns, full):
+    budget = 16
+    series = damage_series(guns, list(ttk_calculator.SHIELDS), LEVELS, RATIOS, grid=True, max_points=budget)
+    checked = 0
+    for index, config in _configs(guns):
+        length = full['length'][index]
+        flagged = np.flatnonzero(full['events'][index][:length] & KEY_EVENTS)
+        if flagged.size > budget:
+            continue
+        kept = series['length'][index]
+        kept_times = series['time'][index][:kept]
+        for column in flagged:
+            position = np.flatnonzero(kept_times == full['time'][index][column])
+            assert position.size, (config, column)
+            position = position[np.flatnonzero(series['events'][index][position] == full['events'][index][column])]
+            assert position.size == 1, (config, column)
+            assert series['health'][index][position[0]] == full['health'][index][column]
+            assert series['shield_health'][index][position[0]] == full['shield_health'][index][column]
+        checked += length > budget
+    assert checked
+
+
+@pytest.mark.parametrize('max_points', [2, 3, 5, 16, 40])
+def test_decimated_series_within_budget(guns, full, max_points):
+    series = damage_series(guns, list(ttk_calculator.SHIELDS), LEVELS, RATIOS, grid=True, max_points=max_points)
+    assert series['time'].shape[-1] <= max_points
+    assert (series['length'] <= max_points).all()
+    assert (series['length'] == np.minimum(full['length'], max_points)).all()
+    lengths = series['length'][..., None]
+    columns = np.arange(series['time'].shape[-1])
+    # Start and kill survive any budget
+    assert (series['events'][..., 0] & START).all()
+    assert ((series['events'] & DEATH).astype(bool) == (columns == lengths - 1)).all()
+    np.testing.assert_array_equal(np.nanmax(series['time'], axis=-1), full['ttk'])
+
+
+def test_invalid_max_points_rejected():
+    with pytest.raises(ValueError, match='max_points'):
+        damage_series('kettle', max_points=1)
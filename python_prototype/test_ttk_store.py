@@ -0,0 +1,31 @@
+import pytest
+
+import ttk_calculator
+from ttk_store import TTKStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with TTKStore(str(tmp_path / 'results.sqlite'), ratio_steps=4) as store:
+        yield store
+    ttk_calculator.load_data()
+
+
+def test_subset_refresh_keeps_store_data_version(store):
+    store.refresh()
+    built_from = ttk_calculator.DATA_VERSION
+    assert store.data_version() == built_from
+
+    ttk_calculator.update_gun_base_stats('kettle', reload_time=ttk_calculator.GUNS['kettle']['reload_time'] + 1)
+    ttk_calculator.update_gun_base_stats('hairpin', reload_time=ttk_calculator.GUNS['hairpin']['reload_time'] + 1)
+    store.refresh(guns=['kettle'])
+    assert store.data_version() == built_from != ttk_calculator.DATA_VERSION
+
+    store.refresh()
+    assert store.data_version() == ttk_calculator.DATA_VERSION
+
+
+def test_subset_refresh_of_new_store_has_no_data_version(store):
+    summary = store.refresh(guns=['kettle'])
+    assert summary['updated'] > 0
+    assert store.data_version() is None
@@ -0,0 +1,29 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ttk_sweep import run_sweep
+
+GRID = {'guns': ['kettle', 'ferro'], 'shield_types': ['medium'], 'levels': (1, 4), 'headshot_ratios': (0.0, 0.5, 1.0)}
+
+
+def _sweep(**options):
+    return run_sweep(**GRID, monte_carlo_trials=200, hit_ratio=0.7, **options)
+
+
+def test_sweep_is_identical_for_any_worker_count():
+    serial = _sweep(seed=11, workers=1, chunk_size=3)
+    parallel = _sweep(seed=11, workers=4, chunk_size=3)
+    rechunked = _sweep(seed=11, workers=1, chunk_size=5)
+    assert serial.keys() == parallel.keys()
+    for key in serial:
+        np.testing.assert_array_equal(parallel[key], serial[key])
+        np.testing.assert_array_equal(rechunked[key], serial[key])
+
+
+def test_sweep_seed_changes_monte_carlo_columns():
+    first = _sweep(seed=11, workers=1)
+    second = _sweep(seed=12, workers=1)
+    np.testing.assert_array_equal(first['ttk'], second['ttk'])
+    assert not np.array_equal(first['mc_p50_ttk'], second['mc_p50_ttk'])
+    assert not np.array_equal(first['mc_p90_ttk'], second['mc_p90_ttk'])
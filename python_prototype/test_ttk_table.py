@@ -0,0 +1,65 @@
+import math
+
+import pytest
+
+import ttk_calculator
+from ttk_table import TTKTable, build_ttk_table
+
+RATIOS = [step / 200 for step in range(201)]
+CONFIGS = [('kettle', 'light', 1), ('kettle', 'heavy', 4), ('ferro', 'medium', 2), ('hairpin', 'light', 1)]
+
+
+@pytest.fixture
+def table(tmp_path):
+    pytest.importorskip('numpy')
+    path = str(tmp_path / 'ttk.tbl')
+    build_ttk_table(path, ratio_steps=10)
+    with TTKTable(path) as table:
+        yield table
+    ttk_calculator.load_data()
+
+
+def _expected():
+    return {
+        (config, ratio): ttk_calculator.solve_ttk_for_gun(*config, ratio)
+        for config in CONFIGS for ratio in RATIOS
+    }
+
+
+def _looked_up(table):
+    results = {}
+    for config in CONFIGS:
+        for ratio in RATIOS:
+            row = table.lookup(*config, ratio)
+            results[config, ratio] = (row['ttk'], row['bullets_fired'], row['reloads'])
+    return results
+
+
+def test_off_grid_lookup_matches_solver(table):
+    assert _looked_up(table) == _expected()
+
+
+def test_off_grid_lookup_keeps_table_data_after_edit(table):
+    expected = _expected()
+    ttk_calculator.update_gun_base_stats('kettle', damage=ttk_calculator.GUNS['kettle']['damage'] * 1.37)
+    ttk_calculator.update_headshot_multiplier('hairpin', 1.5)
+    assert table.is_stale()
+    assert _looked_up(table) == expected
+
+
+def test_off_grid_lookup_of_removed_gun(table):
+    expected = _expected()
+    del ttk_calculator.GUNS['kettle']
+    ttk_calculator.calculate_gun_stats_by_level()
+    assert _looked_up(table) == expected
+
+
+@pytest.mark.parametrize('headshot_ratio', [math.nan, math.inf, -math.inf, -0.01, 1.01])
+def test_lookup_of_invalid_ratio_returns_none(table, headshot_ratio):
+    assert table.lookup('kettle', 'light', 1, headshot_ratio) is None
+
+
+def test_lookup_of_unknown_inputs_returns_none(table):
+    assert table.lookup('nope', 'light', 1, 0.5) is None
+    assert table.lookup('kettle', 'nope', 1, 0.5) is None
+    assert table.lookup('kettle', 'light', 7, 0.5) is None
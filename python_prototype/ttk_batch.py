@@ -0,0 +1,221 @@
+"""
+Vectorized batch TTK engine.
+
+Evaluates the closed-form model from ttk_calculator.solve_ttk over whole
+arrays of (gun, shield, level, headshot_ratio) queries with NumPy, instead of
+one Python call per combination. Requires NumPy.
+"""
+
+import time
+
+import numpy as np
+
+import ttk_calculator
+
+
+def _store_arrays(store):
+    """
+    Zero-copy NumPy views of a GunStatsStore's per-level arrays.
+
+    Returns:
+        dict: Arrays of shape (guns, 4) indexed by [gun_id, level - 1], plus
+              per-gun 'headshot_multiplier' and per-shield 'shield_health' and
+              'shield_damage_reduction' arrays
+    """
+    tables = {
+        name: np.frombuffer(getattr(store, name), dtype=np.float64).reshape(-1, 4)
+        for name in ('damage', 'fire_rate', 'reload_time')
+    }
+    tables['mag_size'] = np.frombuffer(store.mag_size, dtype=np.int64).reshape(-1, 4)
+    for name in ('headshot_multiplier', 'shield_health', 'shield_damage_reduction'):
+        tables[name] = np.frombuffer(getattr(store, name), dtype=np.float64)
+    return tables
+
+
+def _encode(values, valid_names, label):
+    """
+    Map an array of names to integer indices into valid_names.
+
+    Raises:
+        ValueError: If any name is not in valid_names
+    """
+    unique_names, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    name_to_index = {name: index for index, name in enumerate(valid_names)}
+    unknown = [str(name) for name in unique_names if name not in name_to_index]
+    if unknown:
+        raise ValueError(f"Invalid {label} {unknown}. Must be one of: {list(valid_names)}")
+    lookup = np.array([name_to_index[name] for name in unique_names], dtype=np.int64)
+    return lookup[inverse].reshape(np.shape(values))
+
+
+def _steps_exactly(*values):
+    """Array version of ttk_calculator.steps_exactly."""
+    exact = True
+    for value in values:
+        scaled = value * ttk_calculator.EXACT_STEP_GRAIN
+        exact = exact & (scaled == np.floor(scaled)) & (np.abs(value) < ttk_calculator.EXACT_STEP_LIMIT)
+    return exact
+
+
+def _exact_kill_boundary(pool, damage_per_shot, scale=None, shots_before=0, exact=False):
+    """Array version of ttk_calculator.is_exact_kill_boundary."""
+    if scale is None:
+        scale = pool
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shots = pool / damage_per_shot
+        slack = (ttk_calculator.KILL_ROUNDING_SLACK * (shots_before + shots + 4)
+                 * np.maximum(scale, damage_per_shot) / damage_per_shot)
+        near_whole = np.abs(shots - np.round(shots)) <= slack
+        return near_whole & ~(exact & (np.fmod(pool, damage_per_shot) == 0))
+
+
+def _count_bullets_to_kill_arrays(damage_per_bullet, shield_health, shield_damage_reduction, health):
+    """Array version of ttk_calculator.count_bullets_to_kill over 1-D arrays, stepping all entries at once."""
+    shield_health = shield_health.copy()
+    health = health.copy()
+    bullets_fired = np.zeros(health.shape, dtype=np.int64)
+    alive = health > 0
+    while np.any(alive):
+        bullets_fired += alive
+        shielded = alive & (shield_health > 0)
+        broken = alive & ~shielded
+        health[shielded] -= damage_per_bullet[shielded] * (1 - shield_damage_reduction[shielded])
+        shield_health[shielded] -= damage_per_bullet[shielded]
+        health[broken] -= damage_per_bullet[broken]
+        alive = health > 0
+    return bullets_fired
+
+
+def solve_ttk_arrays(damage_per_bullet, firerate, mag_size, reload_time,
+                     shield_health, shield_damage_reduction, health=None):
+    """
+    Array version of ttk_calculator.solve_ttk.
+
+    All arguments broadcast against each other. The arithmetic mirrors the scalar
+    solver step for step so both give the same float results, including the
+    exact recount of entries on an exact-kill boundary.
+
+    Returns:
+        tuple: (ttk, bullets_fired, reloads) arrays
+    """
+    if health is None:
+        health = ttk_calculator.BASE_HEALTH
+    damage_per_bullet = np.asarray(damage_per_bullet, dtype=np.float64)
+    shield_health = np.asarray(shield_health, dtype=np.float64)
+    shielded_damage = damage_per_bullet * (1 - np.asarray(shield_damage_reduction, dtype=np.float64))
+    has_shield = shield_health > 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shield_bullets = np.where(has_shield, np.ceil(shield_health / damage_per_bullet), 0.0)
+        kill_bullets = np.where(shielded_damage > 0, np.ceil(health / shielded_damage), np.inf)
+    dies_behind_shield = has_shield & (kill_bullets <= shield_bullets)
+
+    remaining_health = np.where(has_shield, health - shield_bullets * shielded_damage, float(health))
+    broken_bullets = np.where(remaining_health > 0, np.ceil(remaining_health / damage_per_bullet), 0.0)
+    bullets_fired = np.where(dies_behind_shield, kill_bullets, shield_bullets + broken_bullets).astype(np.int64)
+
+    # Whether each phase's subtractions are exact (see ttk_calculator.steps_exactly)
+    shield_exact = _steps_exactly(shield_health, damage_per_bullet)
+    health_exact = _steps_exactly(health, shielded_damage)
+    on_boundary = ((has_shield & _exact_kill_boundary(shield_health, damage_per_bullet, exact=shield_exact))
+                   | (has_shield & (shielded_damage > 0)
+                      & _exact_kill_boundary(health, shielded_damage, exact=health_exact))
+                   | (~dies_behind_shield & (remaining_health > 0)
+                      & _exact_kill_boundary(remaining_health, damage_per_bullet, health, shield_bullets,
+                                             shield_exact & health_exact)))
+    if np.any(on_boundary):
+        bullets_fired = np.array(np.broadcast_to(bullets_fired, on_boundary.shape))
+        inputs = np.broadcast_arrays(damage_per_bullet, shield_health,
+                                     np.asarray(shield_damage_reduction, dtype=np.float64),
+                                     np.asarray(health, dtype=np.float64))
+        bullets_fired[on_boundary] = _count_bullets_to_kill_arrays(*(values[on_boundary] for values in inputs))
+
+    reloads = (bullets_fired - 1) // mag_size
+    bullet_intervals = bullets_fired - 1 - reloads
+    ttk = bullet_intervals * (1.0 / np.asarray(firerate, dtype=np.float64)) + reloads * np.asarray(reload_time)
+    return ttk, bullets_fired, reloads
+
+
+def resolve_batch_inputs(guns, shield_types='light', levels=1, headshot_ratios=0.0, grid=False):
+    """
+    Validate batch queries and look up the arrays solve_ttk_arrays needs.
+
+    Arguments are the same as for calculate_ttk_batch.
+
+    Returns:
+        dict: Broadcastable 'damage_per_bullet', 'firerate', 'mag_size', 'reload_time',
+              'shield_health' and 'shield_damage_reduction' arrays
+
+    Raises:
+        ValueError: If any gun, shield type, level or headshot ratio is invalid
+    """
+    if grid:
+        axes = [np.atleast_1d(guns), np.atleast_1d(shield_types),
+                np.atleast_1d(levels), np.atleast_1d(headshot_ratios)]
+        guns, shield_types, levels, headshot_ratios = np.meshgrid(*axes, indexing='ij', sparse=True)
+
+    store = ttk_calculator.GUN_STATS_STORE
+    gun_index = _encode(guns, store.gun_names, 'gun name')
+    shield_index = _encode(shield_types, store.shield_names, 'shield type')
+
+    levels = np.asarray(levels)
+    if np.any((levels < 1) | (levels > 4)) or np.any(levels != np.floor(levels)):
+        raise ValueError("Invalid level. Must be between 1 and 4")
+    level_index = levels.astype(np.int64) - 1
+
+    headshot_ratios = np.asarray(headshot_ratios, dtype=np.float64)
+    if np.any(~np.isfinite(headshot_ratios) | (headshot_ratios < 0.0) | (headshot_ratios > 1.0)):
+        raise ValueError("Invalid headshot_ratio. Must be between 0.0 and 1.0")
+
+    tables = _store_arrays(store)
+    base_damage = tables['damage'][gun_index, level_index]
+    headshot_multiplier = tables['headshot_multiplier'][gun_index]
+    return {
+        'damage_per_bullet': base_damage * (1 - headshot_ratios) + base_damage * headshot_ratios * headshot_multiplier,
+        'firerate': tables['fire_rate'][gun_index, level_index],
+        'mag_size': tables['mag_size'][gun_index, level_index],
+        'reload_time': tables['reload_time'][gun_index, level_index],
+        'shield_health': tables['shield_health'][shield_index],
+        'shield_damage_reduction': tables['shield_damage_reduction'][shield_index]
+    }
+
+
+def calculate_ttk_batch(guns, shield_types='light', levels=1, headshot_ratios=0.0, grid=False):
+    """
+    Calculate TTK, bullets fired and reloads for many queries at once.
+
+    Args:
+        guns: Gun name or array-like of gun names
+        shield_types: Shield type or array-like of shield types
+        levels: Level or array-like of levels (1-4)
+        headshot_ratios: Ratio or array-like of ratios (0.0-1.0)
+        grid (bool): If False, the four inputs are broadcast against each other
+            element-wise. If True, they are treated as axes of a cartesian grid and
+            results have shape (len(guns), len(shield_types), len(levels), len(headshot_ratios))
+
+    Returns:
+        dict: 'ttk' (float64), 'bullets_fired' (int64) and 'reloads' (int64) arrays
+
+    Raises:
+        ValueError: If any gun, shield type, level or headshot ratio is invalid
+    """
+    instrumentation = ttk_calculator._INSTRUMENTATION
+    if instrumentation is not None:
+        started = time.perf_counter()
+    inputs = resolve_batch_inputs(guns, shield_types, levels, headshot_ratios, grid)
+    ttk, bullets_fired, reloads = solve_ttk_arrays(
+        inputs['damage_per_bullet'],
+        inputs['firerate'],
+        inputs['mag_size'],
+        inputs['reload_time'],
+        inputs['shield_health'],
+        inputs['shield_damage_reduction']
+    )
+    if instrumentation is not None:
+        instrumentation.record_call('calculate_ttk_batch', time.perf_counter() - started)
+        instrumentation.increment('calculate_ttk_batch.queries', int(bullets_fired.size))
+    return {
+        'ttk': ttk,
+        'bullets_fired': bullets_fired,
+        'reloads': reloads
+    }
@@ -0,0 +1,270 @@
+"""
+Exact headshot-ratio breakpoints of bullets-to-kill.
+
+For a fixed gun, shield and level, damage per bullet is linear in the headshot
+ratio and bullets-to-kill is a step function of damage per bullet, so TTK only
+changes at a finite set of ratios. BreakpointIndex finds those ratios once and
+answers every later ratio query with a binary search.
+
+The steps can only occur where one of the solver's ceil() arguments is an
+integer:
+    shield / damage = k
+    health / (damage * (1 - reduction)) = k
+    health / damage - shield_bullets * (1 - reduction) = j
+Each candidate is then pinned to the exact float where solve_ttk changes value,
+so the index agrees with calculate_ttk_closed_form at every ratio.
+
+With a headshot multiplier of 1.0 the blended damage only differs from the base
+damage by float rounding, which still flips exact kills by one bullet at
+scattered ratios. Those indexes have a single step, answer lookups by solving
+the ratio directly and list every result the rounding can produce in
+rounding_outcomes.
+"""
+
+import math
+from bisect import bisect_right
+
+import ttk_calculator
+
+# How far (in ulps) the blended damage of a 1.0 headshot multiplier can round away from the base damage
+ROUNDING_ULPS = 3
+
+
+def _candidate_damages(damage_range, shield_health, shield_damage_reduction, health):
+    """Damage-per-bullet values inside damage_range where bullets-to-kill may change."""
+    low, high = damage_range
+    candidates = set()
+    kept_fraction = 1 - shield_damage_reduction
+
+    def add(damage):
+        if low <= damage <= high:
+            candidates.add(damage)
+
+    if shield_health > 0:
+        shield_counts = range(max(1, math.floor(shield_health / high)), math.ceil(shield_health / low) + 2)
+        for k in shield_counts:
+            add(shield_health / k)
+        if kept_fraction > 0:
+            for k in range(max(1, math.floor(health / (high * kept_fraction))),
+                           math.ceil(health / (low * kept_fraction)) + 2):
+                add(health / (k * kept_fraction))
+        for shield_bullets in shield_counts:
+            for j in range(0, math.ceil(health / low) + 2):
+                denominator = j + shield_bullets * kept_fraction
+                if denominator > 0:
+                    add(health / denominator)
+    else:
+        for k in range(max(1, math.floor(health / high)), math.ceil(health / low) + 2):
+            add(health / k)
+    return candidates
+
+
+def _first_ratio_with_new_value(solve, low, high, low_value):
+    """
+    Bisect floats in (low, high] for the smallest ratio whose bullets differ from low_value.
+
+    Assumes bullets change exactly once between low and high.
+    """
+    while math.nextafter(low, high) < high:
+        middle = low + (high - low) / 2
+        if middle <= low or middle >= high:
+            middle = math.nextafter(low, high)
+        if solve(middle)[1] == low_value:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def _rounding_outcomes(base_damage, firerate, mag_size, reload_time, shield_health, shield_damage_reduction):
+    """
+    Distinct solve_ttk results for damage within ROUNDING_ULPS of base_damage.
+
+    Returns:
+        list: (ttk, bullets_fired, reloads) tuples sorted by bullets
+    """
+    damages = [base_damage]
+    for direction in (-math.inf, math.inf):
+        damage = base_damage
+        for _ in range(ROUNDING_ULPS):
+            damage = math.nextafter(damage, direction)
+            damages.append(damage)
+    return sorted({ttk_calculator.solve_ttk(damage, firerate, mag_size, reload_time, shield_health,
+                                            shield_damage_reduction) for damage in damages},
+                  key=lambda outcome: outcome[1])
+
+
+class BreakpointIndex:
+    """
+    Sorted step-function index of bullets to kill over headshot ratio for one configuration.
+
+    Attributes:
+        ratios (list): Start ratio of each step, ascending, first is 0.0
+        bullets (list): Bullets to kill from ratios[i] up to (not including) ratios[i + 1]
+        ttk (list): TTK for each step
+        reloads (list): Reloads for each step
+        rounding_outcomes (list): For a headshot multiplier of 1.0, every (ttk, bullets_fired,
+            reloads) the single step can take at some ratio through float rounding
+            (one entry if rounding never changes it); empty otherwise
+    """
+
+    def __init__(self, gun_name, shield_type, level):
+        self.gun_name = gun_name
+        self.shield_type = shield_type
+        self.level = level
+        self.data_version = ttk_calculator.DATA_VERSION
+
+        def solve(ratio):
+            return ttk_calculator.solve_ttk_for_gun(gun_name, shield_type, level, ratio)
+
+        store = ttk_calculator.GUN_STATS_STORE
+        gun_id = store.gun_id(gun_name)
+        base_damage = store.level_stats(gun_id, level)[0]
+        headshot_multiplier = store.headshot_multiplier[gun_id]
+        self._solve_directly = headshot_multiplier == 1.0
+        shield_health, shield_damage_reduction = store.shield_stats(store.shield_id(shield_type))
+        self.rounding_outcomes = []
+        if self._solve_directly:
+            self.rounding_outcomes = _rounding_outcomes(base_damage, *store.level_stats(gun_id, level)[1:],
+                                                        shield_health, shield_damage_reduction)
+
+        # Candidate breakpoints as ratios in (0, 1), then sample the middle of every gap
+        boundaries = [0.0, 1.0]
+        if headshot_multiplier != 1.0:
+            damage_range = sorted([base_damage, base_damage * headshot_multiplier])
+            for damage in _candidate_damages(damage_range, shield_health, shield_damage_reduction,
+                                             ttk_calculator.BASE_HEALTH):
+                ratio = (damage / base_damage - 1) / (headshot_multiplier - 1)
+                if 0.0 < ratio < 1.0:
+                    boundaries.append(ratio)
+        boundaries = sorted(set(boundaries))
+        samples = [0.0]
+        for left, right in zip(boundaries, boundaries[1:]):
+            samples.append(left + (right - left) / 2)
+        samples.append(1.0)
+
+        first = solve(0.0)
+        self.ratios = [0.0]
+        self.ttk = [first[0]]
+        self.bullets = [first[1]]
+        self.reloads = [first[2]]
+        previous_ratio = 0.0
+        for ratio in samples[1:]:
+            ttk, bullets_fired, reloads = solve(ratio)
+            if bullets_fired != self.bullets[-1]:
+                start = _first_ratio_with_new_value(solve, previous_ratio, ratio, self.bullets[-1])
+                ttk, bullets_fired, reloads = solve(start)
+                self.ratios.append(start)
+                self.ttk.append(ttk)
+                self.bullets.append(bullets_fired)
+                self.reloads.append(reloads)
+            previous_ratio = ratio
+
+    def __len__(self):
+        return len(self.ratios)
+
+    def _step(self, index):
+        return {
+            'ratio': self.ratios[index],
+            'ttk': self.ttk[index],
+            'bullets_fired': self.bullets[index],
+            'reloads': self.reloads[index]
+        }
+
+    def lookup(self, headshot_ratio):
+        """
+        TTK at any headshot ratio by binary search.
+
+        Returns:
+            dict: ttk, bullets_fired, reloads and the 'ratio' where this step starts
+                  (the queried ratio itself for a headshot multiplier of 1.0),
+                  or None if the ratio is outside 0.0-1.0
+        """
+        if headshot_ratio < 0.0 or headshot_ratio > 1.0:
+            return None
+        if self._solve_directly:
+            ttk, bullets_fired, reloads = ttk_calculator.solve_ttk_for_gun(
+                self.gun_name, self.shield_type, self.level, headshot_ratio)
+            return {'ratio': headshot_ratio, 'ttk': ttk, 'bullets_fired': bullets_fired, 'reloads': reloads}
+        return self._step(bisect_right(self.ratios, headshot_ratio) - 1)
+
+    def next_bullet_saved(self, headshot_ratio):
+        """
+        The smallest headshot ratio above headshot_ratio that needs fewer bullets.
+
+        Returns:
+            dict: Step at that ratio (ratio, ttk, bullets_fired, reloads), or None if
+                  no higher ratio saves a bullet
+        """
+        if headshot_ratio < 0.0 or headshot_ratio > 1.0:
+            return None
+        if self._solve_directly:
+            # Only rounding changes the result: step float by float to the nearest ratio that saves a bullet
+            current = self.lookup(headshot_ratio)['bullets_fired']
+            if current == self.rounding_outcomes[0][1]:
+                return None
+            ratio = headshot_ratio
+            while ratio < 1.0:
+                ratio = math.nextafter(ratio, 1.0)
+                step = self.lookup(ratio)
+                if step['bullets_fired'] < current:
+                    return step
+            return None
+        index = bisect_right(self.ratios, headshot_ratio) - 1
+        current = self.bullets[index]
+        for next_index in range(index + 1, len(self.ratios)):
+            if self.bullets[next_index] < current:
+                return self._step(next_index)
+        return None
+
+    def steps(self):
+        """All steps in ratio order as dicts."""
+        return [self._step(index) for index in range(len(self.ratios))]
+
+
+_index_cache = {}
+_index_cache_version = None
+
+
+def get_breakpoint_index(gun_name, shield_type='light', level=1):
+    """
+    Get the BreakpointIndex for a configuration, building it on first use.
+
+    Indexes are rebuilt automatically after the data tables change
+    (tracked by ttk_calculator.DATA_VERSION).
+
+    Returns:
+        BreakpointIndex: The index, or None if the gun, shield or level is invalid
+    """
+    global _index_cache_version
+    if ttk_calculator.get_validation_error(gun_name, shield_type, level) is not None:
+        return None
+    if _index_cache_version != ttk_calculator.DATA_VERSION:
+        stale = ttk_calculator.get_stale_since(_index_cache_version)
+        if stale is None:
+            _index_cache.clear()
+        else:
+            for key in stale:
+                _index_cache.pop(key, None)
+        _index_cache_version = ttk_calculator.DATA_VERSION
+
+    key = (gun_name, shield_type, level)
+    index = _index_cache.get(key)
+    if index is None:
+        index = _index_cache[key] = BreakpointIndex(gun_name, shield_type, level)
+    return index
+
+
+def build_all_breakpoint_indexes():
+    """
+    Build indexes for every gun, shield and level.
+
+    Returns:
+        dict: {(gun_name, shield_type, level): BreakpointIndex}
+    """
+    return {
+        (gun_name, shield_type, level): get_breakpoint_index(gun_name, shield_type, level)
+        for gun_name in ttk_calculator.GUNS
+        for shield_type in ttk_calculator.SHIELDS
+        for level in [1, 2, 3, 4]
+    }
@@ -0,0 +1,181 @@
+"""
+Bounded LRU cache in front of calculate_ttk and calculate_ttk_detailed.
+
+Entries are tagged with ttk_calculator.DATA_VERSION, so editing GUNS, SHIELDS,
+HEADSHOT_MULTIPLIERS or GUN_UPGRADES and rerunning calculate_gun_stats_by_level
+invalidates everything cached from the old data automatically. Edits made
+through the ttk_calculator.update_* functions only drop the entries they affect.
+"""
+
+from collections import OrderedDict
+
+import ttk_calculator
+
+
+class TTKCache:
+    """
+    Least-recently-used cache of TTK results keyed by (gun, shield, level, headshot_ratio).
+
+    Args:
+        maxsize (int): Maximum number of cached results before the oldest is evicted
+        headshot_quantum (float, optional): If set, headshot_ratio is rounded to a
+            multiple of this step before lookup and calculation (e.g. 0.01), so nearby
+            ratios share one entry. Results are then exact for the rounded ratio.
+    """
+
+    def __init__(self, maxsize=4096, headshot_quantum=None):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        if headshot_quantum is not None and headshot_quantum <= 0:
+            raise ValueError(f"headshot_quantum must be positive, got {headshot_quantum}")
+        self.maxsize = maxsize
+        self.headshot_quantum = headshot_quantum
+        self._entries = OrderedDict()
+        # Unknown until first use, so creating a cache doesn't load the data tables
+        self._data_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _quantize(self, headshot_ratio):
+        # Out-of-range ratios stay as they are, so calculate reports them like the uncached path
+        if self.headshot_quantum is None or not 0.0 <= headshot_ratio <= 1.0:
+            return headshot_ratio
+        steps = round(headshot_ratio / self.headshot_quantum)
+        return min(1.0, max(0.0, steps * self.headshot_quantum))
+
+    def _check_data_version(self):
+        if self._data_version != ttk_calculator.DATA_VERSION:
+            if self._data_version is not None:
+                stale = ttk_calculator.get_stale_since(self._data_version)
+                if stale is None:
+                    self._entries.clear()
+                else:
+                    # Incremental edit: only drop the (gun, shield, level) entries it touched
+                    for key in [key for key in self._entries if key[1:4] in stale]:
+                        del self._entries[key]
+                self.invalidations += 1
+            self._data_version = ttk_calculator.DATA_VERSION
+
+    def get(self, kind, gun_name, shield_type, level, headshot_ratio):
+        """
+        Look up a cached result without calculating it.
+
+        Args:
+            kind (str): Namespace of the result, e.g. 'ttk', 'detailed' or a caller's own
+            gun_name, shield_type, level, headshot_ratio: The configuration
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        self._check_data_version()
+        key = (kind, gun_name, shield_type, level, self._quantize(headshot_ratio))
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, kind, gun_name, shield_type, level, headshot_ratio, result):
+        """
+        Store a result calculated elsewhere, such as by a batch engine.
+
+        With headshot_quantum set, the result must be for the rounded ratio.
+        """
+        self._check_data_version()
+        self._entries[(kind, gun_name, shield_type, level, self._quantize(headshot_ratio))] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _get(self, kind, calculate, gun_name, shield_type, level, headshot_ratio):
+        headshot_ratio = self._quantize(headshot_ratio)
+        result = self.get(kind, gun_name, shield_type, level, headshot_ratio)
+        if result is not None:
+            return result
+
+        result = calculate(gun_name, shield_type, level, headshot_ratio)
+        if result is None:
+            # Invalid input: don't cache so the error is reported on every call
+            return None
+        self.put(kind, gun_name, shield_type, level, headshot_ratio, result)
+        return result
+
+    def calculate_ttk(self, gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+        """Cached ttk_calculator.calculate_ttk."""
+        return self._get('ttk', ttk_calculator.calculate_ttk, gun_name, shield_type, level, headshot_ratio)
+
+    def calculate_ttk_detailed(self, gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+        """
+        Cached ttk_calculator.calculate_ttk_detailed.
+
+        Returns a shallow copy of the cached dict; the damage_log list is shared
+        between callers and should be treated as read-only.
+        """
+        result = self._get('detailed', ttk_calculator.calculate_ttk_detailed,
+                           gun_name, shield_type, level, headshot_ratio)
+        return dict(result) if result is not None else None
+
+    def clear(self):
+        """Drop all entries and reset statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def stats(self):
+        """
+        Get hit/miss statistics.
+
+        Returns:
+            dict: hits, misses, evictions, invalidations, size, maxsize and hit_ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Shared module-level cache used by the functions below
+_default_cache = TTKCache()
+
+
+def configure_cache(maxsize=4096, headshot_quantum=None):
+    """
+    Replace the shared cache with a new, empty one.
+
+    Args:
+        maxsize (int): Maximum number of cached results
+        headshot_quantum (float, optional): Headshot ratio rounding step, or None for exact ratios
+    """
+    global _default_cache
+    _default_cache = TTKCache(maxsize, headshot_quantum)
+
+
+def get_cache():
+    """Get the shared TTKCache instance."""
+    return _default_cache
+
+
+def cached_calculate_ttk(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+    """calculate_ttk through the shared cache."""
+    return _default_cache.calculate_ttk(gun_name, shield_type, level, headshot_ratio)
+
+
+def cached_calculate_ttk_detailed(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+    """calculate_ttk_detailed through the shared cache."""
+    return _default_cache.calculate_ttk_detailed(gun_name, shield_type, level, headshot_ratio)
+
+
+def cache_stats():
+    """Hit/miss statistics of the shared cache."""
+    return _default_cache.stats()
@@ -5,415 +5,388 @@ Calculates the effective time to kill a target with base health of 100
 and various shield types that provide damage reduction.
 """
 
-# Shield configurations
-SHIELDS = {
-    'light': {
-        'shield_damage_reduction': 0.4,
-        'shield_health': 40
-    },
-    'medium': {
-        'shield_damage_reduction': 0.425,
-        'shield_health': 70
-    },
-    'heavy': {
-        'shield_damage_reduction': 0.525,
-        'shield_health': 80
-    }
-}
-
-# Gun configurations
-# BPS = Bullets Per Second (fire_rate)
-# Note: reload_time values preserved from previous config where available, default 2.0s for new weapons
-GUNS = {
-    'bobcat': {
-        'damage': 6,
-        'fire_rate': 16.785,
-        'mag_size': 20,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'torrente': {
-        'damage': 8,
-        'fire_rate': 13.42,
-        'mag_size': 60,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'stitcher': {
-        'damage': 7,
-        'fire_rate': 11.448,
-        'mag_size': 20,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'tempest': {
-        'damage': 10,
-        'fire_rate': 9.315,
-        'mag_size': 25,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'kettle': {
-        'damage': 10,
-        'fire_rate': 7.415,
-        'mag_size': 20,
-        'reload_time': 3  # Preserved from previous config
-    },
-    'burletta': {
-        'damage': 10,
-        'fire_rate': 6.519,
-        'mag_size': 12,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'bettina': {
-        'damage': 14,
-        'fire_rate': 4.8,
-        'mag_size': 20,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'venator': {
-        'damage': 18,
-        'fire_rate': 3.169,
-        'mag_size': 10,
-        'reload_time': 1.78  # Preserved from previous config
-    },
-    'vulcano': {
-        'damage': 49.5,
-        'fire_rate': 1.899,
-        'mag_size': 6,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'renegade': {
-        'damage': 35,  # Not provided in new data, preserved from previous config
-        'fire_rate': 0.743,
-        'mag_size': 8,
-        'reload_time': 4.56  # Preserved from previous config
-    },
-    'toro': {
-        'damage': 67.5,
-        'fire_rate': 0.694,
-        'mag_size': 5,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'anvil': {
-        'damage': 40,
-        'fire_rate': 0.65,
-        'mag_size': 6,
-        'reload_time': 2.0  # Default, needs verification
-    },
-    'ferro': {
-        'damage': 40,
-        'fire_rate': 0.341,
-        'mag_size': 1,
-        'reload_time': 1.73  # Preserved from previous config
-    }
-}
-
-# Base health constant
-BASE_HEALTH = 100
-
-# Headshot multipliers for each gun
-# Damage to head is multiplied by this value (body shots = 1x)
-HEADSHOT_MULTIPLIERS = {
-    'bobcat': 2.0,
-    'torrente': 2.0,
-    'stitcher': 2.5,
-    'tempest': 1.5,
-    'kettle': 2.5,
-    'burletta': 2.5,
-    'bettina': 2.0,
-    'venator': 2.5,
-    'vulcano': 1.0,
-    'renegade': 2.25,
-    'toro': 1.0,  # Not provided, defaulting to 1x
-    'anvil': 2.5,
-    'ferro': 2.5
-}
-
-# Gun upgrade configurations
-# Each gun can have upgrade modifiers for levels 2, 3, and 4
-# Supported modifiers:
-#   - fire_rate_increase: Percentage increase (e.g., 0.25 = 25% increase)
-#   - reload_reduction: Percentage reduction from base (e.g., 0.13 = 13% reduction)
-#   - mag_size_bonus: Absolute increase in magazine size (e.g., 10 = +10 bullets)
-#   - durability_bonus: Absolute increase in durability (e.g., 10 = +10 durability)
-# Note: Some upgrades mention bullet velocity, recoil, dispersion - these don't affect TTK calculations
-GUN_UPGRADES = {
-    'kettle': {
-        2: {
-            'reload_reduction': 0.13,  # 13% reduced reload time
-            'durability_bonus': 10
-            # 25% Increased Bullet Velocity - not used in TTK calculation
-        },
-        3: {
-            'reload_reduction': 0.26,  # 26% reduced reload time
-            'durability_bonus': 20
-            # 50% Increased Bullet Velocity - not used in TTK calculation
-        },
-        4: {
-            'reload_reduction': 0.40,  # 40% reduced reload time
-            'durability_bonus': 30
-            # 75% Increased Bullet Velocity - not used in TTK calculation
-        }
-    },
-    'bobcat': {
-        2: {
-            'reload_reduction': 0.13,  # 13% reduced reload time
-            'durability_bonus': 10
-            # 15% Reduced Max Shot Dispersion, 15% Reduced Horizontal Recoil - not used in TTK
-        },
-        3: {
-            'reload_reduction': 0.26,  # 26% reduced reload time
-            'durability_bonus': 20
-            # 30% Reduced Max Shot Dispersion, 30% Reduced Horizontal Recoil - not used in TTK
-        },
-        4: {
-            'reload_reduction': 0.40,  # 40% reduced reload time
-            'durability_bonus': 30
-            # 50% Reduced Max Shot Dispersion, 45% Reduced Horizontal Recoil - not used in TTK
-        }
-    },
-    'torrente': {
-        2: {
-            'mag_size_bonus': 10,  # +10 Magazine Size
-            'reload_reduction': 0.15,  # 15% reduced reload time
-            'durability_bonus': 10
-        },
-        3: {
-            'mag_size_bonus': 20,  # +20 Magazine Size
-            'reload_reduction': 0.30,  # 30% reduced reload time
-            'durability_bonus': 20
-        },
-        4: {
-            'mag_size_bonus': 30,  # +30 Magazine Size
-            'reload_reduction': 0.45,  # 45% reduced reload time
-            'durability_bonus': 30
-        }
-    },
-    'stitcher': {
-        2: {
-            'reload_reduction': 0.13,  # 13% reduced reload time
-            'durability_bonus': 10
-            # 16.6% Reduced Horizontal Recoil - not used in TTK
-        },
-        3: {
-            'reload_reduction': 0.26,  # 26% reduced reload time
-            'durability_bonus': 20
-            # 33.3% Reduced Horizontal Recoil - not used in TTK
-        },
-        4: {
-            'reload_reduction': 0.40,  # 40% reduced reload time
-            'durability_bonus': 30
-            # 50% Reduced Horizontal Recoil - not used in TTK
-        }
-    },
-    'tempest': {
-        2: {
-            'reload_reduction': 0.13,  # 13% reduced reload time
-            'durability_bonus': 10
-            # 16.6% Reduced Horizontal Recoil - not used in TTK
-        },
-        3: {
-            'reload_reduction': 0.26,  # 26% reduced reload time
-            'durability_bonus': 20
-            # 33.3% Reduced Horizontal Recoil - not used in TTK
-        },
-        4: {
-            'reload_reduction': 0.40,  # 40% reduced reload time
-            'durability_bonus': 30
-            # 50% Reduced Horizontal Recoil - not used in TTK
-        }
-    },
-    'burletta': {
-        2: {
-            'reload_reduction': 0.166,  # 16.6% reduced reload time
-            'durability_bonus': 10
-        },
-        3: {
-            'reload_reduction': 0.333,  # 33.3% reduced reload time
-            'durability_bonus': 20
-        },
-        4: {
-            'reload_reduction': 0.50,  # 50% reduced reload time
-            'durability_bonus': 30
-        }
-    },
-    'bettina': {
-        # No upgrade data provided
-    },
-    'venator': {
-        2: {
-            'fire_rate_increase': 0.13,  # 13% increased fire rate
-            'reload_reduction': 0.16,  # 16% reduced reload time
-            'durability_bonus': 10
-        },
-        3: {
-            'fire_rate_increase': 0.26,  # 26% increased fire rate
-            'reload_reduction': 0.33,  # 33% reduced reload time
-            'durability_bonus': 20
-        },
-        4: {
-            'fire_rate_increase': 0.40,  # 40% increased fire rate
-            'reload_reduction': 0.50,  # 50% reduced reload time
-            'durability_bonus': 30
-        }
-    },
-    'vulcano': {
-        2: {
-            'fire_rate_increase': 0.10,  # 10% increased fire rate
-            'reload_reduction': 0.13,  # 13% reduced reload time
-            'durability_bonus': 10
-        },
-        3: {
-            'fire_rate_increase': 0.20,  # 20% increased fire rate
-            'reload_reduction': 0.26,  # 26% reduced reload time
-            'durability_bonus': 20
-        },
-        4: {
-            'fire_rate_increase': 0.30,  # 30% increased fire rate
-            'reload_reduction': 0.40,  # 40% reduced reload time
-            'durability_bonus': 30
-        }
-    },
-    'renegade': {
-        2: {
-            'fire_rate_increase': 0.25,  # 25% increased fire rate
-            'durability_bonus': 10
-            # 16.6% Reduced Dispersion Recovery Time - not used in TTK
-        },
-        3: {
-            'fire_rate_increase': 0.50,  # 50% increased fire rate
-            'durability_bonus': 20
-            # 33.3% Reduced Dispersion Recovery Time - not used in TTK
-        },
-        4: {
-            'fire_rate_increase': 0.75,  # 75% increased fire rate
-            'durability_bonus': 30
-            # 50% Reduced Dispersion Recovery Time - not used in TTK
-        }
-    },
-    'toro': {
-        2: {
-            'fire_rate_increase': 0.175,  # 17.5% increased fire rate
-            'mag_size_bonus': 1,  # +1 Magazine Size
-            'durability_bonus': 10
-        },
-        3: {
-            'fire_rate_increase': 0.35,  # 35% increased fire rate
-            'mag_size_bonus': 2,  # +2 Magazine Size
-            'durability_bonus': 20
-        },
-        4: {
-            'fire_rate_increase': 0.50,  # 50% increased fire rate
-            'mag_size_bonus': 3,  # +3 Magazine Size
-            'durability_bonus': 30
-        }
-    },
-    'anvil': {
-        2: {
-            'fire_rate_increase': 0.25,  # 25% increased fire rate
-            'durability_bonus': 10
-            # 6.5% Reduced Dispersion Recovery Time - not used in TTK
-        },
-        3: {
-            'fire_rate_increase': 0.50,  # 50% increased fire rate
-            'durability_bonus': 20
-            # 12.5% Reduced Dispersion Recovery Time - not used in TTK
-        },
-        4: {
-            'fire_rate_increase': 0.75,  # 75% increased fire rate
-            'durability_bonus': 30
-            # 18.75% Reduced Dispersion Recovery Time - not used in TTK
-        }
-    },
-    'ferro': {
-        2: {
-            'reload_reduction': 0.13,  # 13% reduced reload time
-            'durability_bonus': 10
-        },
-        3: {
-            'reload_reduction': 0.26,  # 26% reduced reload time
-            'durability_bonus': 20
-        },
-        4: {
-            'reload_reduction': 0.39,  # 39% reduced reload time
-            'durability_bonus': 30
-        }
-    }
-}
+import heapq
+import math
+import os
+import sys
+import time
+from collections import namedtuple
+
+from gun_stats_store import GunStatsStore
 
-# Pre-calculated gun stats for all levels (1-4)
-# Structure: {gun_name: {level: {damage, fire_rate, mag_size, reload_time, durability}}}
-GUN_STATS_BY_LEVEL = {}
+# Weapon data is loaded from the web app's src/data/guns.json, the single source
+# of truth shared with the TypeScript calculator. Override with TTK_DATA_PATH.
+DATA_PATH = os.environ.get(
+    'TTK_DATA_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src', 'data', 'guns.json')
+)
+
+# Compiled snapshots of the loaded and derived tables, keyed by the content hash
+# of the data file, so warm starts skip JSON parsing and stat derivation.
+# Override with TTK_SNAPSHOT_DIR.
+SNAPSHOT_DIR = os.environ.get(
+    'TTK_SNAPSHOT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.snapshots')
+)
+# Part of every snapshot's file name. Bump it whenever derive_gun_stats_by_level or
+# the snapshot layout changes: the key only hashes the data file, so old snapshots
+# would otherwise keep serving stats derived the old way.
+SNAPSHOT_FORMAT = 1
+
+# The data tables below are loaded on first use (see ensure_loaded), not at import,
+# so short-lived processes that never touch them don't pay for loading. Reading one
+# as a module attribute, e.g. ttk_calculator.GUNS, loads them.
+#
+# SHIELDS: Shield configurations: {shield_type: {shield_damage_reduction, shield_health}}
+#
+# GUNS: Gun configurations: {gun_name: {damage, fire_rate, mag_size, reload_time, ...}}
+#   BPS = Bullets Per Second (fire_rate)
+#
+# BASE_HEALTH: Base health constant
+#
+# HEADSHOT_MULTIPLIERS: Headshot multipliers for each gun
+#   Damage to head is multiplied by this value (body shots = 1x)
+#
+# GUN_UPGRADES: Gun upgrade configurations: {gun_name: {level: modifiers}}
+#   Each gun can have upgrade modifiers for levels 2, 3, and 4
+#   Supported modifiers:
+#     - fire_rate_increase: Percentage increase (e.g., 0.25 = 25% increase)
+#     - reload_reduction: Percentage reduction from base (e.g., 0.13 = 13% reduction)
+#     - mag_size_bonus: Absolute increase in magazine size (e.g., 10 = +10 bullets)
+#     - durability_bonus: Absolute increase in durability (e.g., 10 = +10 durability)
+#   Note: Some upgrades mention bullet velocity, recoil, dispersion - these don't affect TTK calculations
+#
+# GUN_STATS_BY_LEVEL: Pre-calculated gun stats for all levels (1-4)
+#   Structure: {gun_name: {level: {damage, fire_rate, mag_size, reload_time, durability}}}
+#
+# GUN_STATS_STORE: The same stats (plus headshot multipliers and shields) in compact
+#   typed arrays, indexed by integer gun/shield ids. Used by the fast TTK engines.
+#
+# DATA_VERSION: Content hash of the data tables GUN_STATS_BY_LEVEL was last built from.
+#   Caches and precomputed results compare against this to detect stale entries.
+_LAZY_TABLES = frozenset([
+    'SHIELDS', 'GUNS', 'BASE_HEALTH', 'HEADSHOT_MULTIPLIERS', 'GUN_UPGRADES',
+    'GUN_STATS_BY_LEVEL', 'GUN_STATS_STORE', 'DATA_VERSION'
+])
+_LOADED = False
+
+# Incremental edits since the last full rebuild: (version_before, version_after, stale triples)
+_EDIT_LOG = []
+MAX_EDIT_LOG = 256
+
+# Active ttk_instrumentation.Instrumentation, or None (the default) to skip all reporting.
+# Set through ttk_instrumentation.enable() / disable().
+_INSTRUMENTATION = None
+
+
+def ensure_loaded():
+    """Load the data tables and derived stats if nothing has loaded them yet."""
+    if not _LOADED:
+        if 'GUNS' in globals():
+            # Tables were assigned directly (e.g. by a worker initializer): only derive stats
+            calculate_gun_stats_by_level()
+        else:
+            load_data()
+
+
+def __getattr__(name):
+    # Module attribute fallback (PEP 562): only reached while the tables are not loaded
+    if name in _LAZY_TABLES:
+        ensure_loaded()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def compute_data_version():
+    """
+    Hash the current GUNS, SHIELDS, HEADSHOT_MULTIPLIERS, GUN_UPGRADES and BASE_HEALTH.
+    
+    Returns:
+        str: Hex digest that changes whenever any of the data tables change
+    """
+    import hashlib
+    import json
+    
+    if 'GUNS' not in globals():
+        load_data()
+    payload = json.dumps(
+        [GUNS, SHIELDS, HEADSHOT_MULTIPLIERS, GUN_UPGRADES, BASE_HEALTH],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def derive_gun_stats_by_level(gun_name):
+    """
+    Derive one gun's stats for levels 1-4 from GUNS and GUN_UPGRADES.
+    
+    Args:
+        gun_name (str): Name of a gun in GUNS
+    
+    Returns:
+        dict: {level: {damage, fire_rate, mag_size, reload_time, durability}}
+    """
+    if 'GUNS' not in globals():
+        load_data()
+    base_stats = GUNS[gun_name]
+    stats_by_level = {}
+    
+    # Level 1: Base stats (no modifications)
+    stats_by_level[1] = {
+        'damage': base_stats['damage'],
+        'fire_rate': base_stats['fire_rate'],
+        'mag_size': base_stats['mag_size'],
+        'reload_time': base_stats['reload_time'],
+        'durability': 100  # Base durability (assuming 100 as base)
+    }
+    
+    # Levels 2-4: Apply upgrade modifiers if available
+    if gun_name in GUN_UPGRADES:
+        upgrades = GUN_UPGRADES[gun_name]
+        
+        for level in [2, 3, 4]:
+            if level in upgrades:
+                upgrade = upgrades[level]
+                prev_level_stats = stats_by_level[level - 1]
+                
+                # Fire rate increase (percentage increase from base, cumulative)
+                if 'fire_rate_increase' in upgrade:
+                    fire_rate_increase = upgrade['fire_rate_increase']
+                    new_fire_rate = base_stats['fire_rate'] * (1 + fire_rate_increase)
+                else:
+                    new_fire_rate = prev_level_stats['fire_rate']
+                
+                # Magazine size bonus (additive from base, cumulative)
+                if 'mag_size_bonus' in upgrade:
+                    mag_size_bonus = upgrade['mag_size_bonus']
+                    new_mag_size = base_stats['mag_size'] + mag_size_bonus
+                else:
+                    new_mag_size = prev_level_stats['mag_size']
+                
+                # Reload time reduction (percentage reduction from base, cumulative)
+                if 'reload_reduction' in upgrade:
+                    reload_reduction = upgrade['reload_reduction']
+                    new_reload_time = base_stats['reload_time'] * (1 - reload_reduction)
+                else:
+                    new_reload_time = prev_level_stats['reload_time']
+                
+                # Durability bonus (additive from base, cumulative)
+                if 'durability_bonus' in upgrade:
+                    durability_bonus = upgrade['durability_bonus']
+                    new_durability = stats_by_level[1]['durability'] + durability_bonus
+                else:
+                    new_durability = prev_level_stats['durability']
+                
+                stats_by_level[level] = {
+                    'damage': prev_level_stats['damage'],  # Damage doesn't change
+                    'fire_rate': new_fire_rate,
+                    'mag_size': int(new_mag_size),  # Mag size must be integer
+                    'reload_time': new_reload_time,
+                    'durability': new_durability
+                }
+            else:
+                # If upgrade not defined, use previous level stats
+                stats_by_level[level] = stats_by_level[level - 1].copy()
+    else:
+        # If no upgrades defined, all levels use base stats
+        for level in [2, 3, 4]:
+            stats_by_level[level] = stats_by_level[1].copy()
+    
+    return stats_by_level
 
 
 def calculate_gun_stats_by_level():
     """
     Calculate and store gun stats for all levels (1-4) based on base stats and upgrades.
     This function pre-calculates all stats for reusability.
+    
+    This is a full rebuild; for a single edit use the update_* functions below,
+    which only recompute what changed. If the data tables have not been loaded
+    or assigned yet, they are loaded first.
     """
-    global GUN_STATS_BY_LEVEL
+    global GUN_STATS_BY_LEVEL, GUN_STATS_STORE, DATA_VERSION, _LOADED
+    if 'GUNS' not in globals():
+        load_data()
+        return
+    instrumentation = _INSTRUMENTATION
+    if instrumentation is not None:
+        started = time.perf_counter()
     GUN_STATS_BY_LEVEL = {}
+    DATA_VERSION = compute_data_version()
+    # Incremental edit history no longer describes what changed
+    _EDIT_LOG.clear()
     
-    for gun_name, base_stats in GUNS.items():
-        GUN_STATS_BY_LEVEL[gun_name] = {}
-        
-        # Level 1: Base stats (no modifications)
-        GUN_STATS_BY_LEVEL[gun_name][1] = {
-            'damage': base_stats['damage'],
-            'fire_rate': base_stats['fire_rate'],
-            'mag_size': base_stats['mag_size'],
-            'reload_time': base_stats['reload_time'],
-            'durability': 100  # Base durability (assuming 100 as base)
-        }
-        
-        # Levels 2-4: Apply upgrade modifiers if available
-        if gun_name in GUN_UPGRADES:
-            upgrades = GUN_UPGRADES[gun_name]
-            
-            for level in [2, 3, 4]:
-                if level in upgrades:
-                    upgrade = upgrades[level]
-                    prev_level_stats = GUN_STATS_BY_LEVEL[gun_name][level - 1]
-                    
-                    # Fire rate increase (percentage increase from base, cumulative)
-                    if 'fire_rate_increase' in upgrade:
-                        fire_rate_increase = upgrade['fire_rate_increase']
-                        new_fire_rate = base_stats['fire_rate'] * (1 + fire_rate_increase)
-                    else:
-                        new_fire_rate = prev_level_stats['fire_rate']
-                    
-                    # Magazine size bonus (additive from base, cumulative)
-                    if 'mag_size_bonus' in upgrade:
-                        mag_size_bonus = upgrade['mag_size_bonus']
-                        new_mag_size = base_stats['mag_size'] + mag_size_bonus
-                    else:
-                        new_mag_size = prev_level_stats['mag_size']
-                    
-                    # Reload time reduction (percentage reduction from base, cumulative)
-                    if 'reload_reduction' in upgrade:
-                        reload_reduction = upgrade['reload_reduction']
-                        new_reload_time = base_stats['reload_time'] * (1 - reload_reduction)
-                    else:
-                        new_reload_time = prev_level_stats['reload_time']
-                    
-                    # Durability bonus (additive from base, cumulative)
-                    if 'durability_bonus' in upgrade:
-                        durability_bonus = upgrade['durability_bonus']
-                        new_durability = GUN_STATS_BY_LEVEL[gun_name][1]['durability'] + durability_bonus
-                    else:
-                        new_durability = prev_level_stats['durability']
-                    
-                    GUN_STATS_BY_LEVEL[gun_name][level] = {
-                        'damage': prev_level_stats['damage'],  # Damage doesn't change
-                        'fire_rate': new_fire_rate,
-                        'mag_size': int(new_mag_size),  # Mag size must be integer
-                        'reload_time': new_reload_time,
-                        'durability': new_durability
-                    }
-                else:
-                    # If upgrade not defined, use previous level stats
-                    GUN_STATS_BY_LEVEL[gun_name][level] = GUN_STATS_BY_LEVEL[gun_name][level - 1].copy()
-        else:
-            # If no upgrades defined, all levels use base stats
-            for level in [2, 3, 4]:
-                GUN_STATS_BY_LEVEL[gun_name][level] = GUN_STATS_BY_LEVEL[gun_name][1].copy()
+    for gun_name in GUNS:
+        GUN_STATS_BY_LEVEL[gun_name] = derive_gun_stats_by_level(gun_name)
+    
+    GUN_STATS_STORE = GunStatsStore(GUN_STATS_BY_LEVEL, HEADSHOT_MULTIPLIERS, SHIELDS)
+    _LOADED = True
+    if instrumentation is not None:
+        instrumentation.record_call('calculate_gun_stats_by_level', time.perf_counter() - started)
+
+
+def _record_edit(stale, changed_levels):
+    """
+    Bump DATA_VERSION after an incremental edit and log which results it made stale.
+    
+    Returns:
+        dict: Edit report with data_version, changed_levels and stale
+    """
+    global DATA_VERSION
+    previous_version = DATA_VERSION
+    DATA_VERSION = compute_data_version()
+    if DATA_VERSION != previous_version:
+        _EDIT_LOG.append((previous_version, DATA_VERSION, frozenset(stale)))
+        del _EDIT_LOG[:-MAX_EDIT_LOG]
+    return {
+        'data_version': DATA_VERSION,
+        'changed_levels': changed_levels,
+        'stale': stale
+    }
+
+
+def _refresh_gun(gun_name):
+    """
+    Re-derive one gun's levels and report which (gun, shield, level) results changed.
+    """
+    old_levels = GUN_STATS_BY_LEVEL.get(gun_name)
+    new_levels = derive_gun_stats_by_level(gun_name)
+    changed = [level for level in [1, 2, 3, 4] if old_levels is None or old_levels[level] != new_levels[level]]
+    
+    GUN_STATS_BY_LEVEL[gun_name] = new_levels
+    GUN_STATS_STORE.set_gun(gun_name, new_levels, HEADSHOT_MULTIPLIERS.get(gun_name, 1.0))
+    
+    stale = {(gun_name, shield_type, level) for shield_type in SHIELDS for level in changed}
+    return _record_edit(stale, {gun_name: changed} if changed else {})
+
+
+def update_gun_base_stats(gun_name, **changes):
+    """
+    Change (or add) one gun's base stats and recompute only its levels.
+    
+    Args:
+        gun_name (str): Gun to edit; a new gun needs damage, fire_rate, mag_size and reload_time
+        **changes: Base stat values to set, e.g. reload_time=1.8
+    
+    Returns:
+        dict: data_version, changed_levels ({gun_name: [levels whose stats changed]}) and
+              stale (set of (gun_name, shield_type, level) whose TTK results are now stale)
+    """
+    if not _LOADED:
+        ensure_loaded()
+    if gun_name not in GUNS:
+        missing = {'damage', 'fire_rate', 'mag_size', 'reload_time'} - set(changes)
+        if missing:
+            raise ValueError(f"New gun '{gun_name}' is missing base stats: {sorted(missing)}")
+        GUNS[gun_name] = {}
+    GUNS[gun_name].update(changes)
+    return _refresh_gun(gun_name)
+
+
+def update_gun_upgrade(gun_name, level, upgrade):
+    """
+    Replace one upgrade tier of a gun and recompute only the affected levels.
+    
+    Args:
+        gun_name (str): Gun to edit
+        level (int): Upgrade tier (2-4)
+        upgrade (dict): Upgrade modifiers (see GUN_UPGRADES), or None to remove the tier
+    
+    Returns:
+        dict: Edit report, as from update_gun_base_stats
+    """
+    if not _LOADED:
+        ensure_loaded()
+    if gun_name not in GUNS:
+        raise ValueError(f"Invalid gun name '{gun_name}'. Must be one of: {list(GUNS.keys())}")
+    if level not in [2, 3, 4]:
+        raise ValueError(f"Invalid upgrade level {level}. Must be 2, 3 or 4")
+    
+    tiers = GUN_UPGRADES.setdefault(gun_name, {})
+    if upgrade is None:
+        tiers.pop(level, None)
+    else:
+        tiers[level] = dict(upgrade)
+    return _refresh_gun(gun_name)
+
+
+def update_headshot_multiplier(gun_name, multiplier):
+    """
+    Change one gun's headshot multiplier.
+    
+    Gun stats by level don't depend on it, so nothing is recomputed; results for
+    every shield and level of the gun are reported stale (results at headshot_ratio
+    0.0 are unaffected).
+    
+    Returns:
+        dict: Edit report, as from update_gun_base_stats
+    """
+    if not _LOADED:
+        ensure_loaded()
+    if gun_name not in GUNS:
+        raise ValueError(f"Invalid gun name '{gun_name}'. Must be one of: {list(GUNS.keys())}")
+    
+    changed = HEADSHOT_MULTIPLIERS.get(gun_name, 1.0) != multiplier
+    HEADSHOT_MULTIPLIERS[gun_name] = multiplier
+    GUN_STATS_STORE.set_gun(gun_name, GUN_STATS_BY_LEVEL[gun_name], multiplier)
+    
+    stale = {(gun_name, shield_type, level) for shield_type in SHIELDS for level in [1, 2, 3, 4]} if changed else set()
+    return _record_edit(stale, {})
+
+
+def update_shield(shield_type, **changes):
+    """
+    Change (or add) one shield configuration.
+    
+    Args:
+        shield_type (str): Shield to edit; a new shield needs shield_health and shield_damage_reduction
+        **changes: Values to set, e.g. shield_health=75
+    
+    Returns:
+        dict: Edit report, as from update_gun_base_stats
+    """
+    if not _LOADED:
+        ensure_loaded()
+    if shield_type not in SHIELDS:
+        missing = {'shield_health', 'shield_damage_reduction'} - set(changes)
+        if missing:
+            raise ValueError(f"New shield '{shield_type}' is missing: {sorted(missing)}")
+        SHIELDS[shield_type] = {}
+    
+    changed = any(SHIELDS[shield_type].get(key) != value for key, value in changes.items())
+    SHIELDS[shield_type].update(changes)
+    GUN_STATS_STORE.set_shield(shield_type, SHIELDS[shield_type])
+    
+    stale = {(gun_name, shield_type, level) for gun_name in GUNS for level in [1, 2, 3, 4]} if changed else set()
+    return _record_edit(stale, {})
+
+
+def get_stale_since(data_version):
+    """
+    Which results computed at an earlier DATA_VERSION are stale now.
+    
+    Args:
+        data_version (str): DATA_VERSION the results were computed with
+    
+    Returns:
+        set: (gun_name, shield_type, level) triples to drop or recompute, or None if
+             the history doesn't reach back that far (e.g. after a full
+             calculate_gun_stats_by_level rebuild) and everything must be treated as stale
+    """
+    if not _LOADED:
+        ensure_loaded()
+    if data_version == DATA_VERSION:
+        return set()
+    
+    stale = set()
+    found = False
+    for previous_version, _, edit_stale in _EDIT_LOG:
+        if previous_version == data_version:
+            found = True
+        if found:
+            stale |= edit_stale
+    return stale if found else None
 
 
 def get_gun_stats(gun_name, level=1):
@@ -427,6 +400,8 @@ def get_gun_stats(gun_name, level=1):
     Returns:
         dict: Gun stats for the specified level, or None if invalid
     """
+    if not _LOADED:
+        ensure_loaded()
     if gun_name not in GUN_STATS_BY_LEVEL:
         return None
     
@@ -436,8 +411,149 @@ def get_gun_stats(gun_name, level=1):
     return GUN_STATS_BY_LEVEL[gun_name].get(level)
 
 
-# Initialize gun stats by level on module load
-calculate_gun_stats_by_level()
+def load_weapon_data(path=DATA_PATH):
+    """
+    Parse a guns.json data file.
+    
+    Args:
+        path (str): Path to the JSON file
+    
+    Returns:
+        dict: GUNS, SHIELDS, HEADSHOT_MULTIPLIERS, GUN_UPGRADES and BASE_HEALTH tables,
+              with upgrade levels converted from JSON string keys to ints
+    """
+    import json
+    
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    
+    return {
+        'GUNS': data['GUNS'],
+        'SHIELDS': data['SHIELDS'],
+        'HEADSHOT_MULTIPLIERS': data['HEADSHOT_MULTIPLIERS'],
+        'GUN_UPGRADES': {
+            gun_name: {int(level): upgrade for level, upgrade in upgrades.items()}
+            for gun_name, upgrades in data['GUN_UPGRADES'].items()
+        },
+        'BASE_HEALTH': data.get('BASE_HEALTH', 100)
+    }
+
+
+def _snapshot_path(content_hash):
+    python_tag = f"py{sys.version_info[0]}{sys.version_info[1]}"
+    return os.path.join(SNAPSHOT_DIR, f"{content_hash}-{python_tag}-v{SNAPSHOT_FORMAT}.marshal")
+
+
+def load_data(path=DATA_PATH, use_snapshot=True):
+    """
+    Load weapon data and derived per-level stats into the module tables.
+    
+    The data file is hashed first. If a compiled snapshot for that hash exists it is
+    loaded directly; otherwise the JSON is parsed, stats are derived with
+    calculate_gun_stats_by_level and a snapshot is written for the next start.
+    Snapshots are best-effort: an unreadable or unwritable snapshot directory
+    just means a cold load.
+    
+    Args:
+        path (str): Path to the guns.json data file
+        use_snapshot (bool): If False, always parse and derive, and don't write a snapshot
+    
+    Returns:
+        str: SHA-256 hex digest of the data file
+    """
+    import hashlib
+    import marshal
+    
+    global GUNS, SHIELDS, HEADSHOT_MULTIPLIERS, GUN_UPGRADES, BASE_HEALTH
+    global GUN_STATS_BY_LEVEL, GUN_STATS_STORE, DATA_VERSION, _LOADED
+    
+    with open(path, 'rb') as f:
+        content_hash = hashlib.sha256(f.read()).hexdigest()
+    snapshot_path = _snapshot_path(content_hash)
+    
+    if use_snapshot:
+        try:
+            with open(snapshot_path, 'rb') as f:
+                snapshot = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            snapshot = None
+        
+        if snapshot is not None:
+            GUNS = snapshot['GUNS']
+            SHIELDS = snapshot['SHIELDS']
+            HEADSHOT_MULTIPLIERS = snapshot['HEADSHOT_MULTIPLIERS']
+            GUN_UPGRADES = snapshot['GUN_UPGRADES']
+            BASE_HEALTH = snapshot['BASE_HEALTH']
+            GUN_STATS_BY_LEVEL = snapshot['GUN_STATS_BY_LEVEL']
+            DATA_VERSION = snapshot['DATA_VERSION']
+            _EDIT_LOG.clear()
+            GUN_STATS_STORE = GunStatsStore(GUN_STATS_BY_LEVEL, HEADSHOT_MULTIPLIERS, SHIELDS)
+            _LOADED = True
+            return content_hash
+    
+    tables = load_weapon_data(path)
+    GUNS = tables['GUNS']
+    SHIELDS = tables['SHIELDS']
+    HEADSHOT_MULTIPLIERS = tables['HEADSHOT_MULTIPLIERS']
+    GUN_UPGRADES = tables['GUN_UPGRADES']
+    BASE_HEALTH = tables['BASE_HEALTH']
+    calculate_gun_stats_by_level()
+    
+    if use_snapshot:
+        snapshot = dict(tables, GUN_STATS_BY_LEVEL=GUN_STATS_BY_LEVEL, DATA_VERSION=DATA_VERSION)
+        temp_path = f"{snapshot_path}.tmp{os.getpid()}"
+        try:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(marshal.dumps(snapshot))
+            os.replace(temp_path, snapshot_path)
+        except OSError:
+            pass
+    
+    return content_hash
+
+
+
+def _rejected(field, error):
+    """Count a validation rejection when instrumentation is enabled, and pass the error through."""
+    if _INSTRUMENTATION is not None:
+        _INSTRUMENTATION.increment('validation.rejected')
+        _INSTRUMENTATION.increment(f'validation.rejected.{field}')
+    return error
+
+
+def get_validation_error(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+    """
+    Check TTK inputs without printing anything.
+    
+    Args:
+        gun_name (str): Name of the gun
+        shield_type (str): Type of shield ('light', 'medium', or 'heavy')
+        level (int): Gun level (1-4)
+        headshot_ratio (float): Ratio of headshots (0.0-1.0)
+    
+    Returns:
+        str: Description of the first invalid input, or None if all inputs are valid
+    """
+    if not _LOADED:
+        ensure_loaded()
+    if gun_name not in GUNS:
+        return _rejected('gun_name', f"Invalid gun name '{gun_name}'. Must be one of: {list(GUNS.keys())}")
+    
+    if shield_type not in SHIELDS:
+        return _rejected('shield_type',
+                         f"Invalid shield type '{shield_type}'. Must be one of: {list(SHIELDS.keys())}")
+    
+    if level < 1 or level > 4:
+        return _rejected('level', f"Invalid level {level}. Must be between 1 and 4")
+    
+    if headshot_ratio < 0.0 or headshot_ratio > 1.0:
+        return _rejected('headshot_ratio', f"Invalid headshot_ratio {headshot_ratio}. Must be between 0.0 and 1.0")
+    
+    if get_gun_stats(gun_name, level) is None:
+        return _rejected('gun_stats', f"Could not retrieve stats for {gun_name} level {level}")
+    
+    return None
 
 
 def calculate_ttk(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
@@ -459,27 +575,16 @@ def calculate_ttk(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
     Returns:
         float: Time to kill in seconds, or None if invalid gun or shield type
     """
-    if gun_name not in GUNS:
-        print(f"Error: Invalid gun name '{gun_name}'. Must be one of: {list(GUNS.keys())}")
-        return None
-    
-    if shield_type not in SHIELDS:
-        print(f"Error: Invalid shield type '{shield_type}'. Must be one of: {list(SHIELDS.keys())}")
-        return None
-    
-    if level < 1 or level > 4:
-        print(f"Error: Invalid level {level}. Must be between 1 and 4")
-        return None
-    
-    if headshot_ratio < 0.0 or headshot_ratio > 1.0:
-        print(f"Error: Invalid headshot_ratio {headshot_ratio}. Must be between 0.0 and 1.0")
+    instrumentation = _INSTRUMENTATION
+    if instrumentation is not None:
+        started = time.perf_counter()
+    error = get_validation_error(gun_name, shield_type, level, headshot_ratio)
+    if error is not None:
+        print(f"Error: {error}")
         return None
     
     # Get gun stats for the specified level
     gun_stats = get_gun_stats(gun_name, level)
-    if gun_stats is None:
-        print(f"Error: Could not retrieve stats for {gun_name} level {level}")
-        return None
     
     base_damage = gun_stats['damage']
     # Calculate effective damage based on headshot ratio
@@ -532,51 +637,326 @@ def calculate_ttk(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
             # Shield is broken, all damage goes to health
             current_health -= damage_per_bullet
     
+    if instrumentation is not None:
+        instrumentation.record_call('calculate_ttk', time.perf_counter() - started,
+                                    (gun_name, shield_type, level, headshot_ratio),
+                                    iterations=bullets_fired, bullets=bullets_fired)
     return time_elapsed
 
 
-def calculate_ttk_detailed(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+# Rounding bound per float operation (4 units of 2**-53), so the loops' accumulated
+# error over n subtractions of values below `scale` stays under n * KILL_ROUNDING_SLACK * scale
+KILL_ROUNDING_SLACK = 2.0 ** -51
+
+# solve_ttk's cheap pre-check: while the quotients stay under CHEAP_CHECK_SHOTS bullets,
+# the rounding bound above stays under NEAR_WHOLE of a bullet
+NEAR_WHOLE = 2.0 ** -20
+CHEAP_CHECK_SHOTS = 2.0 ** 14
+
+# Multiples of 2**-24 below 2**28 add and subtract without rounding
+EXACT_STEP_GRAIN = 2.0 ** 24
+EXACT_STEP_LIMIT = 2.0 ** 28
+
+
+def shots_to_deplete(pool, damage_per_shot):
     """
-    Calculate TTK with detailed breakdown of the damage process.
+    Number of equal hits needed to bring a pool (shield or health) to 0 or below.
+    
+    Matches the `pool -= damage` / `while pool > 0` stepping of the simulation loops:
+    an exact hit down to 0 counts as depleted.
+    """
+    return math.ceil(pool / damage_per_shot)
+
+
+def steps_exactly(*values):
+    """
+    True if every value is a multiple of 2**-24 below 2**28 in magnitude.
+    
+    Repeatedly subtracting such values from each other never rounds, so the loops
+    count exactly what the quotients say.
+    """
+    for value in values:
+        if not (value * EXACT_STEP_GRAIN).is_integer() or abs(value) >= EXACT_STEP_LIMIT:
+            return False
+    return True
+
+
+def is_exact_kill_boundary(pool, damage_per_shot, scale=None, shots_before=0, exact=False):
+    """
+    True if the loops' repeated `pool -= damage` could end on the other side of 0 from ceil().
+    
+    That only happens when pool / damage_per_shot is within the loops' accumulated
+    rounding of a whole number of hits: at most KILL_ROUNDING_SLACK of max(scale, damage)
+    per subtraction, over shots_before earlier hits on the same value plus this phase's.
     
     Args:
-        gun_name (str): Name of the gun
-        shield_type (str): Type of shield ('light', 'medium', or 'heavy')
-        level (int): Gun level (1-4), defaults to 1
-        headshot_ratio (float): Ratio of headshots (0.0 = no headshots, 1.0 = all headshots), defaults to 0.0
+        pool (float): Value left to deplete
+        damage_per_shot (float): Damage per hit on that value
+        scale (float, optional): Largest value the loop held on the way, defaults to pool
+        shots_before (int): Hits the loop already subtracted from the same value
+        exact (bool): The loop's values all step exactly (see steps_exactly), so only a
+            quotient that doesn't divide evenly can differ from the closed form
+    """
+    shots = pool / damage_per_shot
+    if scale is None:
+        scale = pool
+    slack = KILL_ROUNDING_SLACK * (shots_before + shots + 4) * max(scale, damage_per_shot) / damage_per_shot
+    if abs(shots - round(shots)) > slack:
+        return False
+    return not (exact and math.fmod(pool, damage_per_shot) == 0)
+
+
+def count_bullets_to_kill(damage_per_bullet, shield_health, shield_damage_reduction, health=None):
+    """
+    Bullets to kill, stepping shield and health with the exact float arithmetic of calculate_ttk.
     
-    Returns a dictionary with TTK and detailed information.
+    Used by solve_ttk for inputs on an exact-kill boundary; O(bullets) otherwise.
     """
-    if gun_name not in GUNS:
-        return None
+    if health is None:
+        if not _LOADED:
+            ensure_loaded()
+        health = BASE_HEALTH
+    bullets_fired = 0
+    while health > 0:
+        bullets_fired += 1
+        if shield_health > 0:
+            shield_health -= damage_per_bullet
+            health -= damage_per_bullet * (1 - shield_damage_reduction)
+        else:
+            health -= damage_per_bullet
+    return bullets_fired
+
+
+def solve_ttk(damage_per_bullet, firerate, mag_size, reload_time,
+              shield_health, shield_damage_reduction, health=None):
+    """
+    Closed-form equivalent of the per-bullet loop in calculate_ttk.
     
-    if shield_type not in SHIELDS:
-        return None
+    Bullets to kill are split into two phases:
+    - Shield phase: every bullet hits the shield in full and health takes
+      damage * (1 - shield_damage_reduction), for at most ceil(shield / damage) bullets
+    - Broken phase: the remaining health is removed at full damage per bullet
     
-    if level < 1 or level > 4:
-        return None
+    When any of those quotients is within the loop's accumulated rounding of a
+    whole number of bullets, that rounding decides the count, so it is recounted
+    exactly with count_bullets_to_kill.
     
-    if headshot_ratio < 0.0 or headshot_ratio > 1.0:
-        return None
+    Time follows directly from the bullet count: one reload per started magazine
+    after the first, and one bullet interval for every other shot that isn't the
+    first shot of a magazine.
     
-    # Get gun stats for the specified level
-    gun_stats = get_gun_stats(gun_name, level)
-    if gun_stats is None:
+    Args:
+        damage_per_bullet (float): Effective damage per bullet (headshots already blended in)
+        firerate (float): Bullets per second
+        mag_size (int): Magazine size
+        reload_time (float): Reload time in seconds
+        shield_health (float): Starting shield health
+        shield_damage_reduction (float): Fraction of damage the shield keeps off health
+        health (float, optional): Starting health, defaults to BASE_HEALTH
+    
+    Returns:
+        tuple: (ttk, bullets_fired, reloads)
+    """
+    if health is None:
+        if not _LOADED:
+            ensure_loaded()
+        health = BASE_HEALTH
+    starting_health = health
+    shielded_damage = damage_per_bullet * (1 - shield_damage_reduction)
+    bullets_fired = 0
+    on_boundary = False
+    # ceil() rounds each quotient up by `gap`; only a gap within NEAR_WHOLE of 0 or 1 (or a
+    # fight too long for that cheap test) gets a closer look. An even division of values
+    # that step exactly (see steps_exactly) is what the loop counts too; anything else
+    # gets the precise is_exact_kill_boundary check
+    if shield_health > 0:
+        shots = shield_health / damage_per_bullet
+        shield_bullets = math.ceil(shots)
+        gap = shield_bullets - shots
+        if ((gap < NEAR_WHOLE or gap > 1 - NEAR_WHOLE or shots > CHEAP_CHECK_SHOTS)
+                and not (math.fmod(shield_health, damage_per_bullet) == 0
+                         and steps_exactly(shield_health, damage_per_bullet))):
+            on_boundary = is_exact_kill_boundary(shield_health, damage_per_bullet)
+        kill_bullets = shield_bullets + 1
+        if shielded_damage > 0:
+            shots = health / shielded_damage
+            kill_bullets = math.ceil(shots)
+            gap = kill_bullets - shots
+            if ((gap < NEAR_WHOLE or gap > 1 - NEAR_WHOLE or shots > CHEAP_CHECK_SHOTS)
+                    and not on_boundary
+                    and not (math.fmod(health, shielded_damage) == 0 and steps_exactly(health, shielded_damage))):
+                on_boundary = is_exact_kill_boundary(health, shielded_damage)
+        if kill_bullets <= shield_bullets:
+            # Target dies before the shield breaks
+            bullets_fired = kill_bullets
+            health = 0
+        else:
+            health -= shield_bullets * shielded_damage
+            bullets_fired = shield_bullets
+    
+    if health > 0:
+        shots = health / damage_per_bullet
+        bullets = math.ceil(shots)
+        gap = bullets - shots
+        bullets += bullets_fired
+        if ((gap < NEAR_WHOLE or gap > 1 - NEAR_WHOLE or bullets > CHEAP_CHECK_SHOTS
+             or starting_health > CHEAP_CHECK_SHOTS * damage_per_bullet)
+                and not on_boundary
+                and not (math.fmod(health, damage_per_bullet) == 0
+                         and steps_exactly(shield_health, damage_per_bullet, starting_health, shielded_damage))):
+            on_boundary = is_exact_kill_boundary(health, damage_per_bullet, starting_health, bullets_fired)
+        bullets_fired = bullets
+    
+    if on_boundary:
+        if _INSTRUMENTATION is not None:
+            _INSTRUMENTATION.increment('solve_ttk.exact_recounts')
+        bullets_fired = count_bullets_to_kill(damage_per_bullet, shield_health, shield_damage_reduction,
+                                              starting_health)
+    
+    reloads = (bullets_fired - 1) // mag_size
+    bullet_intervals = bullets_fired - 1 - reloads
+    ttk = bullet_intervals * (1.0 / firerate) + reloads * reload_time
+    return ttk, bullets_fired, reloads
+
+
+def solve_ttk_for_gun(gun_name, shield_type, level, headshot_ratio):
+    """
+    Run solve_ttk with the stats of a gun at a level against a shield type.
+    
+    Inputs are not validated; use get_validation_error first for untrusted input.
+    
+    Returns:
+        tuple: (ttk, bullets_fired, reloads)
+    """
+    if not _LOADED:
+        ensure_loaded()
+    store = GUN_STATS_STORE
+    gun_id = store.gun_id(gun_name)
+    base_damage, firerate, mag_size, reload_time = store.level_stats(gun_id, level)
+    headshot_multiplier = store.headshot_multiplier[gun_id]
+    damage_per_bullet = base_damage * (1 - headshot_ratio) + base_damage * headshot_ratio * headshot_multiplier
+    
+    shield_health, shield_damage_reduction = store.shield_stats(store.shield_id(shield_type))
+    return solve_ttk(damage_per_bullet, firerate, mag_size, reload_time, shield_health, shield_damage_reduction)
+
+
+def calculate_ttk_closed_form(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+    """
+    Calculate TTK in constant time with solve_ttk.
+    
+    Same inputs, validation and result as calculate_ttk, which stays as the
+    per-bullet reference simulation.
+    
+    Args:
+        gun_name (str): Name of the gun
+        shield_type (str): Type of shield ('light', 'medium', or 'heavy')
+        level (int): Gun level (1-4), defaults to 1
+        headshot_ratio (float): Ratio of headshots (0.0 = no headshots, 1.0 = all headshots), defaults to 0.0
+    
+    Returns:
+        float: Time to kill in seconds, or None if invalid gun or shield type
+    """
+    instrumentation = _INSTRUMENTATION
+    if instrumentation is not None:
+        started = time.perf_counter()
+    error = get_validation_error(gun_name, shield_type, level, headshot_ratio)
+    if error is not None:
+        print(f"Error: {error}")
         return None
     
+    # Same lookups as calculate_ttk, so the two differ only in how they count bullets
+    gun_stats = GUN_STATS_BY_LEVEL[gun_name][level]
     base_damage = gun_stats['damage']
-    # Calculate effective damage based on headshot ratio
     headshot_multiplier = HEADSHOT_MULTIPLIERS.get(gun_name, 1.0)
     damage_per_bullet = base_damage * (1 - headshot_ratio) + base_damage * headshot_ratio * headshot_multiplier
+    shield_config = SHIELDS[shield_type]
+    ttk, bullets_fired, _ = solve_ttk(damage_per_bullet, gun_stats['fire_rate'], gun_stats['mag_size'],
+                                      gun_stats['reload_time'], shield_config['shield_health'],
+                                      shield_config['shield_damage_reduction'], BASE_HEALTH)
+    if instrumentation is not None:
+        instrumentation.record_call('calculate_ttk_closed_form', time.perf_counter() - started,
+                                    (gun_name, shield_type, level, headshot_ratio), bullets=bullets_fired)
+    return ttk
+
+
+class ShotEvent(namedtuple('ShotEvent', [
+    'bullet', 'time', 'shield_health_before', 'shield_health_after',
+    'health_before', 'health_after', 'shield_active', 'bullets_remaining_in_mag'
+])):
+    """A bullet fired, with the target's shield/health before and after it."""
+    __slots__ = ()
+    type = 'shot'
+
+
+class ReloadEvent(namedtuple('ReloadEvent', ['time', 'reload_number'])):
+    """A reload finishing at `time`."""
+    __slots__ = ()
+    type = 'reload'
+
+
+def _damage_events(damage_per_bullet, firerate, mag_size, reload_time, shield_health, shield_damage_reduction):
+    """
+    Generator behind iter_damage_events: the per-bullet simulation, yielding events as they happen.
+    """
+    if not _LOADED:
+        ensure_loaded()
+    current_shield_health = shield_health
+    current_health = BASE_HEALTH
+    time_elapsed = 0.0
+    bullets_fired = 0
+    bullets_in_current_mag = mag_size
+    reloads = 0
     
-    firerate = gun_stats['fire_rate']
-    mag_size = gun_stats['mag_size']
-    reload_time = gun_stats['reload_time']
+    # Time per bullet (firerate is bullets/second, so time per bullet is 1/firerate)
+    time_per_bullet = 1.0 / firerate
     
-    shield_config = SHIELDS[shield_type]
-    shield_damage_reduction = shield_config['shield_damage_reduction']
-    shield_health = shield_config['shield_health']
+    while current_health > 0:
+        # Check if we need to reload
+        if bullets_in_current_mag == 0:
+            time_elapsed += reload_time
+            bullets_in_current_mag = mag_size
+            reloads += 1
+            yield ReloadEvent(time_elapsed, reloads)
+        
+        # Add time between shots (but not before the first shot or first shot after reload)
+        # If magazine is full, we're firing the first shot from this mag (instant)
+        if bullets_in_current_mag < mag_size:
+            time_elapsed += time_per_bullet
+        
+        # Fire a bullet
+        bullets_fired += 1
+        bullets_in_current_mag -= 1
+        
+        if current_shield_health > 0:
+            shield_before = current_shield_health
+            health_before = current_health
+            
+            current_shield_health -= damage_per_bullet
+            if current_shield_health < 0:
+                current_shield_health = 0
+            
+            health_damage = damage_per_bullet * (1 - shield_damage_reduction)
+            current_health -= health_damage
+            
+            yield ShotEvent(bullets_fired, time_elapsed, shield_before, current_shield_health,
+                            health_before, current_health, True, bullets_in_current_mag)
+        else:
+            health_before = current_health
+            current_health -= damage_per_bullet
+            
+            yield ShotEvent(bullets_fired, time_elapsed, 0, 0,
+                            health_before, current_health, False, bullets_in_current_mag)
+
+
+def _damage_log(damage_per_bullet, firerate, mag_size, reload_time, shield_health, shield_damage_reduction):
+    """
+    The per-bullet simulation of _damage_events, collected straight into damage_log dicts.
     
+    Returns:
+        tuple: (damage_log, ttk, bullets_fired, reloads)
+    """
+    if not _LOADED:
+        ensure_loaded()
     current_shield_health = shield_health
     current_health = BASE_HEALTH
     time_elapsed = 0.0
@@ -648,6 +1028,118 @@ def calculate_ttk_detailed(gun_name, shield_type='light', level=1, headshot_rati
                 'bullets_remaining_in_mag': bullets_in_current_mag
             })
     
+    return damage_log, time_elapsed, bullets_fired, reloads
+
+
+def _resolve_inputs(gun_name, shield_type, level, headshot_ratio):
+    """
+    Look up everything a TTK simulation needs for already-validated inputs.
+    
+    Returns:
+        dict: Gun, shield and damage parameters shared by the detailed result and event stream
+    """
+    gun_stats = get_gun_stats(gun_name, level)
+    base_damage = gun_stats['damage']
+    # Calculate effective damage based on headshot ratio
+    headshot_multiplier = HEADSHOT_MULTIPLIERS.get(gun_name, 1.0)
+    damage_per_bullet = base_damage * (1 - headshot_ratio) + base_damage * headshot_ratio * headshot_multiplier
+    shield_config = SHIELDS[shield_type]
+    return {
+        'base_damage': base_damage,
+        'damage_per_bullet': damage_per_bullet,
+        'headshot_multiplier': headshot_multiplier,
+        'firerate': gun_stats['fire_rate'],
+        'mag_size': gun_stats['mag_size'],
+        'reload_time': gun_stats['reload_time'],
+        'durability': gun_stats.get('durability', 100),
+        'shield_health': shield_config['shield_health'],
+        'shield_damage_reduction': shield_config['shield_damage_reduction']
+    }
+
+
+def iter_damage_events(gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+    """
+    Stream the shot and reload events of a TTK simulation lazily.
+    
+    Events are ShotEvent / ReloadEvent records (fixed-field named tuples with a
+    `type` of 'shot' or 'reload'), produced one at a time, so long fights can be
+    scanned without building the whole damage log in memory.
+    
+    Args:
+        gun_name (str): Name of the gun
+        shield_type (str): Type of shield ('light', 'medium', or 'heavy')
+        level (int): Gun level (1-4), defaults to 1
+        headshot_ratio (float): Ratio of headshots (0.0 = no headshots, 1.0 = all headshots), defaults to 0.0
+    
+    Returns:
+        iterator: Events in time order, or None if any input is invalid
+    """
+    if get_validation_error(gun_name, shield_type, level, headshot_ratio) is not None:
+        return None
+    
+    inputs = _resolve_inputs(gun_name, shield_type, level, headshot_ratio)
+    return _damage_events(
+        inputs['damage_per_bullet'],
+        inputs['firerate'],
+        inputs['mag_size'],
+        inputs['reload_time'],
+        inputs['shield_health'],
+        inputs['shield_damage_reduction']
+    )
+
+
+def calculate_ttk_detailed(gun_name, shield_type='light', level=1, headshot_ratio=0.0, include_log=True):
+    """
+    Calculate TTK with detailed breakdown of the damage process.
+    
+    Args:
+        gun_name (str): Name of the gun
+        shield_type (str): Type of shield ('light', 'medium', or 'heavy')
+        level (int): Gun level (1-4), defaults to 1
+        headshot_ratio (float): Ratio of headshots (0.0 = no headshots, 1.0 = all headshots), defaults to 0.0
+        include_log (bool): If False, skip the simulation and damage log entirely and
+            fill ttk/bullets_fired/reloads from the closed-form solver; 'damage_log' is None.
+            Use iter_damage_events to stream the log instead.
+    
+    Returns a dictionary with TTK and detailed information.
+    """
+    instrumentation = _INSTRUMENTATION
+    if instrumentation is not None:
+        started = time.perf_counter()
+    if get_validation_error(gun_name, shield_type, level, headshot_ratio) is not None:
+        return None
+    
+    inputs = _resolve_inputs(gun_name, shield_type, level, headshot_ratio)
+    
+    if include_log:
+        damage_log, time_elapsed, bullets_fired, reloads = _damage_log(
+            inputs['damage_per_bullet'],
+            inputs['firerate'],
+            inputs['mag_size'],
+            inputs['reload_time'],
+            inputs['shield_health'],
+            inputs['shield_damage_reduction']
+        )
+    else:
+        damage_log = None
+        time_elapsed, bullets_fired, reloads = solve_ttk(
+            inputs['damage_per_bullet'],
+            inputs['firerate'],
+            inputs['mag_size'],
+            inputs['reload_time'],
+            inputs['shield_health'],
+            inputs['shield_damage_reduction']
+        )
+    
+    if instrumentation is not None:
+        instrumentation.record_call(
+            'calculate_ttk_detailed' if include_log else 'calculate_ttk_detailed[summary]',
+            time.perf_counter() - started,
+            (gun_name, shield_type, level, headshot_ratio),
+            iterations=len(damage_log) if include_log else None,
+            bullets=bullets_fired
+        )
+    
     return {
         'ttk': time_elapsed,
         'bullets_fired': bullets_fired,
@@ -657,13 +1149,13 @@ def calculate_ttk_detailed(gun_name, shield_type='light', level=1, headshot_rati
         'gun_name': gun_name,
         'level': level,
         'headshot_ratio': headshot_ratio,
-        'base_damage': base_damage,
-        'damage_per_bullet': damage_per_bullet,
-        'headshot_multiplier': headshot_multiplier,
-        'firerate': firerate,
-        'mag_size': mag_size,
-        'reload_time': reload_time,
-        'durability': gun_stats.get('durability', 100)
+        'base_damage': inputs['base_damage'],
+        'damage_per_bullet': inputs['damage_per_bullet'],
+        'headshot_multiplier': inputs['headshot_multiplier'],
+        'firerate': inputs['firerate'],
+        'mag_size': inputs['mag_size'],
+        'reload_time': inputs['reload_time'],
+        'durability': inputs['durability']
     }
 
 
@@ -678,7 +1170,9 @@ def print_ttk_summary(gun_name, shield_type='light', level=1, headshot_ratio=0.0
         headshot_ratio (float): Ratio of headshots (0.0 = no headshots, 1.0 = all headshots), defaults to 0.0
         show_details (bool): If True, also print detailed damage log
     """
-    result = calculate_ttk_detailed(gun_name, shield_type, level, headshot_ratio)
+    if not _LOADED:
+        ensure_loaded()
+    result = calculate_ttk_detailed(gun_name, shield_type, level, headshot_ratio, include_log=False)
     
     if result is None:
         return
@@ -709,14 +1203,22 @@ def print_ttk_summary(gun_name, shield_type='light', level=1, headshot_ratio=0.0
     print(f"{'='*60}\n")
     
     if show_details:
-        print_detailed_log(result)
+        print_detailed_log(result, iter_damage_events(gun_name, shield_type, level, headshot_ratio))
 
 
-def print_detailed_log(result):
+def print_detailed_log(result, events=None):
     """
     Print a detailed, easy-to-read breakdown of the damage log.
     Each entry is presented in a clear, understandable format.
+    
+    Args:
+        result (dict): Result from calculate_ttk_detailed
+        events (iterable, optional): Events to print instead of result['damage_log'],
+            e.g. the stream from iter_damage_events, consumed one at a time
     """
+    if events is None:
+        events = result['damage_log']
+    
     print(f"\n{'='*80}")
     print(f"Detailed Damage Log - Step by Step Breakdown")
     print(f"{'='*80}")
@@ -724,7 +1226,11 @@ def print_detailed_log(result):
     print(f"{'='*80}\n")
     
     entry_number = 1
-    for entry in result['damage_log']:
+    for entry in events:
+        if not isinstance(entry, dict):
+            record = entry
+            entry = record._asdict()
+            entry['type'] = record.type
         print(f"--- Entry #{entry_number} ---")
         
         if entry['type'] == 'reload':
@@ -770,6 +1276,76 @@ def print_detailed_log(result):
     print(f"{'='*80}\n")
 
 
+def rank_guns(scenarios, guns=None, top_k=None):
+    """
+    Rank guns by TTK for one or more scenarios, returning data instead of printing.
+    
+    Each scenario's shield, level and headshot ratio are validated once and every
+    gun is then solved with solve_ttk (no damage log); each distinct scenario is
+    computed once even if it is listed several times.
+    
+    Args:
+        scenarios (iterable): (level, headshot_ratio, shield_type) tuples
+        guns (iterable, optional): Gun names to rank, defaults to every gun in GUNS
+        top_k (int, optional): Only keep the k fastest guns per scenario
+    
+    Returns:
+        dict: {scenario tuple: list of result dicts sorted by TTK}, where each result has
+              rank, gun_name, ttk, bullets, reloads, damage, fire_rate and effective_damage.
+              Scenarios with invalid inputs map to an empty list.
+    """
+    if not _LOADED:
+        ensure_loaded()
+    gun_names = sorted(GUNS.keys()) if guns is None else list(guns)
+    rankings = {}
+    
+    for scenario in scenarios:
+        scenario = tuple(scenario)
+        if scenario in rankings:
+            continue
+        level, headshot_ratio, shield_type = scenario
+        
+        gun_results = []
+        if (shield_type not in SHIELDS or level < 1 or level > 4
+                or headshot_ratio < 0.0 or headshot_ratio > 1.0):
+            rankings[scenario] = gun_results
+            continue
+        shield_health = SHIELDS[shield_type]['shield_health']
+        shield_damage_reduction = SHIELDS[shield_type]['shield_damage_reduction']
+        
+        for gun_name in gun_names:
+            gun_stats = GUN_STATS_BY_LEVEL[gun_name].get(level) if gun_name in GUNS else None
+            if gun_stats is None:
+                continue
+            base_damage = gun_stats['damage']
+            headshot_multiplier = HEADSHOT_MULTIPLIERS.get(gun_name, 1.0)
+            damage_per_bullet = base_damage * (1 - headshot_ratio) + base_damage * headshot_ratio * headshot_multiplier
+            ttk, bullets_fired, reloads = solve_ttk(damage_per_bullet, gun_stats['fire_rate'], gun_stats['mag_size'],
+                                                    gun_stats['reload_time'], shield_health,
+                                                    shield_damage_reduction, BASE_HEALTH)
+            gun_results.append({
+                'gun_name': gun_name,
+                'ttk': ttk,
+                'bullets': bullets_fired,
+                'reloads': reloads,
+                'damage': base_damage,
+                'fire_rate': gun_stats['fire_rate'],
+                'effective_damage': damage_per_bullet
+            })
+        
+        # Both keep ties in input order, matching a stable sort by TTK
+        if top_k is not None:
+            gun_results = heapq.nsmallest(top_k, gun_results, key=lambda x: x['ttk'])
+        else:
+            gun_results.sort(key=lambda x: x['ttk'])
+        
+        for rank, result in enumerate(gun_results, 1):
+            result['rank'] = rank
+        rankings[scenario] = gun_results
+    
+    return rankings
+
+
 def print_gun_comparison_table(gun_name, shield_type='medium'):
     """
     Display a comparison table for a specific gun showing:
@@ -781,6 +1357,8 @@ def print_gun_comparison_table(gun_name, shield_type='medium'):
         gun_name (str): Name of the gun
         shield_type (str): Type of shield to test against (default: 'medium')
     """
+    if not _LOADED:
+        ensure_loaded()
     if gun_name not in GUNS:
         print(f"Error: Gun '{gun_name}' not found")
         return
@@ -803,15 +1381,17 @@ def print_gun_comparison_table(gun_name, shield_type='medium'):
         ('Level 4', 'Headshots', 4, 1.0)
     ]
     
+    rankings = rank_guns([(level, headshot_ratio, shield_type) for _, _, level, headshot_ratio in combinations],
+                         guns=[gun_name])
+    
     results = []
     for level_name, shot_type, level, headshot_ratio in combinations:
-        detailed = calculate_ttk_detailed(gun_name, shield_type, level, headshot_ratio)
-        if detailed:
+        for ranked in rankings[(level, headshot_ratio, shield_type)]:
             results.append({
                 'level_name': level_name,
                 'shot_type': shot_type,
-                'ttk': detailed['ttk'],
-                'bullets': detailed['bullets_fired']
+                'ttk': ranked['ttk'],
+                'bullets': ranked['bullets']
             })
     
     # Print table header
@@ -825,6 +1405,28 @@ def print_gun_comparison_table(gun_name, shield_type='medium'):
     print(f"{'='*90}\n")
 
 
+def _print_ranked_table(title_suffix, shield_type, gun_results):
+    """Print one ranked table produced by rank_guns."""
+    print(f"\n{'='*100}")
+    print(f"All Guns Ranked by TTK - {title_suffix}")
+    print(f"{'='*100}")
+    print(f"Shield Type: {shield_type}")
+    print(f"{'='*100}\n")
+    
+    # Print table header
+    print(f"{'Rank':<6} {'Gun Name':<12} {'TTK (s)':<10} {'Bullets':<10} {'Reloads':<10} "
+          f"{'Base Dmg':<10} {'Eff Dmg':<10} {'Fire Rate':<12}")
+    print("-"*100)
+    
+    # Print ranked results
+    for result in gun_results:
+        print(f"{result['rank']:<6} {result['gun_name']:<12} {result['ttk']:<10.3f} {result['bullets']:<10} "
+              f"{result['reloads']:<10} {result['damage']:<10} {result['effective_damage']:<10.2f} "
+              f"{result['fire_rate']:<12.3f}")
+    
+    print(f"{'='*100}\n")
+
+
 def print_all_guns_ranked(shield_type='medium', headshot_ratio=None):
     """
     Display ranked tables of all guns sorted by TTK.
@@ -839,6 +1441,8 @@ def print_all_guns_ranked(shield_type='medium', headshot_ratio=None):
         shield_type (str): Type of shield to test against (default: 'medium')
         headshot_ratio (float, optional): If provided, only show Level 4 with this headshot ratio (0.0-1.0)
     """
+    if not _LOADED:
+        ensure_loaded()
     if shield_type not in SHIELDS:
         print(f"Error: Shield type '{shield_type}' not found")
         return
@@ -850,44 +1454,9 @@ def print_all_guns_ranked(shield_type='medium', headshot_ratio=None):
         
         # Custom mode: Only Level 4 with specified headshot ratio
         headshot_percent = headshot_ratio * 100
-        title_suffix = f"Level 4 - {headshot_percent:.0f}% Headshots"
-        
-        print(f"\n{'='*100}")
-        print(f"All Guns Ranked by TTK - {title_suffix}")
-        print(f"{'='*100}")
-        print(f"Shield Type: {shield_type}")
-        print(f"{'='*100}\n")
-        
-        # Calculate TTK for all guns
-        gun_results = []
-        for gun_name in sorted(GUNS.keys()):
-            detailed = calculate_ttk_detailed(gun_name, shield_type, 4, headshot_ratio)
-            if detailed:
-                gun_results.append({
-                    'gun_name': gun_name,
-                    'ttk': detailed['ttk'],
-                    'bullets': detailed['bullets_fired'],
-                    'reloads': detailed['reloads'],
-                    'damage': detailed['base_damage'],
-                    'fire_rate': detailed['firerate'],
-                    'effective_damage': detailed['damage_per_bullet']
-                })
-        
-        # Sort by TTK
-        gun_results.sort(key=lambda x: x['ttk'])
-        
-        # Print table header
-        print(f"{'Rank':<6} {'Gun Name':<12} {'TTK (s)':<10} {'Bullets':<10} {'Reloads':<10} "
-              f"{'Base Dmg':<10} {'Eff Dmg':<10} {'Fire Rate':<12}")
-        print("-"*100)
-        
-        # Print ranked results
-        for rank, result in enumerate(gun_results, 1):
-            print(f"{rank:<6} {result['gun_name']:<12} {result['ttk']:<10.3f} {result['bullets']:<10} "
-                  f"{result['reloads']:<10} {result['damage']:<10} {result['effective_damage']:<10.2f} "
-                  f"{result['fire_rate']:<12.3f}")
-        
-        print(f"{'='*100}\n")
+        combinations = [
+            (4, headshot_ratio, f"Level 4 - {headshot_percent:.0f}% Headshots")
+        ]
     else:
         # Default mode: Show all 4 combinations
         combinations = [
@@ -896,44 +1465,10 @@ def print_all_guns_ranked(shield_type='medium', headshot_ratio=None):
             (4, 0.0, "Level 4 - Normal Shots (0% Headshots)"),
             (4, 1.0, "Level 4 - All Headshots (100% Headshots)")
         ]
-        
-        for level, hs_ratio, title_suffix in combinations:
-            print(f"\n{'='*100}")
-            print(f"All Guns Ranked by TTK - {title_suffix}")
-            print(f"{'='*100}")
-            print(f"Shield Type: {shield_type}")
-            print(f"{'='*100}\n")
-            
-            # Calculate TTK for all guns
-            gun_results = []
-            for gun_name in sorted(GUNS.keys()):
-                detailed = calculate_ttk_detailed(gun_name, shield_type, level, hs_ratio)
-                if detailed:
-                    gun_results.append({
-                        'gun_name': gun_name,
-                        'ttk': detailed['ttk'],
-                        'bullets': detailed['bullets_fired'],
-                        'reloads': detailed['reloads'],
-                        'damage': detailed['base_damage'],
-                        'fire_rate': detailed['firerate'],
-                        'effective_damage': detailed['damage_per_bullet']
-                    })
-            
-            # Sort by TTK
-            gun_results.sort(key=lambda x: x['ttk'])
-            
-            # Print table header
-            print(f"{'Rank':<6} {'Gun Name':<12} {'TTK (s)':<10} {'Bullets':<10} {'Reloads':<10} "
-                  f"{'Base Dmg':<10} {'Eff Dmg':<10} {'Fire Rate':<12}")
-            print("-"*100)
-            
-            # Print ranked results
-            for rank, result in enumerate(gun_results, 1):
-                print(f"{rank:<6} {result['gun_name']:<12} {result['ttk']:<10.3f} {result['bullets']:<10} "
-                      f"{result['reloads']:<10} {result['damage']:<10} {result['effective_damage']:<10.2f} "
-                      f"{result['fire_rate']:<12.3f}")
-            
-            print(f"{'='*100}\n")
+    
+    rankings = rank_guns([(level, hs_ratio, shield_type) for level, hs_ratio, _ in combinations])
+    for level, hs_ratio, title_suffix in combinations:
+        _print_ranked_table(title_suffix, shield_type, rankings[(level, hs_ratio, shield_type)])
 
 
 def print_gun_stats_by_level(gun_name):
@@ -943,6 +1478,8 @@ def print_gun_stats_by_level(gun_name):
     Args:
         gun_name (str): Name of the gun
     """
+    if not _LOADED:
+        ensure_loaded()
     if gun_name not in GUN_STATS_BY_LEVEL:
         print(f"Error: Gun '{gun_name}' not found")
         return
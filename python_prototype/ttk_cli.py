@@ -0,0 +1,134 @@
+"""
+Streaming JSONL batch front end for the TTK calculator.
+
+Reads one query record per line, e.g.
+    {"gun": "kettle", "shield": "medium", "level": 4, "headshot_ratio": 0.3}
+    {"gun": "ferro", "detail": true}
+and writes one JSON result per line in the same order. Input is processed in
+bounded chunks, so memory stays flat however many rows are streamed through.
+
+Every output record carries the 1-based input line it answers as "line".
+Blank lines produce no record, so results are matched to queries by "line"
+rather than by position. Rows that are not valid JSON or fail validation
+produce an error record
+    {"line": 7, "error": "Invalid gun name 'x'. ..."}
+instead of stopping the run. Rows with "detail": true (or every row with
+--detail) also get the damage_log from calculate_ttk_detailed.
+
+Usage:
+    python ttk_cli.py queries.jsonl > results.jsonl
+    cat queries.jsonl | python ttk_cli.py --chunk-size 50000 -o results.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import sys
+
+import ttk_calculator
+from ttk_queries import evaluate_queries, parse_query, result_record
+
+
+def _detailed_record(query):
+    detailed = ttk_calculator.calculate_ttk_detailed(*query)
+    record = result_record(query, (detailed['ttk'], detailed['bullets_fired'], detailed['reloads']))
+    record['damage_per_bullet'] = detailed['damage_per_bullet']
+    record['damage_log'] = detailed['damage_log']
+    return record
+
+
+def process_chunk(lines, first_line_number, detail=False):
+    """
+    Evaluate one chunk of JSONL input.
+
+    Args:
+        lines (list): Raw input lines
+        first_line_number (int): 1-based line number of lines[0], recorded as 'line' in every record
+        detail (bool): Include the damage log for every row, not just rows asking for it
+
+    Returns:
+        tuple: (list of output records in input order, number of error records)
+    """
+    records = [None] * len(lines)
+    batch_positions = []
+    batch_queries = []
+    errors = 0
+
+    for position, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            records[position] = {'line': first_line_number + position, 'error': f"Invalid JSON: {error}"}
+            errors += 1
+            continue
+
+        query, error = parse_query(row)
+        if query is None:
+            records[position] = {'line': first_line_number + position, 'error': error}
+            errors += 1
+        elif detail or (isinstance(row, dict) and row.get('detail') is True):
+            records[position] = _detailed_record(query)
+            records[position]['line'] = first_line_number + position
+        else:
+            batch_positions.append(position)
+            batch_queries.append(query)
+
+    for position, query, solution in zip(batch_positions, batch_queries, evaluate_queries(batch_queries)):
+        record = result_record(query, solution)
+        record['line'] = first_line_number + position
+        records[position] = record
+
+    return [record for record in records if record is not None], errors
+
+
+def run(input_file, output_file, chunk_size=10000, detail=False):
+    """
+    Stream JSONL queries from input_file to JSONL results in output_file.
+
+    Returns:
+        tuple: (rows written, error records written)
+    """
+    rows = errors = 0
+    line_number = 1
+    while True:
+        lines = list(itertools.islice(input_file, chunk_size))
+        if not lines:
+            break
+        records, chunk_errors = process_chunk(lines, line_number, detail)
+        output_file.write(''.join(json.dumps(record) + '\n' for record in records))
+        rows += len(records)
+        errors += chunk_errors
+        line_number += len(lines)
+    return rows, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate TTK queries from JSONL input")
+    parser.add_argument('input', nargs='?', default='-', help="JSONL query file (default: stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL result file (default: stdout)")
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help="Rows read and evaluated at a time (default: 10000)")
+    parser.add_argument('--detail', action='store_true', help="Include the damage log for every row")
+    parser.add_argument('--strict', action='store_true', help="Exit with status 1 if any row is invalid")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    input_file = sys.stdin if args.input == '-' else open(args.input)
+    output_file = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        rows, errors = run(input_file, output_file, args.chunk_size, args.detail)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    print(f"{rows} rows written, {errors} errors", file=sys.stderr)
+    return 1 if args.strict and errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Pairwise gun dominance over headshot ratio.
+
+For two guns at the same level against the same shield, both TTK curves are
+step functions of headshot ratio (see ttk_breakpoints). Merging their sorted
+breakpoint lists gives segments where both TTKs are constant, so the ratio
+intervals where each gun is faster, and the crossover points between them,
+come out exactly without sampling.
+
+A gun with a headshot multiplier of 1.0 has one step whose TTK only changes by
+float rounding at scattered ratios (see BreakpointIndex.rounding_outcomes).
+Where that decides which gun is faster, the interval has no single winner
+and lists every possible one instead.
+"""
+
+import itertools
+import math
+
+import ttk_calculator
+from ttk_breakpoints import get_breakpoint_index
+
+
+def _winner(gun_a, ttk_a, gun_b, ttk_b):
+    if math.isclose(ttk_a, ttk_b, rel_tol=1e-12, abs_tol=0.0):
+        return None
+    return gun_a if ttk_a < ttk_b else gun_b
+
+
+def _step_ttks(index, step):
+    """Every TTK the index can give within one step."""
+    if len(index.rounding_outcomes) > 1:
+        return [ttk for ttk, _, _ in index.rounding_outcomes]
+    return [index.ttk[step]]
+
+
+def compare_guns(gun_a, gun_b, shield_type='light', level=1):
+    """
+    Find where each of two guns has the lower TTK across headshot ratios 0.0-1.0.
+
+    Args:
+        gun_a (str): First gun
+        gun_b (str): Second gun
+        shield_type (str): Type of shield
+        level (int): Level of both guns (1-4)
+
+    Returns:
+        dict: 'intervals' - list of {'start', 'end', 'winner'} covering 0.0-1.0, where
+              winner is the faster gun's name or None for a tie (each interval includes
+              start and excludes end, except the last which includes 1.0). When float
+              rounding at individual ratios decides the winner, winner is None and the
+              interval also has 'winners', the possible winners (None for a tie);
+              'crossovers' - list of {'ratio', 'from', 'to'} where the winner changes.
+              None if either configuration is invalid.
+    """
+    index_a = get_breakpoint_index(gun_a, shield_type, level)
+    index_b = get_breakpoint_index(gun_b, shield_type, level)
+    if index_a is None or index_b is None:
+        return None
+
+    # Merge the two sorted breakpoint lists, tracking the current step of each
+    segment_starts = sorted(set(index_a.ratios) | set(index_b.ratios))
+    intervals = []
+    step_a = step_b = 0
+    for start in segment_starts:
+        while step_a + 1 < len(index_a.ratios) and index_a.ratios[step_a + 1] <= start:
+            step_a += 1
+        while step_b + 1 < len(index_b.ratios) and index_b.ratios[step_b + 1] <= start:
+            step_b += 1
+        winners = list(dict.fromkeys(_winner(gun_a, ttk_a, gun_b, ttk_b)
+                                     for ttk_a in _step_ttks(index_a, step_a)
+                                     for ttk_b in _step_ttks(index_b, step_b)))
+        interval = {'start': start, 'end': 1.0, 'winner': winners[0] if len(winners) == 1 else None}
+        if len(winners) > 1:
+            interval['winners'] = winners
+        if intervals and intervals[-1].get('winners') == interval.get('winners') \
+                and intervals[-1]['winner'] == interval['winner']:
+            continue
+        if intervals:
+            intervals[-1]['end'] = start
+        intervals.append(interval)
+
+    crossovers = [
+        {'ratio': current['start'], 'from': previous['winner'], 'to': current['winner']}
+        for previous, current in zip(intervals, intervals[1:])
+    ]
+    return {
+        'intervals': intervals,
+        'crossovers': crossovers
+    }
+
+
+def build_dominance_map(guns=None, shield_types=None, levels=(1, 2, 3, 4)):
+    """
+    Compare every pair of guns at every level against every shield type.
+
+    Args:
+        guns (list, optional): Gun names, defaults to every gun in GUNS
+        shield_types (list, optional): Shield types, defaults to every shield in SHIELDS
+        levels (iterable): Levels to include
+
+    Returns:
+        dict: {(gun_a, gun_b, shield_type, level): compare_guns result} for each
+              unordered pair, with gun_a before gun_b in the input order
+    """
+    guns = list(ttk_calculator.GUNS.keys()) if guns is None else list(guns)
+    shield_types = list(ttk_calculator.SHIELDS.keys()) if shield_types is None else list(shield_types)
+    return {
+        (gun_a, gun_b, shield_type, level): compare_guns(gun_a, gun_b, shield_type, level)
+        for gun_a, gun_b in itertools.combinations(guns, 2)
+        for shield_type in shield_types
+        for level in levels
+    }
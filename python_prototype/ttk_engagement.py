@@ -0,0 +1,175 @@
+"""
+Multi-target engagements: one shooter killing several targets in sequence.
+
+calculate_ttk always starts a fresh fight with a full magazine. Here the
+magazine carries over from one target to the next, so a target can be
+started with a few bullets left and need an early reload. Switching targets
+takes `switch_delay` seconds. The switch replaces the usual bullet interval
+before the next shot, or overlaps the reload when the magazine ran dry on
+the previous kill. With switch_delay=0 the engagement is therefore one
+continuous stream of fire.
+
+Each target is resolved analytically. solve_ttk gives the bullets it takes,
+and the kill time follows from the bullets left in the magazine, so no
+bullets are stepped. Bullets to kill depend only on the shield type, so
+comparing many target orderings (squad_wipe_orders) costs a few integer
+operations per target.
+"""
+
+import itertools
+import math
+
+import ttk_calculator
+
+
+def _engagement_inputs(gun_name, level, headshot_ratio):
+    """Damage per bullet and fire/reload stats for already-validated inputs."""
+    gun_stats = ttk_calculator.get_gun_stats(gun_name, level)
+    base_damage = gun_stats['damage']
+    headshot_multiplier = ttk_calculator.HEADSHOT_MULTIPLIERS.get(gun_name, 1.0)
+    damage_per_bullet = base_damage * (1 - headshot_ratio) + base_damage * headshot_ratio * headshot_multiplier
+    return damage_per_bullet, gun_stats['fire_rate'], gun_stats['mag_size'], gun_stats['reload_time']
+
+
+def _bullets_per_shield(damage_per_bullet, shield_types):
+    """Bullets to kill a fresh target of each distinct shield type."""
+    bullets = {}
+    for shield_type in set(shield_types):
+        shield = ttk_calculator.SHIELDS[shield_type]
+        _, bullets[shield_type], _ = ttk_calculator.solve_ttk(
+            damage_per_bullet, 1.0, 1, 0.0, shield['shield_health'], shield['shield_damage_reduction'])
+    return bullets
+
+
+def _validate(gun_name, shield_types, level, headshot_ratio, switch_delay):
+    if not shield_types:
+        return "At least one target is required"
+    if switch_delay < 0 or not math.isfinite(switch_delay):
+        return f"Invalid switch_delay {switch_delay}. Must be a finite number of seconds >= 0"
+    for shield_type in dict.fromkeys(shield_types):
+        error = ttk_calculator.get_validation_error(gun_name, shield_type, level, headshot_ratio)
+        if error is not None:
+            return error
+    return None
+
+
+def _run_engagement(bullets_per_target, time_per_bullet, mag_size, reload_time, switch_delay):
+    """
+    Kill times of consecutive targets from the bullets each one takes.
+
+    Args:
+        bullets_per_target (iterable): Bullets needed for each target, in engagement order
+
+    Returns:
+        list: (start_time, kill_time, bullets_fired, reloads) per target, where reloads
+              counts the reloads finished while on that target (including one overlapping
+              the switch to it)
+    """
+    kills = []
+    time_elapsed = 0.0
+    bullets_in_mag = mag_size
+    for index, bullets in enumerate(bullets_per_target):
+        reloads = 0
+        if index:
+            if bullets_in_mag == 0:
+                # Reload while switching; the first shot of a fresh magazine is instant
+                time_elapsed += max(switch_delay, reload_time)
+                bullets_in_mag = mag_size
+                reloads += 1
+            else:
+                time_elapsed += max(switch_delay, time_per_bullet)
+        start_time = time_elapsed
+
+        # First shot comes out of the current magazine; the rest out of fresh ones as needed
+        from_new_mags = max(0, bullets - bullets_in_mag)
+        mid_target_reloads = -(-from_new_mags // mag_size)
+        time_elapsed += (bullets - 1 - mid_target_reloads) * time_per_bullet + mid_target_reloads * reload_time
+        bullets_in_mag = bullets_in_mag - bullets if not from_new_mags else -from_new_mags % mag_size
+        kills.append((start_time, time_elapsed, bullets, reloads + mid_target_reloads))
+    return kills
+
+
+def simulate_engagement(gun_name, shield_types, level=1, headshot_ratio=0.0, switch_delay=0.0):
+    """
+    Kill a sequence of targets with one gun, carrying the magazine between them.
+
+    Args:
+        gun_name (str): Name of the gun
+        shield_types (list): Shield type of each target, in the order they are engaged
+        level (int): Gun level (1-4), defaults to 1
+        headshot_ratio (float): Ratio of headshots (0.0-1.0), defaults to 0.0
+        switch_delay (float): Seconds to move from a kill to the next target's first shot
+
+    Returns:
+        dict: 'kills' - per target {'target', 'shield_type', 'start_time', 'kill_time',
+              'bullets_fired', 'reloads'} (times from the first shot on the first target);
+              'total_time', 'bullets_fired', 'reloads' and 'bullets_left_in_mag' for the
+              whole engagement. None if any input is invalid.
+    """
+    shield_types = list(shield_types)
+    if _validate(gun_name, shield_types, level, headshot_ratio, switch_delay) is not None:
+        return None
+
+    damage_per_bullet, firerate, mag_size, reload_time = _engagement_inputs(gun_name, level, headshot_ratio)
+    bullets = _bullets_per_shield(damage_per_bullet, shield_types)
+    kills = _run_engagement([bullets[shield_type] for shield_type in shield_types],
+                            1.0 / firerate, mag_size, reload_time, switch_delay)
+
+    bullets_fired = sum(kill[2] for kill in kills)
+    reloads = sum(kill[3] for kill in kills)
+    return {
+        'kills': [
+            {
+                'target': target,
+                'shield_type': shield_type,
+                'start_time': start_time,
+                'kill_time': kill_time,
+                'bullets_fired': target_bullets,
+                'reloads': target_reloads
+            }
+            for target, (shield_type, (start_time, kill_time, target_bullets, target_reloads))
+            in enumerate(zip(shield_types, kills))
+        ],
+        'total_time': kills[-1][1],
+        'bullets_fired': bullets_fired,
+        'reloads': reloads,
+        'bullets_left_in_mag': -bullets_fired % mag_size
+    }
+
+
+def squad_wipe_orders(gun_name, shield_types, level=1, headshot_ratio=0.0, switch_delay=0.0):
+    """
+    Total engagement time for every distinct order of engaging a set of targets.
+
+    Orders that only swap targets with the same shield type are counted once.
+
+    Args:
+        gun_name (str): Name of the gun
+        shield_types (list): Shield type of each target
+        level (int): Gun level (1-4), defaults to 1
+        headshot_ratio (float): Ratio of headshots (0.0-1.0), defaults to 0.0
+        switch_delay (float): Seconds to move from a kill to the next target's first shot
+
+    Returns:
+        list: {'order': tuple of shield types, 'total_time', 'kill_times'} sorted by
+              total_time (fastest first), or None if any input is invalid
+    """
+    shield_types = list(shield_types)
+    if _validate(gun_name, shield_types, level, headshot_ratio, switch_delay) is not None:
+        return None
+
+    damage_per_bullet, firerate, mag_size, reload_time = _engagement_inputs(gun_name, level, headshot_ratio)
+    bullets = _bullets_per_shield(damage_per_bullet, shield_types)
+    time_per_bullet = 1.0 / firerate
+
+    results = []
+    for order in set(itertools.permutations(shield_types)):
+        kills = _run_engagement([bullets[shield_type] for shield_type in order],
+                                time_per_bullet, mag_size, reload_time, switch_delay)
+        results.append({
+            'order': order,
+            'total_time': kills[-1][1],
+            'kill_times': [kill[1] for kill in kills]
+        })
+    results.sort(key=lambda result: (result['total_time'], result['kill_times'], result['order']))
+    return results
@@ -0,0 +1,238 @@
+"""
+Build-time export of precomputed TTK results for the static web app.
+
+Writes one shard per weapon with TTK, bullets fired and reloads for every
+shield, level and headshot ratio on the slider's 0.01 grid, plus
+damage-over-time series at a few headshot ratios. Shard file names contain a
+hash of their content, so they can be cached forever; manifest.json maps each
+weapon to its current shard and is the only file the frontend must revalidate.
+
+Each shard also records an input hash of everything its numbers depend on
+(the gun's derived stats, headshot multiplier, shields, base health and the
+export settings). Weapons whose input hash matches the previous manifest are
+skipped, so a data change only rebuilds the shards it affects.
+
+Shard layout (camelCase, like TTKResult in src/utils/calculator.ts):
+    {
+      "gunName": "kettle", "inputHash": "...", "headshotRatios": [0, 0.01, ...],
+      "results": {"light": {"1": {"ttk": [...], "bulletsFired": [...], "reloads": [...]}, ...}, ...},
+      "damageOverTime": {"light": {"1": [{"headshotRatio": 0.5, "time": [...],
+                                          "shieldHealth": [...], "health": [...]}, ...]}}
+    }
+
+Usage:
+    python ttk_export.py                       # writes public/data/ttk/
+    python ttk_export.py --output-dir dist/ttk --force
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import ttk_calculator
+from ttk_queries import evaluate_queries
+
+EXPORT_FORMAT = 1
+LEVELS = [1, 2, 3, 4]
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'public', 'data', 'ttk')
+DEFAULT_RATIO_STEPS = 100
+DEFAULT_SERIES_RATIOS = (0.0, 0.25, 0.5, 0.75, 1.0)
+# Decimal places kept for times and health values in the shards
+PRECISION = 6
+
+
+def _dump(payload):
+    return json.dumps(payload, separators=(',', ':'), sort_keys=True)
+
+
+def _write_atomic(path, text):
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def shard_input_hash(gun_name, ratio_steps, series_ratios):
+    """
+    Hash of everything a weapon's shard is computed from.
+
+    Returns:
+        str: Hex digest that changes when the shard's numbers could change
+    """
+    payload = _dump({
+        'format': EXPORT_FORMAT,
+        'stats': {str(level): stats for level, stats in ttk_calculator.GUN_STATS_BY_LEVEL[gun_name].items()},
+        'headshot_multiplier': ttk_calculator.HEADSHOT_MULTIPLIERS.get(gun_name, 1.0),
+        'shields': ttk_calculator.SHIELDS,
+        'base_health': ttk_calculator.BASE_HEALTH,
+        'ratio_steps': ratio_steps,
+        'series_ratios': list(series_ratios),
+        'precision': PRECISION
+    })
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def damage_over_time(gun_name, shield_type, level, headshot_ratio):
+    """
+    Shield and health after every shot, starting from the undamaged target at time 0.
+
+    Returns:
+        dict: headshotRatio plus parallel 'time', 'shieldHealth' and 'health' lists
+    """
+    shield = ttk_calculator.SHIELDS[shield_type]['shield_health']
+    series = {'headshotRatio': headshot_ratio, 'time': [0.0], 'shieldHealth': [shield],
+              'health': [ttk_calculator.BASE_HEALTH]}
+    for event in ttk_calculator.iter_damage_events(gun_name, shield_type, level, headshot_ratio):
+        if event.type == 'shot':
+            series['time'].append(round(event.time, PRECISION))
+            series['shieldHealth'].append(round(event.shield_health_after, PRECISION))
+            series['health'].append(round(max(event.health_after, 0.0), PRECISION))
+    return series
+
+
+def build_shard(gun_name, ratio_steps=DEFAULT_RATIO_STEPS, series_ratios=DEFAULT_SERIES_RATIOS):
+    """
+    Compute one weapon's shard.
+
+    Returns:
+        dict: JSON-ready shard (see module docstring)
+    """
+    ratios = [step / ratio_steps for step in range(ratio_steps + 1)]
+    shields = list(ttk_calculator.SHIELDS.keys())
+    queries = [(gun_name, shield_type, level, ratio)
+               for shield_type in shields for level in LEVELS for ratio in ratios]
+    solutions = iter(evaluate_queries(queries))
+
+    results = {}
+    series = {}
+    for shield_type in shields:
+        results[shield_type] = {}
+        series[shield_type] = {}
+        for level in LEVELS:
+            ttks, bullets, reloads = zip(*(next(solutions) for _ in ratios))
+            results[shield_type][str(level)] = {
+                'ttk': [round(ttk, PRECISION) for ttk in ttks],
+                'bulletsFired': list(bullets),
+                'reloads': list(reloads)
+            }
+            series[shield_type][str(level)] = [
+                damage_over_time(gun_name, shield_type, level, ratio) for ratio in series_ratios
+            ]
+
+    return {
+        'format': EXPORT_FORMAT,
+        'gunName': gun_name,
+        'inputHash': shard_input_hash(gun_name, ratio_steps, series_ratios),
+        'headshotRatios': ratios,
+        'levels': LEVELS,
+        'shields': shields,
+        'results': results,
+        'damageOverTime': series
+    }
+
+
+def export_shards(output_dir=DEFAULT_OUTPUT_DIR, guns=None, ratio_steps=DEFAULT_RATIO_STEPS,
+                  series_ratios=DEFAULT_SERIES_RATIOS, force=False):
+    """
+    Write changed weapon shards and the manifest to output_dir.
+
+    With guns, only those weapons are exported and the manifest keeps every other
+    weapon's entry. Only shards the previous manifest listed and the new one no
+    longer does are deleted; other files in output_dir are left alone.
+
+    Args:
+        output_dir (str): Directory for the shards and manifest.json
+        guns (list, optional): Gun names, defaults to every gun in GUNS
+        ratio_steps (int): Headshot ratio grid intervals (100 = the slider's 0.01 step)
+        series_ratios (iterable): Headshot ratios with damage-over-time series
+        force (bool): Rebuild every shard even if its inputs are unchanged
+
+    Returns:
+        dict: {'written': [gun names], 'skipped': [gun names], 'removed': [file names]}
+
+    Raises:
+        ValueError: If a subset export uses other ratio settings than the existing manifest
+    """
+    series_ratios = list(series_ratios)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    previous = manifest.get('weapons', {})
+
+    gun_names = list(ttk_calculator.GUNS.keys()) if guns is None else list(guns)
+    weapons = {}
+    if guns is not None:
+        if previous and (manifest.get('ratioSteps') != ratio_steps
+                         or manifest.get('seriesRatios') != series_ratios):
+            raise ValueError("A subset export must use the manifest's ratioSteps and seriesRatios; "
+                             "export every gun to change them")
+        weapons = {gun_name: entry for gun_name, entry in previous.items() if gun_name not in gun_names}
+    written = []
+    skipped = []
+    for gun_name in gun_names:
+        input_hash = shard_input_hash(gun_name, ratio_steps, series_ratios)
+        entry = previous.get(gun_name)
+        if (not force and entry and entry['inputHash'] == input_hash
+                and os.path.exists(os.path.join(output_dir, entry['file']))):
+            weapons[gun_name] = entry
+            skipped.append(gun_name)
+            continue
+
+        text = _dump(build_shard(gun_name, ratio_steps, series_ratios))
+        content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+        file_name = f"{gun_name}.{content_hash}.json"
+        _write_atomic(os.path.join(output_dir, file_name), text)
+        weapons[gun_name] = {'file': file_name, 'inputHash': input_hash, 'bytes': len(text.encode('utf-8'))}
+        written.append(gun_name)
+
+    _write_atomic(manifest_path, json.dumps({
+        'format': EXPORT_FORMAT,
+        'dataVersion': ttk_calculator.DATA_VERSION,
+        'ratioSteps': ratio_steps,
+        'seriesRatios': series_ratios,
+        'weapons': weapons
+    }, indent=2, sort_keys=True))
+
+    # Drop the previous manifest's shards that the new one replaced or no longer lists
+    current_files = {entry['file'] for entry in weapons.values()}
+    removed = []
+    for gun_name, entry in previous.items():
+        file_name = entry.get('file', '')
+        if (file_name in current_files or os.path.basename(file_name) != file_name
+                or not (file_name.startswith(f"{gun_name}.") and file_name.endswith('.json'))):
+            continue
+        file_path = os.path.join(output_dir, file_name)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            removed.append(file_name)
+
+    return {'written': written, 'skipped': skipped, 'removed': removed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export precomputed TTK shards for the web app")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help="Directory for shards and manifest.json (default: public/data/ttk)")
+    parser.add_argument('--ratio-steps', type=int, default=DEFAULT_RATIO_STEPS,
+                        help="Headshot ratio grid intervals (default: 100)")
+    parser.add_argument('--series-ratios', default=','.join(str(ratio) for ratio in DEFAULT_SERIES_RATIOS),
+                        help="Comma-separated headshot ratios with damage-over-time series")
+    parser.add_argument('--force', action='store_true', help="Rebuild every shard")
+    args = parser.parse_args(argv)
+
+    series_ratios = [float(ratio) for ratio in args.series_ratios.split(',') if ratio]
+    summary = export_shards(args.output_dir, ratio_steps=args.ratio_steps,
+                            series_ratios=series_ratios, force=args.force)
+    print(f"{len(summary['written'])} shards written, {len(summary['skipped'])} unchanged, "
+          f"{len(summary['removed'])} removed -> {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
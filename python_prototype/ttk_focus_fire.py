@@ -0,0 +1,183 @@
+"""
+Event-driven focus fire: several shooters damaging one target.
+
+Every shooter keeps the calculator's own cadence. The first shot is instant,
+then one bullet interval per shot, and the first shot after a reload is
+instant. Each shooter's next shot or reload is an event in one heap ordered
+by time, so the simulation jumps from event to event instead of stepping
+time. Every bullet applies the usual shield rules to the shared target: the
+shield takes full damage and health takes damage * (1 - shield_damage_reduction)
+until the shield breaks, then health takes full damage.
+
+Events at the same time resolve in shooter order (a shot before a reload,
+as SHOT < RELOAD), and the fight ends on the bullet that kills the target, so
+later simultaneous shots and reloads never happen. With one shooter the result matches
+calculate_ttk.
+
+Shooters are (gun_name, level, headshot_ratio) tuples, optionally with a
+fourth start_time element for a shooter joining late.
+"""
+
+import heapq
+import itertools
+
+import ttk_calculator
+
+SHOT = 0
+RELOAD = 1
+
+
+def _shooter_inputs(shooter):
+    """(damage_per_bullet, time_per_bullet, mag_size, reload_time, start_time) of an already-validated shooter."""
+    gun_name, level, headshot_ratio = shooter[:3]
+    start_time = shooter[3] if len(shooter) > 3 else 0.0
+    gun_stats = ttk_calculator.get_gun_stats(gun_name, level)
+    base_damage = gun_stats['damage']
+    headshot_multiplier = ttk_calculator.HEADSHOT_MULTIPLIERS.get(gun_name, 1.0)
+    damage_per_bullet = base_damage * (1 - headshot_ratio) + base_damage * headshot_ratio * headshot_multiplier
+    return (damage_per_bullet, 1.0 / gun_stats['fire_rate'], gun_stats['mag_size'], gun_stats['reload_time'],
+            float(start_time))
+
+
+def get_shooters_error(shooters, shield_type='light'):
+    """
+    Check a focus-fire setup.
+
+    Returns:
+        str: Error message for the first invalid shooter, or None if all are valid
+    """
+    if not shooters:
+        return "At least one shooter is required"
+    for index, shooter in enumerate(shooters):
+        if not isinstance(shooter, (tuple, list)) or len(shooter) not in (3, 4):
+            return f"Shooter {index} must be (gun_name, level, headshot_ratio[, start_time])"
+        error = ttk_calculator.get_validation_error(shooter[0], shield_type, shooter[1], shooter[2])
+        if error is not None:
+            return f"Shooter {index}: {error}"
+        if len(shooter) == 4 and not shooter[3] >= 0:
+            return f"Shooter {index}: invalid start_time {shooter[3]!r}. Must be >= 0"
+    return None
+
+
+def _simulate(inputs, shield_health, shield_damage_reduction, health, damage_log=None):
+    """
+    Run the event loop for resolved shooter inputs.
+
+    Returns:
+        tuple: (ttk, bullets fired per shooter, reloads per shooter, index of the killing shooter)
+    """
+    bullets_fired = [0] * len(inputs)
+    reloads = [0] * len(inputs)
+    bullets_in_mag = [mag_size for _, _, mag_size, _, _ in inputs]
+    # (time, shooter, kind): simultaneous events resolve in shooter order
+    timeline = [(start_time, index, SHOT) for index, (_, _, _, _, start_time) in enumerate(inputs)]
+    heapq.heapify(timeline)
+
+    while True:
+        time_elapsed, shooter, kind = heapq.heappop(timeline)
+        damage_per_bullet, time_per_bullet, mag_size, reload_time, _ = inputs[shooter]
+
+        if kind == RELOAD:
+            reloads[shooter] += 1
+            bullets_in_mag[shooter] = mag_size
+            if damage_log is not None:
+                damage_log.append({'type': 'reload', 'time': time_elapsed, 'shooter': shooter,
+                                   'reload_number': reloads[shooter]})
+            # First shot of a fresh magazine is instant
+            heapq.heappush(timeline, (time_elapsed, shooter, SHOT))
+            continue
+
+        bullets_fired[shooter] += 1
+        bullets_in_mag[shooter] -= 1
+        shield_before = shield_health
+        health_before = health
+        if shield_health > 0:
+            shield_health = max(shield_health - damage_per_bullet, 0)
+            health -= damage_per_bullet * (1 - shield_damage_reduction)
+        else:
+            health -= damage_per_bullet
+        if damage_log is not None:
+            damage_log.append({'type': 'shot', 'time': time_elapsed, 'shooter': shooter,
+                               'bullet': bullets_fired[shooter],
+                               'shield_health_before': shield_before,
+                               'shield_health_after': shield_health,
+                               'health_before': health_before, 'health_after': health,
+                               'shield_active': shield_before > 0})
+
+        if health <= 0:
+            return time_elapsed, bullets_fired, reloads, shooter
+
+        if bullets_in_mag[shooter] == 0:
+            heapq.heappush(timeline, (time_elapsed + reload_time, shooter, RELOAD))
+        else:
+            heapq.heappush(timeline, (time_elapsed + time_per_bullet, shooter, SHOT))
+
+
+def simulate_focus_fire(shooters, shield_type='light', include_log=False):
+    """
+    Simulate several shooters focusing one target.
+
+    Args:
+        shooters (list): (gun_name, level, headshot_ratio[, start_time]) per shooter
+        shield_type (str): Target's shield type
+        include_log (bool): Also return the merged shot/reload timeline
+
+    Returns:
+        dict: 'ttk', per-shooter 'bullets_fired' and 'reloads' lists, 'total_bullets',
+              'killer' (index of the shooter landing the killing bullet) and
+              'damage_log' (list of event dicts, or None). None if any input is invalid.
+    """
+    shooters = list(shooters)
+    if get_shooters_error(shooters, shield_type) is not None:
+        return None
+
+    shield = ttk_calculator.SHIELDS[shield_type]
+    damage_log = [] if include_log else None
+    ttk, bullets_fired, reloads, killer = _simulate(
+        [_shooter_inputs(shooter) for shooter in shooters],
+        shield['shield_health'], shield['shield_damage_reduction'], ttk_calculator.BASE_HEALTH, damage_log)
+    return {
+        'ttk': ttk,
+        'bullets_fired': bullets_fired,
+        'reloads': reloads,
+        'total_bullets': sum(bullets_fired),
+        'killer': killer,
+        'damage_log': damage_log
+    }
+
+
+def rank_loadouts(guns=None, team_size=2, shield_type='light', level=1, headshot_ratio=0.0, top_k=None):
+    """
+    Focus-fire TTK of every team of `team_size` guns (repeats allowed) against one target.
+
+    Each gun's inputs are resolved once and shared by every team it appears in.
+
+    Args:
+        guns (list, optional): Gun names, defaults to every gun in GUNS
+        team_size (int): Shooters per team (2 for 2v1, 3 for 3v1, ...)
+        shield_type (str): Target's shield type
+        level (int): Level of every gun (1-4)
+        headshot_ratio (float): Headshot ratio of every shooter (0.0-1.0)
+        top_k (int, optional): Keep only the fastest k teams
+
+    Returns:
+        list: (team tuple of gun names, ttk) sorted by ttk then team, or None if any input is invalid
+    """
+    guns = list(ttk_calculator.GUNS.keys()) if guns is None else list(guns)
+    if team_size < 1:
+        return None
+    if get_shooters_error([(gun_name, level, headshot_ratio) for gun_name in guns], shield_type) is not None:
+        return None
+
+    shield = ttk_calculator.SHIELDS[shield_type]
+    shield_health = shield['shield_health']
+    shield_damage_reduction = shield['shield_damage_reduction']
+    health = ttk_calculator.BASE_HEALTH
+    inputs = {gun_name: _shooter_inputs((gun_name, level, headshot_ratio)) for gun_name in guns}
+
+    results = [
+        (team, _simulate([inputs[gun_name] for gun_name in team], shield_health, shield_damage_reduction, health)[0])
+        for team in itertools.combinations_with_replacement(guns, team_size)
+    ]
+    results.sort(key=lambda result: (result[1], result[0]))
+    return results if top_k is None else results[:top_k]
@@ -0,0 +1,256 @@
+"""
+Opt-in instrumentation and profiling for the TTK engines.
+
+While enabled, ttk_calculator and ttk_batch report call counts, timings,
+loop iterations, bullets fired, validation rejections and exact-kill
+recounts to an Instrumentation instance. Snapshots also include the hit
+ratios of the shared TTKCache and any caches registered with watch_cache.
+
+Disabled (the default), each hook is a single `is not None` check on a
+module global, so the engines run at full speed.
+
+Usage:
+    import ttk_instrumentation
+
+    with ttk_instrumentation.instrumented(sinks=[JsonSink('metrics.json')]) as instrumentation:
+        run_sweep()
+    print(instrumentation.snapshot()['timings']['calculate_ttk'])
+
+    with ttk_instrumentation.profile('sweep.prof') as report:
+        run_sweep()
+    print(report['text'])
+"""
+
+import contextlib
+import cProfile
+import heapq
+import io
+import json
+import math
+import os
+import pstats
+import time
+from bisect import bisect_left
+from collections import Counter
+
+import ttk_calculator
+import ttk_cache
+
+# Upper bounds (seconds) of the timing histogram buckets; the last bucket is open-ended
+TIMING_BUCKETS = (
+    1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4,
+    1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2, 1e-1, 1.0, 10.0, math.inf
+)
+
+
+class TimingHistogram:
+    """Count, total, min, max and fixed-bucket histogram of durations."""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * len(TIMING_BUCKETS)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(TIMING_BUCKETS, seconds)] += 1
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_s': self.total,
+            'mean_s': self.total / self.count if self.count else None,
+            'min_s': self.min if self.count else None,
+            'max_s': self.max,
+            'buckets': [
+                {'le_s': None if math.isinf(bound) else bound, 'count': count}
+                for bound, count in zip(TIMING_BUCKETS, self.buckets) if count
+            ]
+        }
+
+
+class Instrumentation:
+    """
+    Collects counters, timing histograms and the slowest calls per function.
+
+    Args:
+        sinks (iterable): Callables that receive snapshot() dicts on flush()
+        slowest (int): Number of slowest calls (with their arguments) kept per function
+    """
+
+    def __init__(self, sinks=(), slowest=10):
+        self.sinks = list(sinks)
+        self.slowest_kept = slowest
+        self.counters = Counter()
+        self.timings = {}
+        self._slowest = {}
+        self._caches = {}
+
+    def increment(self, name, amount=1):
+        self.counters[name] += amount
+
+    def observe(self, name, seconds):
+        histogram = self.timings.get(name)
+        if histogram is None:
+            histogram = self.timings[name] = TimingHistogram()
+        histogram.observe(seconds)
+
+    def record_call(self, name, seconds, args=None, iterations=None, bullets=None):
+        """
+        Record one completed call of an instrumented function.
+
+        Args:
+            name (str): Function name
+            seconds (float): Wall time of the call
+            args (tuple, optional): Call arguments, kept if the call is among the slowest
+            iterations (int, optional): Loop iterations the call ran
+            bullets (int, optional): Bullets fired in the simulated fight
+        """
+        self.counters[f'{name}.calls'] += 1
+        if iterations is not None:
+            self.counters[f'{name}.iterations'] += iterations
+        if bullets is not None:
+            self.counters[f'{name}.bullets'] += bullets
+        self.observe(name, seconds)
+
+        if args is not None and self.slowest_kept:
+            slowest = self._slowest.setdefault(name, [])
+            entry = (seconds, args)
+            if len(slowest) < self.slowest_kept:
+                heapq.heappush(slowest, entry)
+            elif seconds > slowest[0][0]:
+                heapq.heapreplace(slowest, entry)
+
+    def watch_cache(self, name, cache):
+        """Include a TTKCache's stats in snapshots under `name`."""
+        self._caches[name] = cache
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: JSON-ready 'counters', 'timings', 'slowest' calls and 'caches' stats
+        """
+        caches = {'shared': ttk_cache.get_cache().stats()}
+        caches.update((name, cache.stats()) for name, cache in self._caches.items())
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'data_version': ttk_calculator.DATA_VERSION,
+            'counters': dict(self.counters),
+            'timings': {name: histogram.as_dict() for name, histogram in self.timings.items()},
+            'slowest': {
+                name: [{'seconds': seconds, 'args': list(args)} for seconds, args in sorted(entries, reverse=True)]
+                for name, entries in self._slowest.items()
+            },
+            'caches': caches
+        }
+
+    def flush(self):
+        """Send a snapshot to every sink and return it."""
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink(snapshot)
+        return snapshot
+
+    def reset(self):
+        self.counters.clear()
+        self.timings.clear()
+        self._slowest.clear()
+
+
+class MemorySink:
+    """Sink that keeps every flushed snapshot in `snapshots`."""
+
+    def __init__(self):
+        self.snapshots = []
+
+    def __call__(self, snapshot):
+        self.snapshots.append(snapshot)
+
+
+class JsonSink:
+    """Sink that writes each flushed snapshot to a JSON file, replacing the previous one."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, snapshot):
+        temp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(temp_path, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def enable(instrumentation=None):
+    """
+    Start reporting from the engines to an Instrumentation instance.
+
+    Returns:
+        Instrumentation: The active instance (a new one if none was given)
+    """
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    ttk_calculator._INSTRUMENTATION = instrumentation
+    return instrumentation
+
+
+def disable():
+    """Stop reporting; the hooks go back to a single None check."""
+    ttk_calculator._INSTRUMENTATION = None
+
+
+def get_instrumentation():
+    """The active Instrumentation, or None when disabled."""
+    return ttk_calculator._INSTRUMENTATION
+
+
+@contextlib.contextmanager
+def instrumented(sinks=(), slowest=10):
+    """
+    Enable instrumentation for a block, flushing to the sinks when it ends.
+
+    Yields:
+        Instrumentation: The instance collecting the block's metrics
+    """
+    previous = ttk_calculator._INSTRUMENTATION
+    instrumentation = enable(Instrumentation(sinks, slowest))
+    try:
+        yield instrumentation
+    finally:
+        ttk_calculator._INSTRUMENTATION = previous
+        instrumentation.flush()
+
+
+@contextlib.contextmanager
+def profile(path=None, sort='cumulative', limit=30):
+    """
+    Run a block under cProfile.
+
+    Args:
+        path (str, optional): Also dump the raw stats here (for snakeviz, pstats, ...)
+        sort (str): pstats sort key for the text report
+        limit (int): Number of functions in the text report
+
+    Yields:
+        dict: Filled when the block ends with 'stats' (pstats.Stats) and 'text' (report)
+    """
+    report = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        if path is not None:
+            profiler.dump_stats(path)
+        text = io.StringIO()
+        stats = pstats.Stats(profiler, stream=text)
+        stats.sort_stats(sort).print_stats(limit)
+        report['stats'] = stats
+        report['text'] = text.getvalue()
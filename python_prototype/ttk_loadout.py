@@ -0,0 +1,233 @@
+"""
+Two-weapon loadouts: swap to the other gun instead of reloading.
+
+calculate_ttk always reloads when the magazine runs dry. A player carrying a
+primary and a secondary can instead swap weapons, which takes `swap_time`
+seconds. optimize_loadout finds the fastest fire/swap/reload schedule against
+one target.
+
+Schedule rules follow the calculator's cadence for each gun:
+- Either gun can open the fight, with the first shot at time 0
+- A burst of bullets from one gun is one bullet interval apart, and its first
+  shot is instant (after the start, a reload or a swap)
+- A gun reloads only when its magazine is empty, taking its reload_time; the
+  other gun's magazine is kept across swaps, and guns don't reload while holstered
+- Swapping to a gun with an empty magazine means reloading it after the swap
+
+The search is Dijkstra's algorithm over "ready to fire" states (shield,
+health, both magazines and the gun in hand), with time as the cost. Only
+bursts end at decisions, so a state is expanded once per burst length
+instead of once per bullet. States are ordered by time plus a lower bound
+on the time still needed (A*): the bullets the highest-damage gun would
+still need, each after the first at least the shortest bullet interval,
+reload or swap apart (a one-round magazine fires again right after its
+reload, which can be quicker than its bullet interval). The search stops
+once that bound reaches the best kill found. When swapping is faster than a gun's own bullet interval, the optimizer
+will alternate guns, so it is worth passing a realistic swap_time.
+"""
+
+import heapq
+import itertools
+import math
+
+import ttk_calculator
+
+SLOTS = ('primary', 'secondary')
+
+
+def _gun_inputs(gun_name, level, headshot_ratio):
+    """(damage_per_bullet, time_per_bullet, mag_size, reload_time) for already-validated inputs."""
+    gun_stats = ttk_calculator.get_gun_stats(gun_name, level)
+    base_damage = gun_stats['damage']
+    headshot_multiplier = ttk_calculator.HEADSHOT_MULTIPLIERS.get(gun_name, 1.0)
+    damage_per_bullet = base_damage * (1 - headshot_ratio) + base_damage * headshot_ratio * headshot_multiplier
+    return damage_per_bullet, 1.0 / gun_stats['fire_rate'], gun_stats['mag_size'], gun_stats['reload_time']
+
+
+def _search(guns, shield_health, shield_damage_reduction, health, swap_time):
+    """
+    Fastest schedule for two resolved guns.
+
+    Args:
+        guns (tuple): _gun_inputs of the primary and the secondary
+
+    Returns:
+        tuple: (ttk, schedule) where schedule is a list of ('fire', slot, bullets),
+               ('reload', slot) and ('swap', slot) actions, slot being 0 or 1
+    """
+    best_ttk = float('inf')
+    best_path = None
+    best_time = {}
+    counter = itertools.count()
+    max_damage = max(guns[0][0], guns[1][0])
+    # Consecutive shots are a bullet interval, a reload or a swap apart (or more)
+    min_gap = min(guns[0][1], guns[1][1], guns[0][3], guns[1][3], swap_time)
+
+    shielded_max_damage = max_damage * (1 - shield_damage_reduction)
+
+    def remaining_bound(shield, current_health):
+        # Fewest bullets that could still kill (every one at the highest damage), with
+        # a little slack against float rounding, times the shortest gap between shots
+        bullets = math.ceil(current_health / max_damage - 1e-9)
+        if shield > 0 and shielded_max_damage > 0:
+            shield_bullets = math.ceil(shield / max_damage - 1e-9)
+            health_left = current_health - shield_bullets * shielded_max_damage
+            if health_left <= 0:
+                bullets = math.ceil(current_health / shielded_max_damage - 1e-9)
+            else:
+                bullets = shield_bullets + math.ceil(health_left / max_damage - 1e-9)
+        return max(bullets - 1, 0) * min_gap
+
+    # (bound, tiebreak, time, shield, health, mags, slot, path); path is a linked list of actions
+    frontier = [(remaining_bound(shield_health, health), next(counter), 0.0, shield_health, health, (guns[0][2], guns[1][2]),
+                 slot, None) for slot in (0, 1)]
+
+    while frontier:
+        bound, _, time_elapsed, shield, current_health, mags, slot, path = heapq.heappop(frontier)
+        if bound >= best_ttk:
+            break
+        key = (shield, current_health, mags, slot)
+        if best_time.get(key, best_ttk) < time_elapsed:
+            continue
+
+        damage_per_bullet, time_per_bullet, mag_size, reload_time = guns[slot]
+        shot_time = time_elapsed
+        for bullets in range(1, mags[slot] + 1):
+            if bullets > 1:
+                shot_time += time_per_bullet
+            if shot_time >= best_ttk:
+                break
+            if shield > 0:
+                shield -= damage_per_bullet
+                current_health -= damage_per_bullet * (1 - shield_damage_reduction)
+            else:
+                current_health -= damage_per_bullet
+            burst = (path, ('fire', slot, bullets))
+            if current_health <= 0:
+                best_ttk = shot_time
+                best_path = burst
+                break
+
+            # Decide what follows a burst of this length
+            bound_left = remaining_bound(shield, current_health)
+            left = mags[slot] - bullets
+            other = 1 - slot
+            if left == 0:
+                successors = [(shot_time + reload_time, (mag_size, mags[1]) if slot == 0 else (mags[0], mag_size),
+                               slot, (burst, ('reload', slot)))]
+            else:
+                successors = []
+            after_burst = (left, mags[1]) if slot == 0 else (mags[0], left)
+            swapped = (burst, ('swap', other))
+            if after_burst[other]:
+                successors.append((shot_time + swap_time, after_burst, other, swapped))
+            else:
+                refilled = (after_burst[0], guns[1][2]) if other == 1 else (guns[0][2], after_burst[1])
+                successors.append((shot_time + swap_time + guns[other][3], refilled, other,
+                                   (swapped, ('reload', other))))
+
+            for next_time, next_mags, next_slot, next_path in successors:
+                next_key = (shield, current_health, next_mags, next_slot)
+                next_bound = next_time + bound_left
+                if next_bound < best_ttk and next_time < best_time.get(next_key, best_ttk):
+                    best_time[next_key] = next_time
+                    heapq.heappush(frontier, (next_bound, next(counter), next_time, shield, current_health,
+                                              next_mags, next_slot, next_path))
+
+    schedule = []
+    while best_path is not None:
+        best_path, action = best_path
+        schedule.append(action)
+    schedule.reverse()
+    return best_ttk, schedule
+
+
+def optimize_loadout(primary, secondary, shield_type='light', level=1, headshot_ratio=0.0, swap_time=0.5,
+                     secondary_level=None):
+    """
+    Find the fire/swap/reload schedule with the lowest TTK for a two-gun loadout.
+
+    Args:
+        primary (str): Name of the first gun
+        secondary (str): Name of the second gun (may be the same gun, as a second copy)
+        shield_type (str): Type of shield
+        level (int): Primary gun level (1-4), and the secondary's unless secondary_level is given
+        headshot_ratio (float): Ratio of headshots (0.0-1.0) for both guns
+        swap_time (float): Seconds to switch weapons
+        secondary_level (int, optional): Secondary gun level (1-4)
+
+    Returns:
+        dict: 'ttk', 'schedule' (list of {'action': 'fire'|'reload'|'swap', 'gun', 'slot'} plus
+              'bullets' for fire actions), 'bullets_fired', 'swaps' and 'reloads', and
+              'single_gun_ttk' (TTK of each gun used alone, keyed by slot).
+              None if any input is invalid.
+    """
+    if secondary_level is None:
+        secondary_level = level
+    if not swap_time >= 0:
+        return None
+    if (ttk_calculator.get_validation_error(primary, shield_type, level, headshot_ratio) is not None
+            or ttk_calculator.get_validation_error(secondary, shield_type, secondary_level,
+                                                   headshot_ratio) is not None):
+        return None
+
+    guns = (_gun_inputs(primary, level, headshot_ratio), _gun_inputs(secondary, secondary_level, headshot_ratio))
+    shield = ttk_calculator.SHIELDS[shield_type]
+    ttk, actions = _search(guns, shield['shield_health'], shield['shield_damage_reduction'],
+                           ttk_calculator.BASE_HEALTH, swap_time)
+
+    names = (primary, secondary)
+    schedule = []
+    for action in actions:
+        entry = {'action': action[0], 'gun': names[action[1]], 'slot': SLOTS[action[1]]}
+        if action[0] == 'fire':
+            entry['bullets'] = action[2]
+        schedule.append(entry)
+
+    return {
+        'ttk': ttk,
+        'schedule': schedule,
+        'bullets_fired': sum(entry.get('bullets', 0) for entry in schedule),
+        'swaps': sum(entry['action'] == 'swap' for entry in schedule),
+        'reloads': sum(entry['action'] == 'reload' for entry in schedule),
+        'single_gun_ttk': {
+            'primary': ttk_calculator.solve_ttk(guns[0][0], 1.0 / guns[0][1], guns[0][2], guns[0][3],
+                                                shield['shield_health'], shield['shield_damage_reduction'])[0],
+            'secondary': ttk_calculator.solve_ttk(guns[1][0], 1.0 / guns[1][1], guns[1][2], guns[1][3],
+                                                  shield['shield_health'], shield['shield_damage_reduction'])[0]
+        }
+    }
+
+
+def rank_loadout_pairs(guns=None, shield_type='light', level=1, headshot_ratio=0.0, swap_time=0.5, top_k=None):
+    """
+    Optimal two-gun TTK of every loadout pair (including two copies of one gun).
+
+    Args:
+        guns (list, optional): Gun names, defaults to every gun in GUNS
+        shield_type (str): Type of shield
+        level (int): Level of both guns (1-4)
+        headshot_ratio (float): Ratio of headshots (0.0-1.0)
+        swap_time (float): Seconds to switch weapons
+        top_k (int, optional): Keep only the fastest k pairs
+
+    Returns:
+        list: (primary, secondary, ttk) sorted by ttk then names, or None if any input is invalid
+    """
+    guns = list(ttk_calculator.GUNS.keys()) if guns is None else list(guns)
+    if not swap_time >= 0:
+        return None
+    for gun_name in guns:
+        if ttk_calculator.get_validation_error(gun_name, shield_type, level, headshot_ratio) is not None:
+            return None
+
+    shield = ttk_calculator.SHIELDS[shield_type]
+    inputs = {gun_name: _gun_inputs(gun_name, level, headshot_ratio) for gun_name in guns}
+    results = [
+        (primary, secondary, _search((inputs[primary], inputs[secondary]), shield['shield_health'],
+                                     shield['shield_damage_reduction'], ttk_calculator.BASE_HEALTH,
+                                     swap_time)[0])
+        for primary, secondary in itertools.combinations_with_replacement(guns, 2)
+    ]
+    results.sort(key=lambda result: (result[2], result[0], result[1]))
+    return results if top_k is None else results[:top_k]
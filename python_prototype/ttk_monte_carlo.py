@@ -0,0 +1,140 @@
+"""
+Monte Carlo TTK engine with per-bullet hit/miss and headshot randomness.
+
+calculate_ttk blends headshots into an average damage per bullet. Here every
+bullet independently misses, hits the body or hits the head, using the same
+HEADSHOT_MULTIPLIERS, shield reduction and reload rules, so the result is a
+distribution of TTK rather than a single number. Trials are simulated with
+NumPy in blocks of bullets, many trials at a time. Requires NumPy.
+"""
+
+import numpy as np
+
+import ttk_calculator
+
+
+def _bullets_to_time(bullets_fired, firerate, mag_size, reload_time):
+    """Time of the n-th bullet under the calculator's fire/reload cadence (same as solve_ttk)."""
+    reloads = (bullets_fired - 1) // mag_size
+    bullet_intervals = bullets_fired - 1 - reloads
+    return bullet_intervals * (1.0 / firerate) + reloads * reload_time, reloads
+
+
+def _simulate_chunk(rng, trials, block_size, body_damage, head_damage, headshot_ratio, hit_ratio,
+                    shield_health, shield_damage_reduction):
+    """
+    Simulate `trials` independent fights and return the bullets fired in each.
+
+    Bullets are drawn `block_size` at a time for every unfinished trial; shield and
+    health after each bullet come from cumulative sums over the block, and trials
+    that survive the block carry their shield/health into the next one.
+    """
+    bullets_fired = np.zeros(trials, dtype=np.int64)
+    active = np.arange(trials)
+    shield = np.full(trials, float(shield_health))
+    health = np.full(trials, float(ttk_calculator.BASE_HEALTH))
+    fired_so_far = 0
+
+    while active.size:
+        shape = (active.size, block_size)
+        damage = np.where(rng.random(shape) < headshot_ratio, head_damage, body_damage)
+        if hit_ratio < 1.0:
+            damage = np.where(rng.random(shape) < hit_ratio, damage, 0.0)
+
+        # Shield before each bullet decides whether that bullet is reduced
+        shield_after = shield[:, None] - np.cumsum(damage, axis=1)
+        shield_before = np.concatenate([shield[:, None], shield_after[:, :-1]], axis=1)
+        health_damage = np.where(shield_before > 0, damage * (1 - shield_damage_reduction), damage)
+        health_after = health[:, None] - np.cumsum(health_damage, axis=1)
+
+        killed = health_after <= 0
+        done = killed.any(axis=1)
+        bullets_fired[active[done]] = fired_so_far + killed[done].argmax(axis=1) + 1
+
+        survivors = ~done
+        active = active[survivors]
+        shield = shield_after[survivors, -1]
+        health = health_after[survivors, -1]
+        fired_so_far += block_size
+
+    return bullets_fired
+
+
+def simulate_ttk_distribution(gun_name, shield_type='light', level=1, headshot_ratio=0.0, hit_ratio=1.0,
+                              trials=100000, seed=None, percentiles=(50, 90, 99), bins=50,
+                              chunk_size=16384):
+    """
+    Run a Monte Carlo TTK simulation for one configuration.
+
+    Each bullet hits with probability hit_ratio; a hit is a headshot with probability
+    headshot_ratio and deals damage * headshot multiplier, otherwise base damage.
+    Misses still use up ammo and time.
+
+    Args:
+        gun_name (str): Name of the gun
+        shield_type (str): Type of shield ('light', 'medium', or 'heavy')
+        level (int): Gun level (1-4)
+        headshot_ratio (float): Probability that a hit is a headshot (0.0-1.0)
+        hit_ratio (float): Probability that a bullet hits at all (0.0 exclusive - 1.0)
+        trials (int): Number of simulated fights
+        seed (int or numpy.random.SeedSequence, optional): Seed for reproducible results.
+            The same seed, trials and chunk_size always give the same output.
+        percentiles (tuple): Percentiles of TTK and bullets fired to report
+        bins (int): Number of TTK histogram bins
+        chunk_size (int): Trials simulated together; bounds peak memory
+
+    Returns:
+        dict: trials, mean/std/min/max TTK, 'ttk_percentiles' and 'bullets_percentiles'
+              ({percentile: value}), mean_reloads and 'histogram' ({'counts', 'bin_edges'})
+
+    Raises:
+        ValueError: If any input is invalid
+    """
+    error = ttk_calculator.get_validation_error(gun_name, shield_type, level, headshot_ratio)
+    if error is not None:
+        raise ValueError(error)
+    # Written so that NaN fails too
+    if not 0.0 <= headshot_ratio <= 1.0:
+        raise ValueError(f"Invalid headshot_ratio {headshot_ratio}. Must be between 0.0 and 1.0")
+    if not 0.0 < hit_ratio <= 1.0:
+        raise ValueError(f"Invalid hit_ratio {hit_ratio}. Must be greater than 0.0 and at most 1.0")
+    if trials < 1:
+        raise ValueError(f"Invalid trials {trials}. Must be at least 1")
+
+    store = ttk_calculator.GUN_STATS_STORE
+    gun_id = store.gun_id(gun_name)
+    body_damage, firerate, mag_size, reload_time = store.level_stats(gun_id, level)
+    head_damage = body_damage * store.headshot_multiplier[gun_id]
+    shield_health, shield_damage_reduction = store.shield_stats(store.shield_id(shield_type))
+
+    # Size blocks so that most trials finish in the first one: the all-body-shot
+    # bullet count, stretched for misses
+    _, body_bullets, _ = ttk_calculator.solve_ttk(body_damage, firerate, mag_size, reload_time,
+                                                  shield_health, shield_damage_reduction)
+    block_size = int(np.ceil(body_bullets / hit_ratio)) + 4
+
+    rng = np.random.default_rng(seed)
+    bullets_fired = np.empty(trials, dtype=np.int64)
+    for start in range(0, trials, chunk_size):
+        count = min(chunk_size, trials - start)
+        bullets_fired[start:start + count] = _simulate_chunk(
+            rng, count, block_size, body_damage, head_damage, headshot_ratio, hit_ratio,
+            shield_health, shield_damage_reduction
+        )
+
+    ttk, reloads = _bullets_to_time(bullets_fired, firerate, mag_size, reload_time)
+    counts, bin_edges = np.histogram(ttk, bins=bins)
+    return {
+        'trials': trials,
+        'mean_ttk': float(ttk.mean()),
+        'std_ttk': float(ttk.std()),
+        'min_ttk': float(ttk.min()),
+        'max_ttk': float(ttk.max()),
+        'ttk_percentiles': dict(zip(percentiles, np.percentile(ttk, percentiles).tolist())),
+        'bullets_percentiles': dict(zip(percentiles, np.percentile(bullets_fired, percentiles).tolist())),
+        'mean_reloads': float(reloads.mean()),
+        'histogram': {
+            'counts': counts,
+            'bin_edges': bin_edges
+        }
+    }
@@ -0,0 +1,123 @@
+"""
+TTK query records shared by the HTTP service and the batch CLI.
+
+A query record is a JSON object such as
+    {"gun": "kettle", "shield": "medium", "level": 4, "headshot_ratio": 0.3}
+where every field but "gun" falls back to the calculate_ttk defaults.
+parse_query validates a record and returns an error message instead of
+printing one; evaluate_queries solves many valid queries at once, with the
+NumPy batch engine when it is installed.
+"""
+
+import math
+
+import ttk_calculator
+
+QUERY_DEFAULTS = {
+    'shield': 'light',
+    'level': 1,
+    'headshot_ratio': 0.0
+}
+
+# Below this many queries the scalar solver is faster than building arrays
+MIN_BATCH_SIZE = 32
+
+_batch_engine = None
+
+
+def load_batch_engine():
+    """
+    Import the NumPy batch engine on first use.
+
+    NumPy dominates start-up time, so it is only imported once a batch is big
+    enough to need it. Long-running processes can call this up front.
+
+    Returns:
+        function: ttk_batch.calculate_ttk_batch, or None if NumPy is not installed
+    """
+    global _batch_engine
+    if _batch_engine is None:
+        try:
+            from ttk_batch import calculate_ttk_batch
+        except ImportError:  # NumPy not installed: solve queries one at a time
+            calculate_ttk_batch = False
+        _batch_engine = calculate_ttk_batch
+    return _batch_engine or None
+
+
+def parse_query(record):
+    """
+    Validate one query record.
+
+    Args:
+        record (dict): Query with 'gun' and optional 'shield', 'level', 'headshot_ratio'
+
+    Returns:
+        tuple: ((gun_name, shield_type, level, headshot_ratio), None) for a valid query,
+               or (None, error message) for an invalid one
+    """
+    if not isinstance(record, dict):
+        return None, f"Query must be a JSON object, got {type(record).__name__}"
+    if 'gun' not in record:
+        return None, "Missing required field 'gun'"
+
+    gun_name = record['gun']
+    shield_type = record.get('shield', QUERY_DEFAULTS['shield'])
+    level = record.get('level', QUERY_DEFAULTS['level'])
+    headshot_ratio = record.get('headshot_ratio', QUERY_DEFAULTS['headshot_ratio'])
+
+    if not isinstance(gun_name, str):
+        return None, f"Invalid gun name {gun_name!r}. Must be a string"
+    if not isinstance(shield_type, str):
+        return None, f"Invalid shield type {shield_type!r}. Must be a string"
+    if (isinstance(level, bool) or not isinstance(level, (int, float)) or not math.isfinite(level)
+            or level != int(level)):
+        return None, f"Invalid level {level!r}. Must be an integer between 1 and 4"
+    if (isinstance(headshot_ratio, bool) or not isinstance(headshot_ratio, (int, float))
+            or not math.isfinite(headshot_ratio)):
+        return None, f"Invalid headshot_ratio {headshot_ratio!r}. Must be a number between 0.0 and 1.0"
+
+    query = (gun_name, shield_type, int(level), float(headshot_ratio))
+    error = ttk_calculator.get_validation_error(*query)
+    if error is not None:
+        return None, error
+    return query, None
+
+
+def evaluate_queries(queries):
+    """
+    Solve many already-validated queries.
+
+    Args:
+        queries (list): (gun_name, shield_type, level, headshot_ratio) tuples from parse_query
+
+    Returns:
+        list: (ttk, bullets_fired, reloads) tuples in query order
+    """
+    calculate_ttk_batch = load_batch_engine() if len(queries) >= MIN_BATCH_SIZE else None
+    if calculate_ttk_batch is None:
+        return [ttk_calculator.solve_ttk_for_gun(*query) for query in queries]
+
+    guns, shield_types, levels, headshot_ratios = zip(*queries)
+    batch = calculate_ttk_batch(list(guns), list(shield_types), list(levels), list(headshot_ratios))
+    return list(zip(batch['ttk'].tolist(), batch['bullets_fired'].tolist(), batch['reloads'].tolist()))
+
+
+def result_record(query, solution):
+    """
+    JSON-ready result for a query.
+
+    Returns:
+        dict: The query fields plus ttk, bullets_fired and reloads
+    """
+    gun_name, shield_type, level, headshot_ratio = query
+    ttk, bullets_fired, reloads = solution
+    return {
+        'gun': gun_name,
+        'shield': shield_type,
+        'level': level,
+        'headshot_ratio': headshot_ratio,
+        'ttk': ttk,
+        'bullets_fired': bullets_fired,
+        'reloads': reloads
+    }
@@ -0,0 +1,184 @@
+"""
+Damage-over-time series for charting, many configurations at once.
+
+For each (gun, shield, level, headshot_ratio) configuration this produces the
+shield and health curves the way src/components/DamageChart.tsx draws them:
+one point for the undamaged target at time 0, then one point per shot.
+Rows are padded with NaN to a common length so a batch of configurations
+is one set of NumPy arrays. Requires NumPy.
+
+Shots are stepped column by column across every row at once, with the same
+float arithmetic as iter_damage_events. Shot times use solve_ttk's cadence.
+
+With max_points, each row is decimated to at most that many points. Key
+points are always kept: the start, the shot that breaks the shield, the last
+shot before each reload and the first shot after it (so each reload's flat
+segment stays exact), and the killing shot. Any remaining budget goes to
+evenly spaced shots in between. If the key points alone exceed the budget,
+reload points are thinned evenly, and with max_points=2 only the start and
+the kill remain.
+"""
+
+import numpy as np
+
+import ttk_calculator
+from ttk_batch import resolve_batch_inputs, solve_ttk_arrays
+
+# Bit flags in the 'events' array
+START = 1
+SHIELD_BREAK = 2
+RELOAD_START = 4
+RELOAD_END = 8
+DEATH = 16
+
+
+def _full_series(inputs, bullets_fired):
+    """
+    Undecimated points for flattened inputs.
+
+    Returns:
+        tuple: (time, shield_health, health, events) arrays of shape (rows, max bullets + 1)
+    """
+    rows = bullets_fired.size
+    columns = int(bullets_fired.max()) + 1
+    damage_per_bullet = inputs['damage_per_bullet']
+    shielded_damage = damage_per_bullet * (1 - inputs['shield_damage_reduction'])
+    mag_size = inputs['mag_size']
+
+    shield = np.empty((rows, columns))
+    health = np.empty((rows, columns))
+    events = np.zeros((rows, columns), dtype=np.uint8)
+    shield[:, 0] = inputs['shield_health']
+    health[:, 0] = ttk_calculator.BASE_HEALTH
+    events[:, 0] = START
+    current_shield = shield[:, 0].copy()
+    current_health = health[:, 0].copy()
+    for bullet in range(1, columns):
+        active = current_shield > 0
+        current_health = np.where(active, current_health - shielded_damage, current_health - damage_per_bullet)
+        current_shield = np.where(active, np.maximum(current_shield - damage_per_bullet, 0.0), current_shield)
+        shield[:, bullet] = current_shield
+        health[:, bullet] = current_health
+        events[:, bullet] |= np.where(active & (current_shield <= 0), SHIELD_BREAK, 0).astype(np.uint8)
+
+    bullet = np.arange(columns)
+    reloads = np.maximum(bullet - 1, 0) // mag_size[:, None]
+    time = (np.maximum(bullet - 1, 0) - reloads) * (1.0 / inputs['firerate'])[:, None] \
+        + reloads * inputs['reload_time'][:, None]
+
+    fired = bullets_fired[:, None]
+    in_series = bullet <= fired
+    events |= np.where((bullet % mag_size[:, None] == 0) & (bullet > 0) & (bullet < fired), RELOAD_START, 0) \
+        .astype(np.uint8)
+    events |= np.where(((bullet - 1) % mag_size[:, None] == 0) & (bullet > 1) & in_series, RELOAD_END, 0) \
+        .astype(np.uint8)
+    events |= np.where(bullet == fired, DEATH, 0).astype(np.uint8)
+    events[~in_series] = 0
+
+    time[~in_series] = np.nan
+    shield[~in_series] = np.nan
+    health = np.where(in_series, np.maximum(health, 0.0), np.nan)
+    return time, shield, health, events
+
+
+def _evenly(indices, count):
+    """Up to `count` entries of a sorted index array, evenly spaced and including both ends."""
+    if count <= 0:
+        return indices[:0]
+    if indices.size <= count:
+        return indices
+    return indices[np.unique(np.round(np.linspace(0, indices.size - 1, count)).astype(np.int64))]
+
+
+def decimation_indices(events, length, max_points):
+    """
+    Columns of one row to keep under a point budget.
+
+    Args:
+        events (np.ndarray): The row's event flags
+        length (int): Points in the row (the rest is padding)
+        max_points (int): Point budget, at least 2
+
+    Returns:
+        np.ndarray: Sorted column indices, at most max_points of them
+    """
+    if length <= max_points:
+        return np.arange(length)
+    events = events[:length]
+    essential = np.flatnonzero(events & (START | SHIELD_BREAK | DEATH))
+    if essential.size > max_points:
+        essential = essential[[0, -1]]
+    reload_points = np.setdiff1d(np.flatnonzero(events & (RELOAD_START | RELOAD_END)), essential, assume_unique=True)
+    kept = np.union1d(essential, _evenly(reload_points, max_points - essential.size))
+    others = np.setdiff1d(np.arange(length), kept, assume_unique=True)
+    return np.union1d(kept, _evenly(others, max_points - kept.size))
+
+
+def damage_series(guns, shield_types='light', levels=1, headshot_ratios=0.0, grid=False, max_points=None):
+    """
+    Shield and health over time for many configurations.
+
+    Args:
+        guns: Gun name or array-like of gun names
+        shield_types: Shield type or array-like of shield types
+        levels: Level or array-like of levels (1-4)
+        headshot_ratios: Ratio or array-like of ratios (0.0-1.0)
+        grid (bool): Treat the inputs as axes of a cartesian grid, as in calculate_ttk_batch
+        max_points (int, optional): Cap on points per configuration (at least 2)
+
+    Returns:
+        dict: 'time', 'shield_health' and 'health' (float64, NaN padded; health is clamped
+              at 0) and 'events' (uint8 flags: START, SHIELD_BREAK, RELOAD_START, RELOAD_END,
+              DEATH; 0 for padding), all shaped (*configurations, points); 'length' (int64
+              points per configuration); and 'ttk', 'bullets_fired', 'reloads' as in
+              calculate_ttk_batch
+
+    Raises:
+        ValueError: If any input is invalid or max_points is below 2
+    """
+    if max_points is not None and max_points < 2:
+        raise ValueError(f"Invalid max_points {max_points}. Must be at least 2")
+
+    inputs = resolve_batch_inputs(guns, shield_types, levels, headshot_ratios, grid)
+    shape = np.broadcast_shapes(*(np.shape(values) for values in inputs.values()))
+    inputs = {name: np.broadcast_to(values, shape).ravel() for name, values in inputs.items()}
+    ttk, bullets_fired, reloads = solve_ttk_arrays(
+        inputs['damage_per_bullet'],
+        inputs['firerate'],
+        inputs['mag_size'],
+        inputs['reload_time'],
+        inputs['shield_health'],
+        inputs['shield_damage_reduction']
+    )
+
+    if bullets_fired.size:
+        time, shield, health, events = _full_series(inputs, bullets_fired)
+    else:
+        time = shield = health = np.empty((0, 1))
+        events = np.empty((0, 1), dtype=np.uint8)
+    length = bullets_fired + 1
+
+    if max_points is not None and length.size and length.max() > max_points:
+        # Rows already within the budget are copied as they are; only longer rows are decimated
+        series = {'time': time[:, :max_points].copy(), 'shield_health': shield[:, :max_points].copy(),
+                  'health': health[:, :max_points].copy(), 'events': events[:, :max_points].copy()}
+        full = {'time': time, 'shield_health': shield, 'health': health, 'events': events}
+        for row in np.flatnonzero(length > max_points):
+            keep = decimation_indices(events[row], int(length[row]), max_points)
+            for name, values in full.items():
+                series[name][row, :keep.size] = values[row, keep]
+                series[name][row, keep.size:] = 0 if name == 'events' else np.nan
+            length[row] = keep.size
+        time, shield, health, events = (series['time'], series['shield_health'], series['health'],
+                                        series['events'])
+
+    return {
+        'time': time.reshape(shape + time.shape[-1:]),
+        'shield_health': shield.reshape(shape + shield.shape[-1:]),
+        'health': health.reshape(shape + health.shape[-1:]),
+        'events': events.reshape(shape + events.shape[-1:]),
+        'length': length.reshape(shape),
+        'ttk': ttk.reshape(shape),
+        'bullets_fired': bullets_fired.reshape(shape),
+        'reloads': reloads.reshape(shape)
+    }
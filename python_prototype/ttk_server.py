@@ -0,0 +1,386 @@
+"""
+Local asyncio JSON HTTP service for TTK queries.
+
+Keeps the calculator loaded in one process so clients don't pay the import
+and data build on every query. Concurrent TTK queries that arrive within a
+few milliseconds of each other are gathered into one vectorized evaluation
+(ttk_queries.evaluate_queries), with a TTKCache of results in front.
+
+Endpoints:
+    POST /ttk      {"gun", "shield", "level", "headshot_ratio"}  -> result
+                   {"queries": [query, ...]}                     -> {"results": [...]}
+    POST /rank     {"level", "headshot_ratio", "shield", "guns"?, "top_k"?} -> {"rankings": [...]}
+                   {"scenarios": [scenario, ...], "guns"?, "top_k"?}      -> {"rankings": [...]}
+    GET  /metrics  request counts, latency percentiles, throughput, batching and cache stats
+    GET  /health   {"status": "ok", "data_version": ...}
+
+Usage:
+    python ttk_server.py --port 8765 --batch-window-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, OrderedDict, deque
+from http import HTTPStatus
+
+import ttk_calculator
+from ttk_cache import TTKCache
+from ttk_queries import QUERY_DEFAULTS, evaluate_queries, load_batch_engine, parse_query, result_record
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+ENDPOINTS = ('/ttk', '/rank', '/metrics', '/health')
+
+
+class ServerMetrics:
+    """
+    Request, latency and batching counters for /metrics.
+
+    Args:
+        window (int): Number of most recent request latencies kept for percentiles
+        rate_window (float): Seconds of recent requests used for the current throughput
+    """
+
+    def __init__(self, window=10000, rate_window=10.0):
+        self.started = time.monotonic()
+        self.rate_window = rate_window
+        self.requests = Counter()
+        self.errors = Counter()
+        self.queries = 0
+        self.batches = 0
+        self.batched_queries = 0
+        self.max_batch_size = 0
+        self._latencies = deque(maxlen=window)
+
+    def record_request(self, endpoint, status, seconds):
+        self.requests[endpoint] += 1
+        if status >= 400:
+            self.errors[endpoint] += 1
+        self._latencies.append((time.monotonic(), seconds))
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.batched_queries += size
+        self.max_batch_size = max(self.max_batch_size, size)
+
+    def snapshot(self, cache_stats):
+        """
+        Returns:
+            dict: JSON-ready metrics
+        """
+        now = time.monotonic()
+        uptime = now - self.started
+        latencies = sorted(seconds for _, seconds in self._latencies)
+        recent = sum(1 for finished, _ in self._latencies if finished >= now - self.rate_window)
+        total_requests = sum(self.requests.values())
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1e3
+
+        return {
+            'uptime_s': uptime,
+            'requests': dict(self.requests),
+            'errors': dict(self.errors),
+            'queries': self.queries,
+            'throughput': {
+                'requests_per_s': total_requests / uptime if uptime else 0.0,
+                'queries_per_s': self.queries / uptime if uptime else 0.0,
+                'recent_requests_per_s': recent / min(self.rate_window, uptime) if uptime else 0.0
+            },
+            'latency_ms': {
+                'samples': len(latencies),
+                'mean': sum(latencies) / len(latencies) * 1e3 if latencies else None,
+                'p50': percentile(50),
+                'p90': percentile(90),
+                'p99': percentile(99),
+                'max': latencies[-1] * 1e3 if latencies else None
+            },
+            'batching': {
+                'batches': self.batches,
+                'mean_batch_size': self.batched_queries / self.batches if self.batches else 0.0,
+                'max_batch_size': self.max_batch_size
+            },
+            'cache': cache_stats
+        }
+
+
+class TTKServer:
+    """
+    Request handling, micro-batching and caching behind the HTTP endpoints.
+
+    Args:
+        batch_window (float): Seconds to wait for more queries before evaluating a batch
+        max_batch (int): Evaluate immediately once this many queries are waiting
+        cache_size (int): Maximum cached query results
+        rank_cache_size (int): Maximum cached /rank responses
+    """
+
+    def __init__(self, batch_window=0.002, max_batch=4096, cache_size=65536, rank_cache_size=1024):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache = TTKCache(cache_size)
+        self.metrics = ServerMetrics()
+        self.rank_cache_size = rank_cache_size
+        self._rank_cache = OrderedDict()
+        self._rank_cache_version = ttk_calculator.DATA_VERSION
+        self._pending = []
+        self._flush_handle = None
+
+    async def solve(self, queries):
+        """
+        Solve validated queries through the cache and the micro-batcher.
+
+        Returns:
+            list: (ttk, bullets_fired, reloads) tuples in query order
+        """
+        loop = asyncio.get_running_loop()
+        solutions = [None] * len(queries)
+        waiting = []
+        for position, query in enumerate(queries):
+            cached = self.cache.get('solve', *query)
+            if cached is not None:
+                solutions[position] = cached
+            else:
+                future = loop.create_future()
+                self._pending.append((query, future))
+                waiting.append((position, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._pending and self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        for position, future in waiting:
+            solutions[position] = await future
+        self.metrics.queries += len(queries)
+        return solutions
+
+    def _flush(self):
+        """Evaluate every waiting query as one batch and resolve their futures."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        unique = list(dict.fromkeys(query for query, _ in pending))
+        self.metrics.record_batch(len(unique))
+        try:
+            solved = dict(zip(unique, evaluate_queries(unique)))
+        except Exception as error:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for query, solution in solved.items():
+            self.cache.put('solve', *query, solution)
+        for query, future in pending:
+            if not future.done():
+                future.set_result(solved[query])
+
+    async def handle_ttk(self, body):
+        if isinstance(body, dict) and 'queries' in body:
+            records = body['queries']
+            if not isinstance(records, list):
+                return HTTPStatus.BAD_REQUEST, {'error': "'queries' must be a list"}
+            parsed = [parse_query(record) for record in records]
+            valid = [query for query, _ in parsed if query is not None]
+            solutions = iter(await self.solve(valid))
+            results = [
+                result_record(query, next(solutions)) if query is not None else {'error': error}
+                for query, error in parsed
+            ]
+            return HTTPStatus.OK, {'results': results}
+
+        query, error = parse_query(body)
+        if query is None:
+            return HTTPStatus.BAD_REQUEST, {'error': error}
+        (solution,) = await self.solve([query])
+        return HTTPStatus.OK, result_record(query, solution)
+
+    def _ranking(self, scenario, guns, top_k):
+        """rank_guns for one scenario, through the /rank response cache."""
+        if self._rank_cache_version != ttk_calculator.DATA_VERSION:
+            self._rank_cache.clear()
+            self._rank_cache_version = ttk_calculator.DATA_VERSION
+
+        key = (scenario, guns, top_k)
+        if key in self._rank_cache:
+            self._rank_cache.move_to_end(key)
+            return self._rank_cache[key]
+
+        ranking = ttk_calculator.rank_guns([scenario], guns, top_k)[scenario]
+        self._rank_cache[key] = ranking
+        if len(self._rank_cache) > self.rank_cache_size:
+            self._rank_cache.popitem(last=False)
+        return ranking
+
+    async def handle_rank(self, body):
+        if not isinstance(body, dict):
+            return HTTPStatus.BAD_REQUEST, {'error': "Body must be a JSON object"}
+        guns = body.get('guns')
+        top_k = body.get('top_k')
+        if guns is not None and (not isinstance(guns, list) or not all(isinstance(gun, str) for gun in guns)):
+            return HTTPStatus.BAD_REQUEST, {'error': "'guns' must be a list of gun names"}
+        if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1):
+            return HTTPStatus.BAD_REQUEST, {'error': "'top_k' must be a positive integer"}
+
+        scenarios = body['scenarios'] if 'scenarios' in body else [body]
+        if not isinstance(scenarios, list):
+            return HTTPStatus.BAD_REQUEST, {'error': "'scenarios' must be a list"}
+
+        rankings = []
+        for scenario in scenarios:
+            # Validate the scenario itself with any known gun, so unknown guns in 'guns' are skipped
+            probe = dict(scenario, gun=next(iter(ttk_calculator.GUNS))) if isinstance(scenario, dict) else scenario
+            query, error = parse_query(probe)
+            if query is None:
+                rankings.append({'error': error})
+                continue
+            _, shield_type, level, headshot_ratio = query
+            ranking = self._ranking((level, headshot_ratio, shield_type),
+                                    tuple(guns) if guns is not None else None, top_k)
+            rankings.append({
+                'shield': shield_type,
+                'level': level,
+                'headshot_ratio': headshot_ratio,
+                'guns': ranking
+            })
+        return HTTPStatus.OK, {'rankings': rankings}
+
+    async def dispatch(self, method, path, body_bytes):
+        """
+        Route one request.
+
+        Returns:
+            tuple: (HTTPStatus, JSON-ready payload)
+        """
+        routes = {
+            '/ttk': ('POST', self.handle_ttk),
+            '/rank': ('POST', self.handle_rank),
+            '/metrics': ('GET', None),
+            '/health': ('GET', None)
+        }
+        if path not in routes:
+            return HTTPStatus.NOT_FOUND, {'error': f"Unknown path {path}"}
+        allowed, handler = routes[path]
+        if method != allowed:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"{path} only accepts {allowed}"}
+
+        if path == '/metrics':
+            return HTTPStatus.OK, self.metrics.snapshot(self.cache.stats())
+        if path == '/health':
+            return HTTPStatus.OK, {'status': 'ok', 'data_version': ttk_calculator.DATA_VERSION}
+
+        try:
+            body = json.loads(body_bytes) if body_bytes else {}
+        except ValueError as error:
+            return HTTPStatus.BAD_REQUEST, {'error': f"Invalid JSON: {error}"}
+        return await handler(body)
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection, keeping it alive between requests."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0
+                                        else HTTPStatus.BAD_REQUEST,
+                                        {'error': "Invalid or too large Content-Length"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                start = time.perf_counter()
+                path = target.split('?', 1)[0]
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except Exception as error:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)}
+                await self._respond(writer, status, payload, keep_alive)
+                self.metrics.record_request(path if path in ENDPOINTS else 'other', status,
+                                            time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(host='127.0.0.1', port=8765, **options):
+    """
+    Run the service until cancelled.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind
+        **options: Passed to TTKServer
+    """
+    # Long-lived process: pay for loading up front instead of on the first request
+    ttk_calculator.ensure_loaded()
+    load_batch_engine()
+    server = TTKServer(**options)
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"Serving TTK queries on http://{host}:{port} "
+          f"(data version {ttk_calculator.DATA_VERSION[:12]}, defaults {QUERY_DEFAULTS})")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve TTK queries over local HTTP")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="Port to bind (default: 8765)")
+    parser.add_argument('--batch-window-ms', type=float, default=2.0,
+                        help="Milliseconds to gather concurrent queries into one batch (default: 2)")
+    parser.add_argument('--max-batch', type=int, default=4096,
+                        help="Evaluate a batch as soon as this many queries are waiting (default: 4096)")
+    parser.add_argument('--cache-size', type=int, default=65536, help="Cached query results (default: 65536)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, batch_window=args.batch_window_ms / 1000,
+                          max_batch=args.max_batch, cache_size=args.cache_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Persistent SQLite store of TTK results for ad-hoc filter queries.
+
+Holds TTK, bullets fired and reloads for every (gun, shield, level) at each
+headshot ratio on a fixed grid (0.01 steps by default), next to the per-level
+gun stats they were computed from. Questions like "every gun under 1.5s
+against heavy at level 4 with 30% headshots" are then one indexed query
+instead of a print_all_guns_ranked run:
+
+    python ttk_store.py refresh
+    python ttk_store.py query --shield heavy --level 4 --headshot-ratio 0.3 --max-ttk 1.5
+
+Each (gun, shield, level) config row records an input hash of everything its
+results depend on and the DATA_VERSION it was computed at. refresh() only
+recomputes and upserts configs whose hash changed, and deletes configs that
+no longer exist (e.g. a removed gun).
+
+Headshot ratios are stored as integer grid steps (headshot_step / ratio_steps),
+so equality lookups don't depend on float formatting; query() snaps the
+requested ratio to the nearest step.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+
+import ttk_calculator
+from ttk_queries import evaluate_queries
+
+# Override with TTK_RESULTS_DB
+DEFAULT_DB_PATH = os.environ.get(
+    'TTK_RESULTS_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ttk_results.sqlite')
+)
+STORE_FORMAT = 1
+LEVELS = [1, 2, 3, 4]
+DEFAULT_RATIO_STEPS = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS configs (
+    gun TEXT NOT NULL,
+    shield TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    damage REAL NOT NULL,
+    fire_rate REAL NOT NULL,
+    mag_size INTEGER NOT NULL,
+    reload_time REAL NOT NULL,
+    headshot_multiplier REAL NOT NULL,
+    input_hash TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    PRIMARY KEY (gun, shield, level)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS results (
+    gun TEXT NOT NULL,
+    shield TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    headshot_step INTEGER NOT NULL,
+    headshot_ratio REAL NOT NULL,
+    ttk REAL NOT NULL,
+    bullets_fired INTEGER NOT NULL,
+    reloads INTEGER NOT NULL,
+    PRIMARY KEY (gun, shield, level, headshot_step)
+) WITHOUT ROWID;
+-- Filter queries fix shield, level and headshot ratio and range over ttk
+CREATE INDEX IF NOT EXISTS results_by_scenario ON results (shield, level, headshot_step, ttk);
+"""
+
+
+def config_input_hash(gun_name, shield_type, level, ratio_steps):
+    """
+    Hash of everything one (gun, shield, level) config's results are computed from.
+
+    Returns:
+        str: Hex digest that changes when any of its results could change
+    """
+    payload = json.dumps({
+        'format': STORE_FORMAT,
+        'stats': ttk_calculator.GUN_STATS_BY_LEVEL[gun_name][level],
+        'headshot_multiplier': ttk_calculator.HEADSHOT_MULTIPLIERS.get(gun_name, 1.0),
+        'shield': ttk_calculator.SHIELDS[shield_type],
+        'base_health': ttk_calculator.BASE_HEALTH,
+        'ratio_steps': ratio_steps
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TTKStore:
+    """
+    SQLite database of precomputed TTK results.
+
+    Args:
+        path (str): Database file, created if missing (':memory:' for a throwaway store)
+        ratio_steps (int, optional): Headshot ratio grid intervals. Defaults to the grid the
+            database was built with (100 for a new one); a different grid recomputes every
+            config on the next refresh
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, ratio_steps=None):
+        if ratio_steps is not None and ratio_steps < 1:
+            raise ValueError(f"ratio_steps must be at least 1, got {ratio_steps}")
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        if ratio_steps is None:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'ratio_steps'").fetchone()
+            ratio_steps = int(row['value']) if row else DEFAULT_RATIO_STEPS
+        self.ratio_steps = ratio_steps
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def data_version(self):
+        """
+        DATA_VERSION of the last refresh of every gun, or None if there has been none.
+
+        Refreshing a subset of guns doesn't change it, since the other guns may still be stale.
+        """
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+        return row['value'] if row else None
+
+    def refresh(self, guns=None, force=False):
+        """
+        Bring the store up to date with the current data tables.
+
+        Args:
+            guns (list, optional): Gun names, defaults to every gun in GUNS (ignored when the
+                store's ratio grid changes, which refreshes every gun)
+            force (bool): Recompute every config even if its inputs are unchanged
+
+        Returns:
+            dict: 'updated' and 'unchanged' counts of configs, 'removed' count of configs
+                  dropped because they no longer exist, and 'rows' result rows written
+        """
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'ratio_steps'").fetchone()
+        if row is not None and int(row['value']) != self.ratio_steps:
+            # The whole store shares one grid, so a new grid means refreshing every gun
+            guns = None
+        gun_names = list(ttk_calculator.GUNS.keys()) if guns is None else list(guns)
+        configs = [(gun_name, shield_type, level)
+                   for gun_name in gun_names for shield_type in ttk_calculator.SHIELDS for level in LEVELS]
+        stored = {
+            (row['gun'], row['shield'], row['level']): row['input_hash']
+            for row in self.connection.execute("SELECT gun, shield, level, input_hash FROM configs")
+        }
+
+        hashes = {config: config_input_hash(*config, self.ratio_steps) for config in configs}
+        changed = [config for config in configs if force or stored.get(config) != hashes[config]]
+        removed = [config for config in stored if config not in hashes] if guns is None else []
+
+        ratios = [step / self.ratio_steps for step in range(self.ratio_steps + 1)]
+        solutions = iter(evaluate_queries([config + (ratio,) for config in changed for ratio in ratios]))
+        data_version = ttk_calculator.DATA_VERSION
+        rows = 0
+        with self.connection:
+            for gun_name, shield_type, level in removed:
+                self.connection.execute("DELETE FROM configs WHERE gun = ? AND shield = ? AND level = ?",
+                                        (gun_name, shield_type, level))
+                self.connection.execute("DELETE FROM results WHERE gun = ? AND shield = ? AND level = ?",
+                                        (gun_name, shield_type, level))
+
+            for config in changed:
+                gun_name, shield_type, level = config
+                stats = ttk_calculator.GUN_STATS_BY_LEVEL[gun_name][level]
+                self.connection.execute(
+                    """
+                    INSERT INTO configs (gun, shield, level, damage, fire_rate, mag_size, reload_time,
+                                         headshot_multiplier, input_hash, data_version)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (gun, shield, level) DO UPDATE SET
+                        damage = excluded.damage, fire_rate = excluded.fire_rate,
+                        mag_size = excluded.mag_size, reload_time = excluded.reload_time,
+                        headshot_multiplier = excluded.headshot_multiplier,
+                        input_hash = excluded.input_hash, data_version = excluded.data_version
+                    """,
+                    (gun_name, shield_type, level, stats['damage'], stats['fire_rate'], stats['mag_size'],
+                     stats['reload_time'], ttk_calculator.HEADSHOT_MULTIPLIERS.get(gun_name, 1.0),
+                     hashes[config], data_version)
+                )
+                # A changed ratio grid leaves steps the new grid doesn't overwrite
+                self.connection.execute(
+                    "DELETE FROM results WHERE gun = ? AND shield = ? AND level = ? AND headshot_step > ?",
+                    (gun_name, shield_type, level, self.ratio_steps))
+                self.connection.executemany(
+                    """
+                    INSERT INTO results (gun, shield, level, headshot_step, headshot_ratio,
+                                         ttk, bullets_fired, reloads)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (gun, shield, level, headshot_step) DO UPDATE SET
+                        headshot_ratio = excluded.headshot_ratio, ttk = excluded.ttk,
+                        bullets_fired = excluded.bullets_fired, reloads = excluded.reloads
+                    """,
+                    [(gun_name, shield_type, level, step, ratio) + tuple(next(solutions))
+                     for step, ratio in enumerate(ratios)]
+                )
+                rows += len(ratios)
+
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('ratio_steps', ?)",
+                                    (str(self.ratio_steps),))
+            if guns is None:
+                self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('data_version', ?)",
+                                        (data_version,))
+
+        return {
+            'updated': len(changed),
+            'unchanged': len(configs) - len(changed),
+            'removed': len(removed),
+            'rows': rows
+        }
+
+    def headshot_step(self, headshot_ratio):
+        """Nearest grid step for a headshot ratio."""
+        if not 0.0 <= headshot_ratio <= 1.0:
+            raise ValueError(f"Invalid headshot_ratio {headshot_ratio}. Must be between 0.0 and 1.0")
+        return round(headshot_ratio * self.ratio_steps)
+
+    def query(self, shield_type, level, headshot_ratio=0.0, max_ttk=None, min_ttk=None, guns=None, limit=None):
+        """
+        Results for one scenario, fastest first.
+
+        Args:
+            shield_type (str): Type of shield
+            level (int): Gun level (1-4)
+            headshot_ratio (float): Headshot ratio, snapped to the store's grid
+            max_ttk (float, optional): Only results with ttk <= max_ttk
+            min_ttk (float, optional): Only results with ttk >= min_ttk
+            guns (list, optional): Only these guns
+            limit (int, optional): At most this many rows
+
+        Returns:
+            list: Dicts with gun, shield, level, headshot_ratio, ttk, bullets_fired, reloads,
+                  the gun's damage, fire_rate, mag_size, reload_time and headshot_multiplier
+                  at that level, and the data_version the row was computed at
+        """
+        sql = """
+            SELECT r.gun, r.shield, r.level, r.headshot_ratio, r.ttk, r.bullets_fired, r.reloads,
+                   c.damage, c.fire_rate, c.mag_size, c.reload_time, c.headshot_multiplier, c.data_version
+            FROM results r JOIN configs c ON c.gun = r.gun AND c.shield = r.shield AND c.level = r.level
+            WHERE r.shield = ? AND r.level = ? AND r.headshot_step = ?
+        """
+        params = [shield_type, level, self.headshot_step(headshot_ratio)]
+        if max_ttk is not None:
+            sql += " AND r.ttk <= ?"
+            params.append(max_ttk)
+        if min_ttk is not None:
+            sql += " AND r.ttk >= ?"
+            params.append(min_ttk)
+        if guns is not None:
+            guns = list(guns)
+            sql += f" AND r.gun IN ({', '.join('?' * len(guns))})"
+            params.extend(guns)
+        sql += " ORDER BY r.ttk, r.gun"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+
+def print_query_results(rows):
+    """Print query() rows as a table in the style of print_all_guns_ranked."""
+    if not rows:
+        print("No matching results")
+        return
+    print(f"{'Rank':<6} {'Gun':<15} {'TTK (s)':<12} {'Bullets':<10} {'Reloads':<10} {'Damage':<10} {'Fire Rate':<10}")
+    print("-" * 80)
+    for rank, row in enumerate(rows, 1):
+        print(f"{rank:<6} {row['gun']:<15} {row['ttk']:<12.3f} {row['bullets_fired']:<10} {row['reloads']:<10} "
+              f"{row['damage']:<10.1f} {row['fire_rate']:<10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Persistent SQLite store of TTK results")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="Database file (default: ttk_results.sqlite)")
+    parser.add_argument('--ratio-steps', type=int,
+                        help="Headshot ratio grid intervals (default: the database's, or 100)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    refresh_parser = commands.add_parser('refresh', help="Recompute configs whose inputs changed")
+    refresh_parser.add_argument('--force', action='store_true', help="Recompute every config")
+
+    query_parser = commands.add_parser('query', help="List results for one scenario, fastest first")
+    query_parser.add_argument('--shield', required=True, help="Shield type")
+    query_parser.add_argument('--level', type=int, required=True, help="Gun level (1-4)")
+    query_parser.add_argument('--headshot-ratio', type=float, default=0.0, help="Headshot ratio (0.0-1.0)")
+    query_parser.add_argument('--max-ttk', type=float, help="Only results with TTK <= this")
+    query_parser.add_argument('--min-ttk', type=float, help="Only results with TTK >= this")
+    query_parser.add_argument('--gun', action='append', dest='guns', help="Only this gun (repeatable)")
+    query_parser.add_argument('--limit', type=int, help="At most this many rows")
+    query_parser.add_argument('--json', action='store_true', help="Print JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    with TTKStore(args.db, args.ratio_steps) as store:
+        if args.command == 'refresh':
+            summary = store.refresh(force=args.force)
+            print(f"{summary['updated']} configs updated ({summary['rows']} rows), {summary['unchanged']} unchanged, "
+                  f"{summary['removed']} removed -> {args.db}")
+            return 0
+
+        if store.data_version() is None:
+            print(f"Error: {args.db} has not been refreshed for every gun; run `python ttk_store.py refresh` "
+                  f"first", file=sys.stderr)
+            return 1
+        if store.data_version() != ttk_calculator.DATA_VERSION:
+            print(f"Warning: {args.db} was built from data version {store.data_version()[:12]}, "
+                  f"current is {ttk_calculator.DATA_VERSION[:12]}; run refresh to update", file=sys.stderr)
+        rows = store.query(args.shield, args.level, args.headshot_ratio, args.max_ttk, args.min_ttk,
+                           args.guns, args.limit)
+        if args.json:
+            for row in rows:
+                print(json.dumps(row))
+        else:
+            print_query_results(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Parallel parameter sweeps over guns x shields x levels x headshot ratios.
+
+The grid is split into fixed-size chunks of consecutive rows and evaluated on
+a concurrent.futures process pool. Each worker receives the data tables once
+at start-up, and every Monte Carlo row is seeded from (seed, row index), so the
+output is bit-identical for any worker count or chunk size. Requires NumPy.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import ttk_calculator
+from ttk_batch import calculate_ttk_batch
+from ttk_monte_carlo import simulate_ttk_distribution
+
+DEFAULT_HEADSHOT_RATIOS = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def _data_snapshot():
+    """The data tables a worker needs to rebuild the calculator state."""
+    return {
+        'GUNS': ttk_calculator.GUNS,
+        'SHIELDS': ttk_calculator.SHIELDS,
+        'HEADSHOT_MULTIPLIERS': ttk_calculator.HEADSHOT_MULTIPLIERS,
+        'GUN_UPGRADES': ttk_calculator.GUN_UPGRADES,
+        'BASE_HEALTH': ttk_calculator.BASE_HEALTH
+    }
+
+
+def _init_worker(snapshot):
+    """Process pool initializer: install the parent's data tables once per worker."""
+    for name, value in snapshot.items():
+        setattr(ttk_calculator, name, value)
+    ttk_calculator.calculate_gun_stats_by_level()
+
+
+def _evaluate_chunk(task):
+    """
+    Evaluate one chunk of grid rows.
+
+    Args:
+        task (tuple): (first_row_index, rows, options) where rows is a list of
+            (gun, shield_type, level, headshot_ratio) tuples
+
+    Returns:
+        dict: Result arrays for the chunk, in row order
+    """
+    first_row_index, rows, options = task
+    guns, shield_types, levels, headshot_ratios = zip(*rows)
+    results = calculate_ttk_batch(list(guns), list(shield_types), list(levels), list(headshot_ratios))
+
+    trials = options['monte_carlo_trials']
+    if trials:
+        percentiles = (50, 90)
+        mc_p50 = np.empty(len(rows))
+        mc_p90 = np.empty(len(rows))
+        for offset, (gun_name, shield_type, level, headshot_ratio) in enumerate(rows):
+            row_seed = np.random.SeedSequence(options['seed'], spawn_key=(first_row_index + offset,))
+            distribution = simulate_ttk_distribution(
+                gun_name, shield_type, level, headshot_ratio,
+                hit_ratio=options['hit_ratio'], trials=trials, seed=row_seed, percentiles=percentiles
+            )
+            mc_p50[offset] = distribution['ttk_percentiles'][50]
+            mc_p90[offset] = distribution['ttk_percentiles'][90]
+        results['mc_p50_ttk'] = mc_p50
+        results['mc_p90_ttk'] = mc_p90
+    return results
+
+
+def run_sweep(guns=None, shield_types=None, levels=(1, 2, 3, 4), headshot_ratios=DEFAULT_HEADSHOT_RATIOS,
+              monte_carlo_trials=0, hit_ratio=1.0, seed=0, workers=None, chunk_size=256):
+    """
+    Sweep the full gun x shield x level x headshot-ratio grid.
+
+    Args:
+        guns (list, optional): Gun names, defaults to every gun in GUNS
+        shield_types (list, optional): Shield types, defaults to every shield in SHIELDS
+        levels (iterable): Levels to include
+        headshot_ratios (iterable): Headshot ratios to include
+        monte_carlo_trials (int): If > 0, also run simulate_ttk_distribution per row and
+            report P50/P90 TTK
+        hit_ratio (float): Hit probability for the Monte Carlo rows
+        seed (int): Base seed; row i uses SeedSequence(seed, spawn_key=(i,))
+        workers (int, optional): Worker processes, defaults to os.cpu_count().
+            1 evaluates in-process without a pool.
+        chunk_size (int): Grid rows per task
+
+    Returns:
+        dict: 'gun', 'shield_type', 'level', 'headshot_ratio' columns plus 'ttk',
+              'bullets_fired', 'reloads' (and 'mc_p50_ttk', 'mc_p90_ttk' with Monte Carlo)
+              as NumPy arrays, in grid order (gun-major, headshot ratio fastest)
+    """
+    guns = list(ttk_calculator.GUNS.keys()) if guns is None else list(guns)
+    shield_types = list(ttk_calculator.SHIELDS.keys()) if shield_types is None else list(shield_types)
+    rows = list(itertools.product(guns, shield_types, levels, headshot_ratios))
+    if not rows:
+        raise ValueError("Sweep grid is empty")
+
+    options = {
+        'monte_carlo_trials': monte_carlo_trials,
+        'hit_ratio': hit_ratio,
+        'seed': seed
+    }
+    tasks = [(start, rows[start:start + chunk_size], options) for start in range(0, len(rows), chunk_size)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        chunk_results = [_evaluate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_init_worker,
+                                 initargs=(_data_snapshot(),)) as executor:
+            # map() yields results in submission order, so the merge below is ordered
+            chunk_results = list(executor.map(_evaluate_chunk, tasks))
+
+    gun_column, shield_column, level_column, ratio_column = zip(*rows)
+    merged = {
+        'gun': np.array(gun_column),
+        'shield_type': np.array(shield_column),
+        'level': np.array(level_column),
+        'headshot_ratio': np.array(ratio_column, dtype=np.float64)
+    }
+    for key in chunk_results[0]:
+        merged[key] = np.concatenate([np.atleast_1d(chunk[key]) for chunk in chunk_results])
+    return merged
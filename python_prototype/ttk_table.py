@@ -0,0 +1,244 @@
+"""
+Precomputed TTK lookup table shared through a memory-mapped file.
+
+build_ttk_table evaluates every gun x shield x level over a fixed headshot-ratio
+grid once and writes the results as a dense float64 tensor. TTKTable maps that
+file read-only, so any number of worker processes share the same pages instead
+of each re-running the simulation.
+
+File layout:
+    8 bytes   magic b'TTKTBL1\\0'
+    4 bytes   little-endian uint32 header length
+    N bytes   UTF-8 JSON header (guns, shields, levels, ratio_steps, fields, data_version,
+              and the solver inputs the table was built from: per-gun headshot multiplier
+              and level stats, per-shield stats and base health)
+    padding   zero bytes up to an 8-byte boundary
+    tensor    float64, C order, shape (guns, shields, levels, ratio_steps + 1, fields)
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+
+import ttk_calculator
+
+MAGIC = b'TTKTBL1\0'
+FIELDS = ['ttk', 'bullets_fired', 'reloads']
+LEVELS = [1, 2, 3, 4]
+
+
+def build_ttk_table(path, ratio_steps=1000):
+    """
+    Evaluate all gun/shield/level combinations over a headshot-ratio grid and write them to path.
+
+    The grid is headshot_ratio = i / ratio_steps for i in 0..ratio_steps. The file is
+    written to a temporary name and renamed into place, so readers never see a
+    partially written table.
+
+    Args:
+        path (str): Output file path
+        ratio_steps (int): Number of grid intervals between 0.0 and 1.0 (1000 = 0.001 steps)
+
+    Returns:
+        str: The path written
+    """
+    import numpy as np
+    from ttk_batch import calculate_ttk_batch
+
+    guns = list(ttk_calculator.GUNS.keys())
+    shields = list(ttk_calculator.SHIELDS.keys())
+    ratios = np.arange(ratio_steps + 1) / ratio_steps
+
+    results = calculate_ttk_batch(guns, shields, LEVELS, ratios, grid=True)
+    tensor = np.stack([results[field].astype(np.float64) for field in FIELDS], axis=-1)
+
+    store = ttk_calculator.GUN_STATS_STORE
+    header = json.dumps({
+        'guns': guns,
+        'shields': shields,
+        'levels': LEVELS,
+        'ratio_steps': ratio_steps,
+        'fields': FIELDS,
+        'data_version': ttk_calculator.DATA_VERSION,
+        'inputs': {
+            'headshot_multiplier': [store.headshot_multiplier[store.gun_id(gun_name)] for gun_name in guns],
+            'level_stats': [[list(store.level_stats(store.gun_id(gun_name), level)) for level in LEVELS]
+                            for gun_name in guns],
+            'shield_stats': [list(store.shield_stats(store.shield_id(shield_type))) for shield_type in shields],
+            'base_health': ttk_calculator.BASE_HEALTH
+        }
+    }).encode('utf-8')
+    prefix_length = len(MAGIC) + 4 + len(header)
+    padding = b'\0' * (-prefix_length % 8)
+
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.write(padding)
+        f.write(np.ascontiguousarray(tensor, dtype='<f8').tobytes())
+    os.replace(temp_path, path)
+    return path
+
+
+class TTKTable:
+    """
+    Read-only, memory-mapped view of a table written by build_ttk_table.
+
+    Args:
+        path (str): Table file path
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a TTK table file")
+        (header_length,) = struct.unpack_from('<I', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mmap[header_start:header_start + header_length].decode('utf-8'))
+
+        self.path = path
+        self.guns = header['guns']
+        self.shields = header['shields']
+        self.levels = header['levels']
+        self.ratio_steps = header['ratio_steps']
+        self.fields = header['fields']
+        self.data_version = header['data_version']
+        # Tables written before the solver inputs were stored have no 'inputs'
+        self._inputs = header.get('inputs')
+        self._gun_index = {name: index for index, name in enumerate(self.guns)}
+        self._shield_index = {name: index for index, name in enumerate(self.shields)}
+
+        prefix_length = header_start + header_length
+        self._offset = prefix_length + (-prefix_length % 8)
+        self._values = memoryview(self._mmap)[self._offset:].cast('d')
+
+        # Strides (in float64 elements) of the (gun, shield, level, ratio, field) tensor
+        self._ratio_stride = len(self.fields)
+        self._level_stride = (self.ratio_steps + 1) * self._ratio_stride
+        self._shield_stride = len(self.levels) * self._level_stride
+        self._gun_stride = len(self.shields) * self._shield_stride
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Release the memory map."""
+        self._values.release()
+        self._mmap.close()
+
+    def is_stale(self):
+        """True if the table was built from different data than ttk_calculator currently holds."""
+        return self.data_version != ttk_calculator.DATA_VERSION
+
+    def stale_configs(self):
+        """
+        Which (gun, shield, level) slices of the table no longer match the current data.
+
+        Returns:
+            set: (gun_name, shield_type, level) triples, or None if the whole table must
+                 be treated as stale (see ttk_calculator.get_stale_since)
+        """
+        return ttk_calculator.get_stale_since(self.data_version)
+
+    def as_array(self):
+        """
+        Zero-copy NumPy view of the whole tensor.
+
+        Returns:
+            numpy.ndarray: Read-only array of shape (guns, shields, levels, ratio_steps + 1, fields)
+        """
+        import numpy as np
+        shape = (len(self.guns), len(self.shields), len(self.levels), self.ratio_steps + 1, len(self.fields))
+        return np.frombuffer(self._mmap, dtype='<f8', offset=self._offset).reshape(shape)
+
+    def _row(self, base, ratio_index):
+        start = base + ratio_index * self._ratio_stride
+        ttk, bullets_fired, reloads = self._values[start:start + 3]
+        return {
+            'ttk': ttk,
+            'bullets_fired': int(bullets_fired),
+            'reloads': int(reloads)
+        }
+
+    def lookup(self, gun_name, shield_type='light', level=1, headshot_ratio=0.0):
+        """
+        Look up TTK for any headshot ratio.
+
+        Ratios on the grid are read directly. Between two grid points, bullets to kill
+        is a step function of the ratio and TTK depends only on bullets fired, so when
+        both neighbours agree their row is the exact answer. Only when a breakpoint
+        falls inside the interval is the closed-form solver used, with the gun and
+        shield stats stored in the table, so the answer always comes from the data
+        the table was built from.
+
+        Args:
+            gun_name (str): Name of the gun
+            shield_type (str): Type of shield
+            level (int): Gun level (1-4)
+            headshot_ratio (float): Ratio of headshots (0.0-1.0)
+
+        Returns:
+            dict: ttk, bullets_fired and reloads, or None if the inputs are not in the table
+
+        Raises:
+            ValueError: If an off-grid ratio must be solved, the table has no stored solver
+                        inputs and it was built from other data than ttk_calculator now holds
+        """
+        if gun_name not in self._gun_index or shield_type not in self._shield_index:
+            return None
+        if level not in self.levels or not 0.0 <= headshot_ratio <= 1.0:
+            return None
+
+        base = (self._gun_index[gun_name] * self._gun_stride
+                + self._shield_index[shield_type] * self._shield_stride
+                + self.levels.index(level) * self._level_stride)
+
+        position = headshot_ratio * self.ratio_steps
+        lower_index = math.floor(position)
+        if position == lower_index:
+            return self._row(base, lower_index)
+
+        if self._inputs is None:
+            if self.is_stale():
+                raise ValueError(f"{self.path} was built from data version {self.data_version} and has no "
+                                 f"solver inputs for off-grid ratios; rebuild it with build_ttk_table")
+            store = ttk_calculator.GUN_STATS_STORE
+            gun_id = store.gun_id(gun_name)
+            headshot_multiplier = store.headshot_multiplier[gun_id]
+            base_damage, firerate, mag_size, reload_time = store.level_stats(gun_id, level)
+            shield_health, shield_damage_reduction = store.shield_stats(store.shield_id(shield_type))
+            health = ttk_calculator.BASE_HEALTH
+        else:
+            gun_index = self._gun_index[gun_name]
+            headshot_multiplier = self._inputs['headshot_multiplier'][gun_index]
+            base_damage, firerate, mag_size, reload_time = \
+                self._inputs['level_stats'][gun_index][self.levels.index(level)]
+            shield_health, shield_damage_reduction = self._inputs['shield_stats'][self._shield_index[shield_type]]
+            health = self._inputs['base_health']
+
+        # With a headshot multiplier of 1.0, rounding in the blended damage can flip an
+        # exact kill anywhere between grid points (see ttk_breakpoints), so always solve
+        lower = self._row(base, lower_index)
+        upper = self._row(base, lower_index + 1)
+        if lower['bullets_fired'] == upper['bullets_fired'] and headshot_multiplier != 1.0:
+            return lower
+
+        damage_per_bullet = base_damage * (1 - headshot_ratio) + base_damage * headshot_ratio * headshot_multiplier
+        ttk, bullets_fired, reloads = ttk_calculator.solve_ttk(damage_per_bullet, firerate, int(mag_size),
+                                                               reload_time, shield_health, shield_damage_reduction,
+                                                               health)
+        return {
+            'ttk': ttk,
+            'bullets_fired': bullets_fired,
+            'reloads': reloads
+        }
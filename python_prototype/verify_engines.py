@@ -0,0 +1,331 @@
+"""
+Differential verification of the fast TTK engines against the reference simulation.
+
+Every engine (closed form, summary mode, streamed events, LRU cache, breakpoint
+index, NumPy batch and memory-mapped table) is run over the same cases as the per-bullet
+reference loops in calculate_ttk and calculate_ttk_detailed, and must agree on
+bullets_fired and reloads exactly and on ttk within TTK_REL_TOL / TTK_ABS_TOL.
+
+Cases come from:
+    - an exhaustive gun x shield x level x headshot-ratio grid
+    - seeded random ratios
+    - edge cases: every exact-kill breakpoint and the float just below it,
+      0.0 and 1.0, one-round magazines (ferro), and synthetic solver inputs
+      where the killing shot also breaks the shield
+
+Usage:
+    python verify_engines.py                              # run everything
+    python verify_engines.py --ratio-steps 100 --random 20000 --seed 7
+    python verify_engines.py --engines closed_form,batch
+    python verify_engines.py --golden golden_vectors.json # also write golden vectors
+    python verify_engines.py --import-budget-ms 0         # skip the import check
+
+Golden vectors use the camelCase field names of TTKResult in
+src/utils/calculator.ts (gunName, shieldType, level, headshotRatio, ttk,
+bulletsFired, reloads, dps), so the web app's tests can load them directly.
+
+It also checks that `import ttk_calculator` stays lazy and within
+benchmarks.IMPORT_BUDGET_MS (see benchmarks.check_import).
+
+Exit status is 1 when any engine disagrees with the reference or the import
+check fails.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+
+import benchmarks
+import ttk_calculator
+from ttk_breakpoints import get_breakpoint_index
+from ttk_cache import TTKCache
+
+TTK_REL_TOL = 1e-9
+TTK_ABS_TOL = 1e-9
+LEVELS = [1, 2, 3, 4]
+
+# Synthetic solve_ttk inputs the real data may not hit:
+# (damage_per_bullet, firerate, mag_size, reload_time, shield_health, shield_damage_reduction)
+SOLVER_EDGE_CASES = [
+    (100.0, 1.0, 1, 1.0, 100.0, 0.0),     # single shot breaks the shield and kills exactly
+    (100.0, 5.0, 30, 2.0, 50.0, 0.0),     # killing shot overkills shield and health
+    (50.0, 2.0, 1, 1.0, 50.0, 0.5),       # one-round magazine, reload before every later shot
+    (25.0, 10.0, 30, 2.0, 0.0, 0.0),      # no shield, exact kill on the 4th bullet
+    (25.0, 10.0, 4, 2.0, 0.0, 0.0),       # exact kill on the last round of the magazine
+    (25.0, 10.0, 3, 2.0, 0.0, 0.0),       # exact kill on the first round after a reload
+    (20.0, 8.0, 10, 1.5, 40.0, 1.0),      # shield absorbs everything until it breaks
+    (40.0, 8.0, 10, 1.5, 40.0, 0.5),      # shield breaks exactly as health reaches 80
+    (100.0 / 3, 6.0, 5, 1.2, 70.0, 0.425),  # non-representable damage per bullet
+    (0.1, 20.0, 50, 3.0, 80.0, 0.525),    # long fight with many reloads
+]
+
+
+def _reference(case):
+    """
+    Run both reference loops on a case.
+
+    Returns:
+        tuple: (ttk, bullets_fired, reloads) from calculate_ttk_detailed
+
+    Raises:
+        AssertionError: If calculate_ttk and calculate_ttk_detailed disagree on ttk
+    """
+    ttk = ttk_calculator.calculate_ttk(*case)
+    detailed = ttk_calculator.calculate_ttk_detailed(*case)
+    if not _ttk_close(ttk, detailed['ttk']):
+        raise AssertionError(f"reference loops disagree on {case}: {ttk} vs {detailed['ttk']}")
+    return detailed['ttk'], detailed['bullets_fired'], detailed['reloads']
+
+
+def _ttk_close(actual, expected):
+    return math.isclose(actual, expected, rel_tol=TTK_REL_TOL, abs_tol=TTK_ABS_TOL)
+
+
+def _engine_closed_form(cases):
+    return [(ttk_calculator.calculate_ttk_closed_form(*case),) + ttk_calculator.solve_ttk_for_gun(*case)[1:]
+            for case in cases]
+
+
+def _engine_summary(cases):
+    results = []
+    for case in cases:
+        result = ttk_calculator.calculate_ttk_detailed(*case, include_log=False)
+        results.append((result['ttk'], result['bullets_fired'], result['reloads']))
+    return results
+
+
+def _engine_events(cases):
+    # The streamed events come from a separate loop than calculate_ttk_detailed's damage_log
+    results = []
+    for case in cases:
+        ttk = bullets_fired = reloads = 0
+        for event in ttk_calculator.iter_damage_events(*case):
+            ttk = event.time
+            if event.type == 'reload':
+                reloads = event.reload_number
+            else:
+                bullets_fired = event.bullet
+        results.append((ttk, bullets_fired, reloads))
+    return results
+
+
+def _engine_cache(cases):
+    # Fill on the first pass, then verify what the second pass serves from the cache
+    cache = TTKCache(maxsize=len(cases) * 2 + 1)
+    for case in cases:
+        cache.calculate_ttk(*case)
+        cache.calculate_ttk_detailed(*case)
+    results = []
+    for case in cases:
+        detailed = cache.calculate_ttk_detailed(*case)
+        ttk = cache.calculate_ttk(*case)
+        if not _ttk_close(ttk, detailed['ttk']):
+            ttk = math.nan
+        results.append((ttk, detailed['bullets_fired'], detailed['reloads']))
+    return results
+
+
+def _engine_breakpoints(cases):
+    results = []
+    for gun_name, shield_type, level, headshot_ratio in cases:
+        step = get_breakpoint_index(gun_name, shield_type, level).lookup(headshot_ratio)
+        results.append((step['ttk'], step['bullets_fired'], step['reloads']))
+    return results
+
+
+def _engine_batch(cases):
+    from ttk_batch import calculate_ttk_batch
+
+    guns, shield_types, levels, ratios = zip(*cases)
+    batch = calculate_ttk_batch(list(guns), list(shield_types), list(levels), list(ratios))
+    return [(float(ttk), int(bullets_fired), int(reloads))
+            for ttk, bullets_fired, reloads in zip(batch['ttk'], batch['bullets_fired'], batch['reloads'])]
+
+
+def _engine_table(cases):
+    from ttk_table import TTKTable, build_ttk_table
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = build_ttk_table(os.path.join(directory, 'verify.ttktable'), ratio_steps=200)
+        with TTKTable(path) as table:
+            results = []
+            for case in cases:
+                row = table.lookup(*case)
+                results.append((row['ttk'], row['bullets_fired'], row['reloads']))
+            return results
+
+
+ENGINES = {
+    'closed_form': _engine_closed_form,
+    'summary': _engine_summary,
+    'events': _engine_events,
+    'cache': _engine_cache,
+    'breakpoints': _engine_breakpoints,
+    'batch': _engine_batch,
+    'table': _engine_table,
+}
+
+
+def build_cases(ratio_steps=20, random_samples=2000, seed=0):
+    """
+    Collect verification cases over every gun, shield and level.
+
+    Args:
+        ratio_steps (int): Exhaustive grid intervals between headshot ratio 0.0 and 1.0
+        random_samples (int): Number of random (gun, shield, level, ratio) cases
+        seed (int): Seed for the random cases
+
+    Returns:
+        list: Unique (gun_name, shield_type, level, headshot_ratio) tuples in a stable order
+    """
+    guns = list(ttk_calculator.GUNS.keys())
+    shields = list(ttk_calculator.SHIELDS.keys())
+    configs = [(gun_name, shield_type, level) for gun_name in guns for shield_type in shields for level in LEVELS]
+
+    cases = [config + (step / ratio_steps,) for config in configs for step in range(ratio_steps + 1)]
+
+    # Exact-kill boundaries: the first ratio of every bullets-to-kill step and the float below it
+    for config in configs:
+        for ratio in get_breakpoint_index(*config).ratios:
+            cases.append(config + (ratio,))
+            if ratio > 0.0:
+                cases.append(config + (math.nextafter(ratio, 0.0),))
+
+    rng = random.Random(seed)
+    for _ in range(random_samples):
+        cases.append(rng.choice(configs) + (rng.random(),))
+
+    return list(dict.fromkeys(cases))
+
+
+def verify_engine(name, cases, expected):
+    """
+    Compare one engine against the reference results.
+
+    Returns:
+        list: (case, expected, actual) for every mismatch
+    """
+    actual = ENGINES[name](cases)
+    mismatches = []
+    for case, want, got in zip(cases, expected, actual):
+        if got[1] != want[1] or got[2] != want[2] or not _ttk_close(got[0], want[0]):
+            mismatches.append((case, want, got))
+    return mismatches
+
+
+def verify_solver_edge_cases():
+    """
+    Check solve_ttk against the per-bullet event loop on SOLVER_EDGE_CASES.
+
+    Returns:
+        list: (inputs, expected, actual) for every mismatch
+    """
+    mismatches = []
+    for inputs in SOLVER_EDGE_CASES:
+        ttk = bullets_fired = reloads = 0
+        for event in ttk_calculator._damage_events(*inputs):
+            ttk = event.time
+            if event.type == 'reload':
+                reloads = event.reload_number
+            else:
+                bullets_fired = event.bullet
+        expected = (ttk, bullets_fired, reloads)
+        actual = ttk_calculator.solve_ttk(*inputs)
+        if actual[1:] != expected[1:] or not _ttk_close(actual[0], expected[0]):
+            mismatches.append((inputs, expected, actual))
+    return mismatches
+
+
+def golden_vectors(cases, expected):
+    """
+    Reference results as TTKResult-shaped dicts (without damageLog).
+
+    Returns:
+        dict: {'dataVersion', 'ttkRelTol', 'ttkAbsTol', 'vectors': [...]}
+    """
+    vectors = []
+    for (gun_name, shield_type, level, headshot_ratio), (ttk, bullets_fired, reloads) in zip(cases, expected):
+        damage_per_bullet = ttk_calculator._resolve_inputs(gun_name, shield_type, level,
+                                                           headshot_ratio)['damage_per_bullet']
+        vectors.append({
+            'gunName': gun_name,
+            'shieldType': shield_type,
+            'level': level,
+            'headshotRatio': headshot_ratio,
+            'ttk': ttk,
+            'bulletsFired': bullets_fired,
+            'reloads': reloads,
+            # Matches calculator.ts; a one-shot kill (ttk 0) has no finite dps
+            'dps': bullets_fired * damage_per_bullet / ttk if ttk > 0 else None
+        })
+    return {
+        'dataVersion': ttk_calculator.DATA_VERSION,
+        'ttkRelTol': TTK_REL_TOL,
+        'ttkAbsTol': TTK_ABS_TOL,
+        'vectors': vectors
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify the fast TTK engines against the reference loops")
+    parser.add_argument('--ratio-steps', type=int, default=20,
+                        help="Exhaustive headshot-ratio grid intervals (default: 20)")
+    parser.add_argument('--random', type=int, default=2000, help="Random cases (default: 2000)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument('--engines', help=f"Comma-separated engines to check (default: {','.join(ENGINES)})")
+    parser.add_argument('--golden', help="Write reference results as golden vectors to this JSON file")
+    parser.add_argument('--import-budget-ms', type=float, default=benchmarks.IMPORT_BUDGET_MS,
+                        help=f"Fail if importing ttk_calculator takes longer, 0 to skip "
+                             f"(default: {benchmarks.IMPORT_BUDGET_MS:g})")
+    args = parser.parse_args(argv)
+
+    engines = args.engines.split(',') if args.engines else list(ENGINES)
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engines: {', '.join(unknown)}")
+
+    cases = build_cases(args.ratio_steps, args.random, args.seed)
+    expected = [_reference(case) for case in cases]
+    print(f"{len(cases)} cases, data version {ttk_calculator.DATA_VERSION[:12]}")
+
+    failed = False
+    edge_mismatches = verify_solver_edge_cases()
+    print(f"{'solver_edge_cases':<20} {len(SOLVER_EDGE_CASES) - len(edge_mismatches):>8}/{len(SOLVER_EDGE_CASES)} ok")
+    for inputs, want, got in edge_mismatches:
+        print(f"  {inputs}: expected {want}, got {got}")
+        failed = True
+
+    for name in engines:
+        try:
+            mismatches = verify_engine(name, cases, expected)
+        except ImportError as error:
+            print(f"{name:<20} skipped ({error})")
+            continue
+        print(f"{name:<20} {len(cases) - len(mismatches):>8}/{len(cases)} ok")
+        for case, want, got in mismatches[:10]:
+            print(f"  {case}: expected {want}, got {got}")
+        if len(mismatches) > 10:
+            print(f"  ... and {len(mismatches) - 10} more")
+        failed = failed or bool(mismatches)
+
+    if args.import_budget_ms > 0:
+        import_problems = benchmarks.check_import(args.import_budget_ms / 1e3)
+        print(f"{'import':<20} {'ok' if not import_problems else 'FAILED':>8}")
+        for problem in import_problems:
+            print(f"  {problem}")
+        failed = failed or bool(import_problems)
+
+    if args.golden:
+        with open(args.golden, 'w') as f:
+            json.dump(golden_vectors(cases, expected), f, indent=2)
+        print(f"Wrote {len(cases)} golden vectors to {args.golden}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())